@@ -3,15 +3,25 @@ from __future__ import annotations
 import glob
 import itertools
 import os
-from typing import List, Optional, Tuple, Iterable, Dict
+from typing import List, Optional, Tuple, Iterable, Dict, FrozenSet, Container
 
 from yaml import safe_load
 
 from constants import Element, Condition, Trigger, Effect, NONCOMBAT_TRIGGERS, InfoScope
-from skill import Skill, get_skill
+from skill import Skill, get_skill, may_have_effect
 
 
 __ability_dict = {}
+# Compiled prerequisite graph, built once the abilities are loaded
+# Pin: Pins of which any one satisfies its prerequisite (empty if it has none)
+__unlocked_by: Dict[int, FrozenSet[int]] = {}
+# Pin: The chain of single prerequisites that must be learned before it, nearest first
+# Special prerequisites can be met by any member of a family, so they are left to is_unlocked_by
+__prerequisite_chain: Dict[int, Tuple[int, ...]] = {}
+# Abilities whose prerequisite is any member of a family rather than a single ability
+# Name: Pins that unlock it
+SPECIAL_PREREQUISITES = {"Legacy Magic": range(601, 10001, 100),
+                         "Reality Imposition": range(603, 10003, 100)}
 FULL_ELEMENTS = [element for element in Element] * 3
 
 
@@ -146,12 +156,18 @@ class Ability:
         self.target_other = target_other
         # Adds an on acquisition skill to explain what a concept level does
         self.explanation = explanation
+        # Contributes to max willpower once learned
+        self.grants_willpower = may_have_effect(skill_pins + [qualified.pin for qualified in geo_qualified_skills +
+                                                              hydro_qualified_skills + aero_qualified_skills],
+                                                Effect.MAX_WILLPOWER)
         self.prerequisite_pin = prerequisite_pin
+        # Resolved once every ability is loaded
+        self.prerequisite: Optional[Ability] = None
+        # Depth, Family pin, Pin
+        self.index: Tuple[int, int, int] = (0, pin, pin)
 
     def get_prerequisite(self) -> Optional[Ability]:
-        if self.prerequisite_pin:
-            return get_ability(self.prerequisite_pin)
-        return None
+        return self.prerequisite
 
     def _get_aero_skills(self, choice, for_rune=False) -> List[Skill]:
         if self.must_choose:
@@ -211,12 +227,7 @@ class Ability:
         return self.pin < 700
 
     def _get_index(self) -> Tuple[int, int, int]:
-        pin = self.pin
-        if pin > 700:  # Aeromancy Concept
-            pin = 300 + self.pin % 100
-        if self.prerequisite_pin is None:
-            return 0, pin, self.pin
-        return self.get_prerequisite()._get_index()[0] + 1, pin, self.pin
+        return self.index
 
     def _get_aeromancy_explanation_skill(self) -> List[Skill]:
         if self.explanation:
@@ -235,10 +246,14 @@ class Ability:
         return val
 
     def __eq__(self, other: 'Ability'):
-        return self._get_index() == other._get_index()
+        return self.index == other.index
 
     def __lt__(self, other: 'Ability'):
-        return self._get_index() < other._get_index()
+        return self.index < other.index
+
+    # Loaded once and shared, copies of a game keep pointing at the same definitions
+    def __deepcopy__(self, memo):
+        return self
 
 
 def get_ability(pin: int) -> Ability:
@@ -255,6 +270,20 @@ def get_ability_by_name(name: str) -> Ability:
     raise Exception(f"Ability {name} not found")
 
 
+def is_unlocked_by(pin: int, complete_pins: Container[int]) -> bool:
+    unlocking_pins = __unlocked_by[pin]
+    if not unlocking_pins:
+        return True
+    for unlocking_pin in unlocking_pins:
+        if unlocking_pin in complete_pins:
+            return True
+    return False
+
+
+def get_prerequisite_chain(pin: int) -> Tuple[int, ...]:
+    return __prerequisite_chain[pin]
+
+
 def __parse_ability(pin: int, dictionary: Dict) -> Ability:
     geo_qualified_skills = []
     hydro_qualified_skills = []
@@ -339,3 +368,31 @@ if not __ability_dict:
                     if k in __ability_dict:
                         raise Exception(f"ID collision in {file_name} {k}")
                     __ability_dict[k] = __parse_ability(k, v)
+
+    # Resolve prerequisites and precompute the sorting index
+    for loaded in __ability_dict.values():
+        if loaded.prerequisite_pin:
+            loaded.prerequisite = get_ability(loaded.prerequisite_pin)
+    for loaded in __ability_dict.values():
+        chain = [loaded.pin]
+        prerequisite = loaded.prerequisite
+        while prerequisite:
+            if prerequisite.pin in chain:
+                raise Exception(f"Prerequisite cycle: {' -> '.join(str(pin) for pin in chain + [prerequisite.pin])}")
+            chain.append(prerequisite.pin)
+            prerequisite = prerequisite.prerequisite
+        family_pin = loaded.pin
+        if family_pin > 700:  # Aeromancy Concept
+            family_pin = 300 + loaded.pin % 100
+        loaded.index = (len(chain) - 1, family_pin, loaded.pin)
+        __prerequisite_chain[loaded.pin] = tuple(chain[1:])
+
+    # Compile the prerequisite graph
+    for loaded in __ability_dict.values():
+        if loaded.name in SPECIAL_PREREQUISITES:
+            __unlocked_by[loaded.pin] = frozenset(pin for pin in SPECIAL_PREREQUISITES[loaded.name]
+                                                  if pin in __ability_dict)
+        elif loaded.prerequisite:
+            __unlocked_by[loaded.pin] = frozenset([loaded.prerequisite.pin])
+        else:
+            __unlocked_by[loaded.pin] = frozenset()
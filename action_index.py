@@ -0,0 +1,101 @@
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from actions import Action, AutomataCraft, ConsumeItem, Craft, PlaceBounty, Shop, Trade
+from items import get_item
+
+if TYPE_CHECKING:
+    from game import Game
+    from player import Player
+
+
+# Every order planned so far this turn, by player, so the turn can be checked as a whole before it is run
+# Plan methods already refuse orders that are illegal on their own, this finds orders that conflict with each other
+class ActionIndex:
+    def __init__(self, game: 'Game'):
+        self.game = game
+        # Player: Queued actions, in the order they were planned
+        self.actions: Dict['Player', List[Action]] = {}
+        for action in sorted(game.turn_context.queue.queue, key=lambda a: a.idx):
+            if action.player:
+                self.actions.setdefault(action.player, []).append(action)
+
+    def get_action(self, player: 'Player') -> Action:
+        return player.action
+
+    def get_bonus_action(self, player: 'Player') -> Optional[Action]:
+        return player.bonus_action
+
+    def get_trades(self, player: 'Player') -> List[Trade]:
+        return [action for action in self.actions.get(player, []) if isinstance(action, Trade)]
+
+    def get_consumes(self, player: 'Player') -> List[ConsumeItem]:
+        return [action for action in self.actions.get(player, []) if isinstance(action, ConsumeItem)]
+
+    # Everyone the player's orders, abilities, items and tattoo are aimed at
+    def get_targets(self, player: 'Player') -> Set['Player']:
+        targets: Set['Player'] = set()
+        for action in self.actions.get(player, []):
+            if getattr(action, 'target', None):
+                targets.add(action.target)
+            targets.update(getattr(action, 'targets', None) or [])
+        for target_list in list(player.ability_targets.values()) + list(player.item_targets.values()):
+            targets.update(target_list)
+        targets.update(player.tattoo_targets)
+        return targets
+
+    # Name: Conflicts between their orders
+    # Counts what each player has now and will buy or craft this turn, not what others promise them
+    def get_conflicts(self) -> Dict[str, List[str]]:
+        conflicts: Dict[str, List[str]] = {}
+        # Pin: Amount
+        gained: Dict['Player', Dict[int, int]] = {}
+        for player, actions in self.actions.items():
+            for action in actions:
+                if isinstance(action, (Shop, Craft, AutomataCraft)):
+                    receiver = action.owner if isinstance(action, AutomataCraft) else player
+                    for item, amount in action.items.items():
+                        gained.setdefault(receiver, {})
+                        gained[receiver][item.pin] = gained[receiver].get(item.pin, 0) + amount
+
+        for player in sorted(self.actions, key=lambda p: p.name.upper()):
+            player_conflicts = []
+            credits = 0
+            items: Dict[int, int] = {}
+            automata_names: Set[str] = set()
+            for action in self.actions[player]:
+                if isinstance(action, Shop):
+                    credits += Shop.get_total_cost(action.items)
+                elif isinstance(action, PlaceBounty):
+                    credits += action.amount
+                elif isinstance(action, ConsumeItem):
+                    items[action.item.pin] = items.get(action.item.pin, 0) + 1
+                elif isinstance(action, Trade):
+                    credits += action.credits
+                    for item, amount in action.items.items():
+                        items[item.pin] = items.get(item.pin, 0) + amount
+                    for automaton in action.automata:
+                        name = automaton if isinstance(automaton, str) else automaton.name
+                        if name in automata_names:
+                            player_conflicts.append(f"{player.name} is trying to trade away {name} more than once.")
+                        automata_names.add(name)
+
+            if credits > player.get_credits():
+                player_conflicts.append(f"{player.name} is spending {credits} credits "
+                                        f"but only has {player.get_credits()}.")
+            for pin, amount in sorted(items.items()):
+                available = player.items.count(pin) + gained.get(player, {}).get(pin, 0)
+                if amount > available:
+                    player_conflicts.append(f"{player.name} is using or trading {amount} {get_item(pin).name} "
+                                            f"but will only have {available}.")
+            if player_conflicts:
+                conflicts[player.name] = player_conflicts
+        return conflicts
+
+    # Raises once with every conflict in the turn
+    def check(self):
+        conflicts = self.get_conflicts()
+        if conflicts:
+            raise Exception(f"Conflicting orders:{os.linesep}" +
+                            os.linesep.join(conflict for player_conflicts in conflicts.values()
+                                            for conflict in player_conflicts))
@@ -1,6 +1,6 @@
 import os
-from queue import PriorityQueue
-from typing import TYPE_CHECKING, Set, Dict, Optional, Tuple, List, Type, Union
+import time
+from typing import TYPE_CHECKING, Set, Dict, Optional, Tuple, List, Type, Union, Callable
 
 from ability import Ability, get_ability, get_ability_by_name
 from combat import get_combat_handler
@@ -8,7 +8,9 @@ from constants import Temperament, Condition, Trigger, Effect, InfoScope, \
     COMBAT_PLACEHOLDER, SELF_PLACEHOLDER, TARGET_PLACEHOLDER, InjuryModifier, Element, AFFLICTIONS, CONDITION_IMMUNITY, \
     NONCOMBAT_TRIGGERS, ItemType
 from items import get_item_by_name, get_item, Item, Rune
+from profiler import get_profiler
 from report import get_main_report
+from turn_context import TurnContext
 
 if TYPE_CHECKING:
     from game import Game
@@ -73,64 +75,30 @@ def noncombat_damage(source: 'Player', victim: 'Player', modifiers: List[InjuryM
 
 
 class Action:
-    tic_index = 0
-
-    queue = PriorityQueue()
-    players: Set['Player'] = set()
-    not_wandering: Set['Player'] = set()
-    interrupted_players: Set['Player'] = set()
-    progress_dict: Dict['Player', int] = {}
-    no_class: Set['Player'] = set()  # Used poison gas or attuned
-    attacked: Set['Player'] = set()
-
-    # Used for conditional trades based on actions
-    action_record: List[ACTION_CONDITION] = []
-    spied: Dict["Player", Set["Player"]] = {}
-    fake_action_record: List[ACTION_CONDITION] = []
-    fake_spied: Dict["Player", Set["Player"]] = {}
-
-    # Used for teaching/learning handshake
-    # Teacher: Student
-    teacher_student: Dict['Player', 'Player'] = {}
-    # Student: Teacher
-    student_teacher: Dict['Player', 'Player'] = {}
-    # Teacher: Ability
-    teacher_ability: Dict['Player', 'Ability'] = {}
-
-    # Used for tattooing handshake
-    # Artist: Canvas
-    artist_canvas: Dict['Player', 'Player'] = {}
-    # Canvas: Artist
-    canvas_artist: Dict['Player', 'Player'] = {}
-    # Artist: Rune
-    artist_rune: Dict['Player', 'Rune'] = {}
-
-    # Used to allow Altruism to work when multiple players heal the same injured player
-    was_healed: Set["Player"] = set()
-
     def __init__(self, priority, game: Optional['Game'], player: Optional["Player"], fragile: bool = True,
                  public_description: str = "", on_interrupt: str = "", combat_on_interrupt: str = "",
                  prevents_wandering: bool = True):
         self.game = game
         self.player = player
         if self.player and game and not game.simulation:
-            Action.players.add(self.player)
+            self.context.players.add(self.player)
 
         self.fragile = fragile
         self.public_description = public_description
         self.on_interrupt = on_interrupt
         self.combat_on_interrupt = combat_on_interrupt
         self.priority = priority
-        self.idx = Action.tic_index
+        self.idx = game.turn_context.next_index() if game else 0
 
         self.maintains_hiding = False
         self.prevents_wandering = prevents_wandering
 
-        Action.tic_index += 1
-
         if self.game and not game.simulation:  # Hack to make fake actions
-            # TODO refactor Action Queue to be a part of game, so simulations are permitted
-            Action.queue.put(self)
+            self.context.queue.put(self)
+
+    @property
+    def context(self) -> 'TurnContext':
+        return self.game.turn_context
 
     def act(self):
         self.player.report += os.linesep
@@ -143,28 +111,28 @@ class Action:
                 self.player.conditions.remove(Condition.HIDING)
                 get_main_report().mark_revealed(self.player)
 
-        interrupted = self.player in Action.interrupted_players
+        interrupted = self.player in self.context.interrupted_players
 
         if not interrupted or not self.fragile:
             if self.public_description:
                 get_main_report().add_action(self.player, self.public_description,
-                                             hidden=self.player in Illusion.handled)
+                                             hidden=self.player in self.context.illusion_handled)
                 self.player.report += self.public_description + os.linesep
         if interrupted and self.fragile:
             get_main_report().add_action(self.player, self.on_interrupt,
-                                         hidden=self.player in Illusion.handled)
+                                         hidden=self.player in self.context.illusion_handled)
             self.player.report += self.on_interrupt + os.linesep
         if not interrupted or not self.fragile:
             self._act()
         if self.prevents_wandering:
-            Action.not_wandering.add(self.player)
+            self.context.not_wandering.add(self.player)
         self.player.report += os.linesep + os.linesep
 
     def _act(self):
         pass
 
     def _log_training(self):
-        if self.player not in Illusion.handled:
+        if self.player not in self.context.illusion_handled:
             if not self.player.dev_plan:
                 get_main_report().set_training(self.player, "nothing")
             else:
@@ -183,8 +151,8 @@ class Action:
         return (self.priority, self.idx) < (other.priority, other.idx)
 
     @staticmethod
-    def sorted_players():
-        return sorted(list(Action.players), key=lambda p: p.name)
+    def sorted_players(game: 'Game'):
+        return sorted(list(game.turn_context.players), key=lambda p: p.name)
 
     @staticmethod
     def can_act(player: 'Player'):
@@ -203,59 +171,86 @@ class Action:
         WillpowerStep(game)
         StatusChangeStep(game)
 
-        last_tic = -100
+        context = game.turn_context
+        profiler = get_profiler()
+        while not context.queue.empty():
+            # Resolve one priority band at a time, new actions in the current band or earlier join it
+            band = int(context.queue.queue[0].priority)
+            band_start = time.perf_counter()
+            for player in context.players:
+                player.report += os.linesep
 
-        while not cls.queue.empty():
-            tic = cls.queue.get()
-            if int(tic.priority) > int(last_tic):
-                for player in Action.players:
-                    player.report += os.linesep
-                last_tic = tic.priority
-            if not tic.player or Action.can_act(tic.player) or isinstance(tic, Resurrect) or \
-                    (isinstance(tic, HandleSkill) and
-                     ((tic.skill.works_when_petrified and not tic.player.is_dead())
-                      or (tic.skill.trigger in [Trigger.ACQUISITION, Trigger.START_OF_GAME]))):
-                tic.act()
-            elif Condition.PETRIFIED in tic.player.conditions:
-                get_main_report().add_petrification(tic.player)
+            context.invalidate_actors()
+            actors: Set['Player'] = set()
+            while not context.queue.empty() and int(context.queue.queue[0].priority) <= band:
+                tic = context.queue.get()
+                if context.actors_changed:
+                    actors = {player for player in context.players if Action.can_act(player)}
+                    context.actors_changed = False
+                if not tic.player or tic.player in actors or isinstance(tic, Resurrect) or \
+                        (isinstance(tic, HandleSkill) and
+                         ((tic.skill.works_when_petrified and not tic.player.is_dead())
+                          or (tic.skill.trigger in [Trigger.ACQUISITION, Trigger.START_OF_GAME]))):
+                    if profiler:
+                        tic_start = time.perf_counter()
+                        tic.act()
+                        profiler.record('action', type(tic).__name__, tic_start, time.perf_counter() - tic_start)
+                    else:
+                        tic.act()
+                    # Deaths and petrifications mark the actors stale themselves, these may change anything
+                    if not tic.player or isinstance(tic, (HandleSkill, Resurrect)):
+                        context.invalidate_actors()
+                elif Condition.PETRIFIED in tic.player.conditions:
+                    get_main_report().add_petrification(tic.player)
+
+            band_time = time.perf_counter() - band_start
+            if profiler:
+                profiler.record('band', str(band), band_start, band_time)
+            for hook in context.band_hooks:
+                hook(band, band_time)
 
     @classmethod
     def progress(cls, player: 'Player', amt: int):
-        if player not in cls.progress_dict:
-            cls.progress_dict[player] = 0
-        cls.progress_dict[player] += amt
+        progress_dict = player.game.turn_context.progress_dict
+        if player not in progress_dict:
+            progress_dict[player] = 0
+        progress_dict[player] += amt
         player.report += f"You have gained {amt} Progress" + os.linesep
 
     @classmethod
     def add_action_record(cls, player: 'Player', action: Type['Action'],
                           target: Optional['Player'] = None, fake=False):
-        if fake:
-            Action.fake_action_record.append((player, action, target, True))
-        else:
-            Action.action_record.append((player, action, target, True))
+        context = player.game.turn_context
+        record = context.fake_action_record if fake else context.action_record
+        if (player, action) not in record:
+            record[(player, action)] = set()
+        record[(player, action)].add(target)
+
+    @staticmethod
+    def _matches_record(record: Dict[Tuple['Player', Type['Action']], Set[Optional['Player']]],
+                        condition: ACTION_CONDITION) -> bool:
+        targets = record.get((condition[0], condition[1]))
+        if targets is None:
+            return False
+        return not condition[2] or condition[2] in targets
 
     @classmethod
     def check_action_record(cls, game: 'Game', observer: 'Player', condition: ACTION_CONDITION) -> bool:
+        context = game.turn_context
         if not game.is_day() and not observer.has_ability("Panopticon"):
             if condition[0] != observer:
-                if condition[0] not in Action.spied.get(observer, []):
-                    if not condition[2] == observer or condition[1] not in [Teach, Learn, Heal, Attack]:
+                if condition[0] not in context.spied.get(observer, ()):
+                    if not condition[2] == observer or condition[1] not in (Teach, Learn, Heal, Attack):
                         # Can't validate action for condition
                         return not condition[3]
 
-            if condition[0] in Action.fake_spied.get(observer, []):
-                for record in Action.fake_action_record:
-                    if record[0] == condition[0]:
-                        if record[1] == condition[1]:
-                            if not condition[2] or record[2] == condition[2]:
-                                return condition[3]
+            if condition[0] in context.fake_spied.get(observer, ()):
+                if cls._matches_record(context.fake_action_record, condition):
+                    return condition[3]
                 return not condition[3]
 
-        for record in Action.action_record:
-            if record[0] == condition[0]:
-                if record[1] == condition[1]:
-                    if not condition[2] or record[2] == condition[2]:
-                        return condition[3]
+        if cls._matches_record(context.action_record, condition):
+            return condition[3]
         return not condition[3]
 
     @classmethod
@@ -272,13 +267,15 @@ class Action:
         automata = automata.Automata(name, owner, conditions=[Condition.LOCKED] if shackled else [], items=[],
                                      bounty=0, relative_conditions={}, tattoo=None,
                                      game=game)
-        Action.not_wandering.add(automata)
+        game.turn_context.not_wandering.add(automata)
         owner.report += f"You acquired {name}." + os.linesep
 
+    # Only the given players' triggers are handled when players are given, e.g. those outside a parallel combat group
     @classmethod
-    def handle_death_triggers(cls, game: Optional['Game'], dead_player: 'Player'):
+    def handle_death_triggers(cls, game: Optional['Game'], dead_player: 'Player',
+                              players: Optional[List['Player']] = None):
         if game and not game.simulation:
-            for player in Action.players:
+            for player in game.turn_context.players if players is None else players:
                 if not player.is_dead():
                     for skill in player.get_skills():
                         if skill.trigger == Trigger.PLAYER_DIED:
@@ -287,9 +284,6 @@ class Action:
 
 
 class HandleSkill(Action):
-    info_once_dict: Dict['Player', Set[str]] = {}
-    info_once_broadcast: Set[str] = set()
-
     def __init__(self, game: Optional['Game'], player: "Player", skill: 'Skill',
                  targets: Optional[List['Player']] = None, fake: bool = False):
         super().__init__(priority=skill.priority, game=game, player=player, fragile=False)
@@ -318,11 +312,11 @@ class HandleSkill(Action):
             if override or self.skill.effect != Effect.INFO_ONCE:
                 p.report += get_main_report().face_mask_replacement(msg + os.linesep, p.name)
                 return True
-            elif msg not in HandleSkill.info_once_dict.get(p, []):
+            elif msg not in self.context.info_once_dict.get(p, []):
                 p.report += get_main_report().face_mask_replacement(msg + os.linesep, p.name)
-                if p not in HandleSkill.info_once_dict:
-                    HandleSkill.info_once_dict[p] = set()
-                HandleSkill.info_once_dict[p].add(msg)
+                if p not in self.context.info_once_dict:
+                    self.context.info_once_dict[p] = set()
+                self.context.info_once_dict[p].add(msg)
                 return True
             return False
 
@@ -331,13 +325,13 @@ class HandleSkill(Action):
             if not force_once and self.skill.effect != Effect.INFO_ONCE:
                 get_main_report().broadcast(msg, intuition_required=intuition_required)
                 return True
-            elif msg not in HandleSkill.info_once_broadcast:
-                HandleSkill.info_once_broadcast.add(msg)
+            elif msg not in self.context.info_once_broadcast:
+                self.context.info_once_broadcast.add(msg)
                 get_main_report().broadcast(msg, intuition_required=intuition_required)
                 return True
             return False
 
-        schedule_targets = []
+        self.schedule_targets: List['Player'] = []
 
         for original_target in self.targets:
             target = original_target
@@ -418,169 +412,17 @@ class HandleSkill(Action):
 
             if self.skill.self_override:
                 target = self.player
-            if self.skill.effect in [Effect.CONDITION, Effect.TURN_CONDITION]:
-                if not self.fake:
-                    if Condition[self.skill.value] not in CONDITION_IMMUNITY \
-                            or not target.has_condition(CONDITION_IMMUNITY[Condition[self.skill.value]]):
-                        for _ in range(times):
-                            target.turn_conditions.append(
-                                Condition[self.skill.value])
-            elif self.skill.effect == Effect.PERMANENT_CONDITION:
-                if not self.fake:
-                    if Condition[self.skill.value] not in CONDITION_IMMUNITY \
-                            or not target.has_condition(CONDITION_IMMUNITY[Condition[self.skill.value]]):
-                        for _ in range(times):
-                            target.conditions.append(
-                                Condition[self.skill.value])
-            elif self.skill.effect == Effect.TENTATIVE_CONDITION:
-                if not self.fake:
-                    if Condition[self.skill.value] not in CONDITION_IMMUNITY \
-                            or not target.has_condition(CONDITION_IMMUNITY[Condition[self.skill.value]]):
-                        for _ in range(times):
-                            target.tentative_conditions.append(
-                                Condition[self.skill.value])
-            elif self.skill.effect == Effect.REL_CONDITION:
-                # To be refactored if I ever need to give arbitrary players relative_conditions or if needs to stack
-                if target == self.player:
-                    raise Exception("No target for relative condition?")
-                if not self.fake:
-                    self.player.add_relative_condition(
-                        target, Condition[self.skill.value])
-            elif self.skill.effect == Effect.REMOVE_REL_CONDITION:
-                # To be refactored if I ever need to remove from arbitrary players or if needs to stack
-                if target == self.player:
-                    raise Exception("No target for relative condition?")
-                if not self.fake:
-                    self.player.remove_relative_condition(target, Condition[self.skill.value])
-            elif self.skill.effect == Effect.REMOVE_CONDITION:
-                if not self.fake:
-                    for _ in range(times):
-                        if Condition[self.skill.value] in target.turn_conditions:
-                            target.turn_conditions.remove(
-                                Condition[self.skill.value])
-                        elif Condition[self.skill.value] in target.conditions:
-                            target.conditions.remove(
-                                Condition[self.skill.value])
-            elif self.skill.effect == Effect.CONSUME:
-                if not self.fake:
-                    for _ in range(times):
-                        if Condition[self.skill.value] in target.turn_conditions:
-                            target.turn_conditions.remove(
-                                Condition[self.skill.value])
-                            for condition in self.skill.condition_list:
-                                target.turn_conditions.append(condition)
-                        if Condition[self.skill.value] in target.conditions:
-                            target.conditions.remove(
-                                Condition[self.skill.value])
-                            for condition in self.skill.condition_list:
-                                target.conditions.append(condition)
-
-            elif self.skill.effect == Effect.DEV_SABOTAGE:
-                if target == self.player:
-                    raise Exception("No target for dev sabotage?")
-                if not self.fake:
-                    target.dev_sabotaged(self.skill.text.replace(SELF_PLACEHOLDER, "somebody")
-                                         .replace(TARGET_PLACEHOLDER, target.name))
-            elif self.skill.effect == Effect.COPYCAT:
-                if target == self.player:
-                    raise Exception("No target for copycat?")
-                self.player.copycat(target, fake=self.fake)
-            elif self.skill.effect == Effect.PROGRESS:
-                if not self.fake:
-                    Action.progress(target, self.skill.value)
-            elif self.skill.effect == Effect.MAX_WILLPOWER:
-                if not self.fake:
-                    target.max_willpower += self.skill.value
-            elif self.skill.effect == Effect.DAMAGE:
-                if not self.fake:
-                    noncombat_damage(self.player, target)
-            elif self.skill.effect == Effect.GRIEVOUS:
-                if not self.fake:
-                    noncombat_damage(self.player, target, [
-                        InjuryModifier.GRIEVOUS])
-            elif self.skill.effect == Effect.NONLETHAL:
-                if not self.fake:
-                    noncombat_damage(self.player, target, [
-                        InjuryModifier.NONLETHAL])
-            elif self.skill.effect == Effect.KILL:
-                if not self.fake:
-                    target.kill()
-            elif self.skill.effect == Effect.PETRIFY:
-                if not self.fake:
-                    noncombat_damage(self.player, target, petrify=True)
-            elif self.skill.effect == Effect.MINI_PETRIFY:
-                if not self.fake:
-                    noncombat_damage(self.player, target, [
-                        InjuryModifier.MINI], petrify=True)
-            elif self.skill.effect == Effect.HEAL:
-                if not self.fake:
-                    target.heal()
-            elif self.skill.effect == Effect.ITEM:
-                if not self.fake:
-                    if self.skill.value_b:
-                        target.gain_item(
-                            get_item(self.skill.value), self.skill.value_b)
-                    else:
-                        target.gain_item(get_item(self.skill.value))
-            elif self.skill.effect == Effect.CREDITS:
-                if not self.fake:
-                    if self.skill.value > 0:
-                        s = ''
-                        if self.skill.value != 1:
-                            s = 's'
-                        target.gain_credits(self.skill.value)
-                        target.report += f"You gained {self.skill.value} credit{s}. ({target.credits} total)." \
-                                         + os.linesep
-                    elif self.skill.value < 0:
-                        s = ''
-                        if self.skill.value != -1:
-                            s = 's'
-                        target.lose_credits(self.skill.value * -1)
-                        target.report += f"You lost {self.skill.value * -1} credit{s}. ({target.credits} remaining)." \
-                                         + os.linesep
-            elif self.skill.effect == Effect.ACADEMIC:
-                if not self.fake:
-                    target.academics += self.skill.value
-                    target.report += f"You gained {self.skill.value} Academics ({target.academics}){os.linesep}"
-            elif self.skill.effect == Effect.INTERRUPT:
-                if not self.fake:
-                    Action.interrupted_players.add(target)
-            elif self.skill.effect == Effect.SCHEDULE:
-                if not self.fake:
-                    if self.skill.value_b:
-                        schedule_targets.append(target)
-                    else:
-                        from skill import get_skill
-                        HandleSkill.handle_noncombat_skill(
-                            self.game, self.player, get_skill(self.skill.value))
-            elif self.skill.effect == Effect.GAIN_ABILITY_OR_PROGRESS:
-                if not self.fake:
-                    ability = get_ability(self.skill.value)
-                    if target.has_ability(ability.name, strict=True):
-                        target.report += f"You already have {ability.name}.{os.linesep}"
-                        Action.progress(target, ability.cost)
-                    elif ability.get_prerequisite() and \
-                            not target.has_ability(ability.get_prerequisite().name, strict=True,
-                                                   ignore_this_turn=False):
-                        target.report += f"You lack the prerequisite for {ability.name}.{os.linesep}"
-                        Action.progress(target, ability.cost)
-                    else:
-                        target.gain_ability(ability)
-            elif self.skill.effect == Effect.TEMP_SKILL:
-                if not self.fake:
-                    from skill import get_skill
-                    temp_skill = get_skill(self.skill.value)
-                    temp_skill.player_of_origin = self.player
-                    target.temporary_skills.append(temp_skill)
-
-            else:
+            if self.skill.effect not in NONCOMBAT_EFFECT_HANDLERS:
                 raise Exception(
                     f"Unhandled effect type in noncombat! {self.skill.effect.name} {self.skill.text}")
+            apply, handles_fake = NONCOMBAT_EFFECT_HANDLERS[self.skill.effect]
+            if handles_fake or not self.fake:
+                apply(self, target, times)
 
         if self.skill.effect == Effect.SCHEDULE:
-            if schedule_targets:
+            if self.schedule_targets:
                 self.game.add_event_in_x_turns(self.skill.value_b, skill_pin=self.skill.value,
-                                               source=self.player, targets=schedule_targets)
+                                               source=self.player, targets=self.schedule_targets)
 
     @classmethod
     def handle_noncombat_skill(cls, game: 'Game', player: 'Player', skill: 'Skill'):
@@ -592,16 +434,218 @@ class HandleSkill(Action):
             if skill.targets:
                 HandleSkill(game, player, skill, targets=skill.targets)
         elif skill.trigger == Trigger.ALL:
-            HandleSkill(game, player, skill, targets=list(Action.players))
+            HandleSkill(game, player, skill, targets=list(game.turn_context.players))
         elif skill.trigger == Trigger.RANDOM:
             HandleSkill(game, player, skill, targets=[game.choice(
-                [p for p in Action.sorted_players() if not p.is_dead()])])
+                [p for p in Action.sorted_players(game) if not p.is_dead()])])
         elif skill.trigger == Trigger.RANDOM_OTHER:
-            HandleSkill(game, player, skill, targets=[game.choice([p for p in Action.sorted_players() if not p.is_dead()
+            HandleSkill(game, player, skill, targets=[game.choice([p for p in Action.sorted_players(game) if not p.is_dead()
                                                                    and p != player])])
         elif skill.trigger == Trigger.OTHERS:
             HandleSkill(game, player, skill, targets=[
-                p for p in Action.players if p != player])
+                p for p in game.turn_context.players if p != player])
+
+
+# Effect: (Applies a noncombat skill to one target, Whether it runs for fake skills)
+# Called with (Action, Target, Times), fake skills only pretend to work so most handlers are skipped for them
+NONCOMBAT_EFFECT_HANDLERS: Dict[Effect, Tuple[Callable[[HandleSkill, 'Player', int], None], bool]] = {}
+
+
+def noncombat_effect(*effects: Effect, handles_fake: bool = False):
+    def register(handler: Callable[[HandleSkill, 'Player', int], None]):
+        for effect in effects:
+            assert effect not in NONCOMBAT_EFFECT_HANDLERS, f"Noncombat effect {effect.name} is handled twice"
+            NONCOMBAT_EFFECT_HANDLERS[effect] = (handler, handles_fake)
+        return handler
+
+    return register
+
+
+def _is_immune(target: 'Player', condition: Condition) -> bool:
+    return condition in CONDITION_IMMUNITY and target.has_condition(CONDITION_IMMUNITY[condition])
+
+
+@noncombat_effect(Effect.CONDITION, Effect.TURN_CONDITION)
+def _turn_condition(action: HandleSkill, target: 'Player', times: int):
+    if not _is_immune(target, action.skill.condition):
+        for _ in range(times):
+            target.turn_conditions.append(action.skill.condition)
+
+
+@noncombat_effect(Effect.PERMANENT_CONDITION)
+def _permanent_condition(action: HandleSkill, target: 'Player', times: int):
+    if not _is_immune(target, action.skill.condition):
+        for _ in range(times):
+            target.conditions.append(action.skill.condition)
+
+
+@noncombat_effect(Effect.TENTATIVE_CONDITION)
+def _tentative_condition(action: HandleSkill, target: 'Player', times: int):
+    if not _is_immune(target, action.skill.condition):
+        for _ in range(times):
+            target.tentative_conditions.append(action.skill.condition)
+
+
+@noncombat_effect(Effect.REL_CONDITION, handles_fake=True)
+def _relative_condition(action: HandleSkill, target: 'Player', _times: int):
+    # To be refactored if I ever need to give arbitrary players relative_conditions or if needs to stack
+    if target == action.player:
+        raise Exception("No target for relative condition?")
+    if not action.fake:
+        action.player.add_relative_condition(target, action.skill.condition)
+
+
+@noncombat_effect(Effect.REMOVE_REL_CONDITION, handles_fake=True)
+def _remove_relative_condition(action: HandleSkill, target: 'Player', _times: int):
+    # To be refactored if I ever need to remove from arbitrary players or if needs to stack
+    if target == action.player:
+        raise Exception("No target for relative condition?")
+    if not action.fake:
+        action.player.remove_relative_condition(target, action.skill.condition)
+
+
+@noncombat_effect(Effect.REMOVE_CONDITION)
+def _remove_condition(action: HandleSkill, target: 'Player', times: int):
+    condition = action.skill.condition
+    for _ in range(times):
+        if condition in target.turn_conditions:
+            target.turn_conditions.remove(condition)
+        elif condition in target.conditions:
+            target.conditions.remove(condition)
+
+
+@noncombat_effect(Effect.CONSUME)
+def _consume(action: HandleSkill, target: 'Player', times: int):
+    condition = action.skill.condition
+    for _ in range(times):
+        if condition in target.turn_conditions:
+            target.turn_conditions.remove(condition)
+            for gained in action.skill.condition_list:
+                target.turn_conditions.append(gained)
+        if condition in target.conditions:
+            target.conditions.remove(condition)
+            for gained in action.skill.condition_list:
+                target.conditions.append(gained)
+
+
+@noncombat_effect(Effect.DEV_SABOTAGE, handles_fake=True)
+def _dev_sabotage(action: HandleSkill, target: 'Player', _times: int):
+    if target == action.player:
+        raise Exception("No target for dev sabotage?")
+    if not action.fake:
+        target.dev_sabotaged(action.skill.text.replace(SELF_PLACEHOLDER, "somebody")
+                             .replace(TARGET_PLACEHOLDER, target.name))
+
+
+@noncombat_effect(Effect.COPYCAT, handles_fake=True)
+def _copycat(action: HandleSkill, target: 'Player', _times: int):
+    if target == action.player:
+        raise Exception("No target for copycat?")
+    action.player.copycat(target, fake=action.fake)
+
+
+@noncombat_effect(Effect.PROGRESS)
+def _progress(action: HandleSkill, target: 'Player', _times: int):
+    Action.progress(target, action.skill.value)
+
+
+@noncombat_effect(Effect.MAX_WILLPOWER)
+def _max_willpower(action: HandleSkill, target: 'Player', _times: int):
+    target.max_willpower += action.skill.value
+
+
+# Effect: (Injury Modifiers, Petrify)
+NONCOMBAT_DAMAGE_EFFECTS: Dict[Effect, Tuple[List[InjuryModifier], bool]] = {
+    Effect.DAMAGE: ([], False),
+    Effect.GRIEVOUS: ([InjuryModifier.GRIEVOUS], False),
+    Effect.NONLETHAL: ([InjuryModifier.NONLETHAL], False),
+    Effect.PETRIFY: ([], True),
+    Effect.MINI_PETRIFY: ([InjuryModifier.MINI], True),
+}
+
+
+@noncombat_effect(*NONCOMBAT_DAMAGE_EFFECTS)
+def _damage(action: HandleSkill, target: 'Player', _times: int):
+    modifiers, petrify = NONCOMBAT_DAMAGE_EFFECTS[action.skill.effect]
+    noncombat_damage(action.player, target, modifiers[:], petrify=petrify)
+
+
+@noncombat_effect(Effect.KILL)
+def _kill(_action: HandleSkill, target: 'Player', _times: int):
+    target.kill()
+
+
+@noncombat_effect(Effect.HEAL)
+def _heal(_action: HandleSkill, target: 'Player', _times: int):
+    target.heal()
+
+
+@noncombat_effect(Effect.ITEM)
+def _item(action: HandleSkill, target: 'Player', _times: int):
+    if action.skill.value_b:
+        target.gain_item(get_item(action.skill.value), action.skill.value_b)
+    else:
+        target.gain_item(get_item(action.skill.value))
+
+
+@noncombat_effect(Effect.CREDITS)
+def _credits(action: HandleSkill, target: 'Player', _times: int):
+    value = action.skill.value
+    if value > 0:
+        s = ''
+        if value != 1:
+            s = 's'
+        target.gain_credits(value)
+        target.report += f"You gained {value} credit{s}. ({target.credits} total)." + os.linesep
+    elif value < 0:
+        s = ''
+        if value != -1:
+            s = 's'
+        target.lose_credits(value * -1)
+        target.report += f"You lost {value * -1} credit{s}. ({target.credits} remaining)." + os.linesep
+
+
+@noncombat_effect(Effect.ACADEMIC)
+def _academic(action: HandleSkill, target: 'Player', _times: int):
+    target.academics += action.skill.value
+    target.report += f"You gained {action.skill.value} Academics ({target.academics}){os.linesep}"
+
+
+@noncombat_effect(Effect.INTERRUPT)
+def _interrupt(action: HandleSkill, target: 'Player', _times: int):
+    action.context.interrupted_players.add(target)
+
+
+@noncombat_effect(Effect.SCHEDULE)
+def _schedule(action: HandleSkill, target: 'Player', _times: int):
+    if action.skill.value_b:
+        action.schedule_targets.append(target)
+    else:
+        from skill import get_skill
+        HandleSkill.handle_noncombat_skill(action.game, action.player, get_skill(action.skill.value))
+
+
+@noncombat_effect(Effect.GAIN_ABILITY_OR_PROGRESS)
+def _gain_ability_or_progress(action: HandleSkill, target: 'Player', _times: int):
+    ability = get_ability(action.skill.value)
+    if target.has_ability(ability.name, strict=True):
+        target.report += f"You already have {ability.name}.{os.linesep}"
+        Action.progress(target, ability.cost)
+    elif ability.get_prerequisite() and \
+            not target.has_ability(ability.get_prerequisite().name, strict=True,
+                                   ignore_this_turn=False):
+        target.report += f"You lack the prerequisite for {ability.name}.{os.linesep}"
+        Action.progress(target, ability.cost)
+    else:
+        target.gain_ability(ability)
+
+
+@noncombat_effect(Effect.TEMP_SKILL)
+def _temp_skill(action: HandleSkill, target: 'Player', _times: int):
+    from skill import get_skill
+    temp_skill = get_skill(action.skill.value)
+    temp_skill.player_of_origin = action.player
+    target.temporary_skills.append(temp_skill)
 
 
 class Wander(Action):
@@ -612,7 +656,7 @@ class Wander(Action):
         self.maintains_hiding = True
 
     def act(self):
-        if self.player not in Action.not_wandering:
+        if self.player not in self.context.not_wandering:
             if self.player.has_condition(Condition.HIDING):
                 self.public_description = f"{self.player.name} hid."
                 self.on_interrupt = f"{self.player.name} failed to hide."
@@ -633,8 +677,8 @@ class Attack(Action):
         self.target = target
 
     def act(self):
-        if self.target in MasterIllusion.redirect.get(self.player, {}):
-            self.target = MasterIllusion.redirect[self.player][self.target]
+        if self.target in self.context.illusion_redirect.get(self.player, {}):
+            self.target = self.context.illusion_redirect[self.player][self.target]
 
         if self.player.has_condition(Condition.NO_COMBAT):
             self.player.report += f"{self.player.name} was unable to find any foes.{os.linesep}"
@@ -652,7 +696,7 @@ class Attack(Action):
                         f"{self.player.name} revealed they were not actually dead.")
                     self.player.conditions.remove(Condition.HIDING)
                     get_main_report().mark_revealed(self.player)
-            if self.target in Illusion.handled:
+            if self.target in self.context.illusion_handled:
                 if self.target.fake_action.combat_on_interrupt:
                     self.public_description += " " + self.target.fake_action.combat_on_interrupt
             elif self.target.has_ability("Counter Intelligence I") and self.game and not self.game.is_day():
@@ -662,8 +706,8 @@ class Attack(Action):
                 if self.target.action.combat_on_interrupt:
                     self.public_description += " " + self.target.action.combat_on_interrupt
             self.public_description += "."
-            Action.interrupted_players.add(self.target)
-            Action.attacked.add(self.target)
+            self.context.interrupted_players.add(self.target)
+            self.context.attacked.add(self.target)
             get_combat_handler().add_attack(self.player, self.target)
             if self.target.fake_action.on_interrupt:
                 self.target.fake_action.public_description = self.target.fake_action.on_interrupt
@@ -676,8 +720,8 @@ class Attack(Action):
 
             # The combat handler will ensure it gets added to the players regular report
             get_main_report().add_action(self.player, self.public_description,
-                                         hidden=self.player in Illusion.handled)
-            Action.not_wandering.add(self.player)
+                                         hidden=self.player in self.context.illusion_handled)
+            self.context.not_wandering.add(self.player)
             Action.add_action_record(self.player, Attack, self.target)
             self.player.turn_conditions.append(Condition.ATTACKED)
 
@@ -714,17 +758,17 @@ class Learn(Action):
         self.target = target
 
     def _act(self):
-        if not Action.can_act(self.target) or self.target not in Action.teacher_student \
-                or Action.teacher_student[self.target] != self.player:
+        if not Action.can_act(self.target) or self.target not in self.context.teacher_student \
+                or self.context.teacher_student[self.target] != self.player:
             self.player.report += f"{self.player.name} failed to learn from {self.target.name}, " \
                                   f"so {self.player.name} trained instead." + \
                                   os.linesep
             Train(self.game, self.player)
         else:
-            Action.student_teacher[self.player] = self.target
-            ability = Action.teacher_ability[self.target]
+            self.context.student_teacher[self.player] = self.target
+            ability = self.context.teacher_ability[self.target]
             get_main_report().add_action(self.player, f"{self.player.name} learned from {self.target.name}.",
-                                         hidden=self.player in Illusion.handled)
+                                         hidden=self.player in self.context.illusion_handled)
             self.player.report += f"{self.player.name} learned {ability.name} from {self.target.name}." + os.linesep
             self.player.gain_ability(ability)
             Action.add_action_record(self.player, Learn, self.target)
@@ -748,8 +792,8 @@ class Teach(Action):
                                   os.linesep
             Train(self.game, self.player)
         else:
-            Action.teacher_student[self.player] = self.target
-            Action.teacher_ability[self.player] = self.ability
+            self.context.teacher_student[self.player] = self.target
+            self.context.teacher_ability[self.player] = self.ability
             TeachFollow(self.game, self.player, self.target, self.ability)
 
 
@@ -762,9 +806,9 @@ class TeachFollow(Action):
         self.ability = ability
 
     def _act(self):
-        if Action.student_teacher.get(self.target, None) == self.player:
+        if self.context.student_teacher.get(self.target, None) == self.player:
             get_main_report().add_action(self.player, f"{self.player.name} taught {self.target.name}.",
-                                         hidden=self.player in Illusion.handled)
+                                         hidden=self.player in self.context.illusion_handled)
             self.player.report += f"{self.player.name} taught {self.target.name} {self.ability.name}." + os.linesep
             if self.player.is_altruistic():
                 Action.progress(self.player, 7)
@@ -803,12 +847,12 @@ class Class(Action):
 
     def act(self):
         # Edge case with fast attune
-        if self.player in Action.interrupted_players:
+        if self.player in self.context.interrupted_players:
             super().act()
         elif self.player.has_condition(Condition.NO_CLASS):
             self.player.report += f"{self.player.name} was kicked out of class." + os.linesep
             get_main_report().broadcast(f"{self.player.name} was kicked out of class.")
-        elif self.player in Action.no_class:
+        elif self.player in self.context.no_class:
             self.player.report += f"{self.player.name} was kicked out of class for being disruptive." + os.linesep
             get_main_report().broadcast(f"{self.player.name} was kicked out of class.")
         else:
@@ -837,7 +881,7 @@ class Doctor(Action):
 
     def _act(self):
         if Condition.INJURED in self.player.conditions:
-            Action.was_healed.add(self.player)
+            self.context.was_healed.add(self.player)
         if self.player.heal():
             self.player.report += f"{self.player.name} was treated, but you remain wounded." + os.linesep
         else:
@@ -948,7 +992,7 @@ class Heal(Action):
             if self.from_healing_tank:
                 self.player.report += f"{self.player.name} used a Healing Tank." + os.linesep
             if Condition.INJURED in self.player.conditions:
-                Action.was_healed.add(self.player)
+                self.context.was_healed.add(self.player)
             if self.player.heal():
                 self.player.report += f"{self.player.name} was treated, but {self.player.name} " \
                                       f"remain wounded." + os.linesep
@@ -970,7 +1014,7 @@ class Heal(Action):
 
                 was_injured = self.target.has_condition(Condition.INJURED)
                 if was_injured:
-                    Action.was_healed.add(self.target)
+                    self.context.was_healed.add(self.target)
                 if self.target.has_condition(Condition.PETRIFIED):
                     add_to_player_report(f"{self.player.name} tried to treat {self.target.name}, "
                                          f"but they were a statue." + os.linesep)
@@ -988,7 +1032,7 @@ class Heal(Action):
                         add_to_target_report(f"{self.player.name} treated {self.target.name} "
                                              f"and {self.target.name} is now healthy." + os.linesep)
                     if self.player.is_altruistic():
-                        if was_injured or self.target in Action.was_healed:
+                        if was_injured or self.target in self.context.was_healed:
                             Action.progress(self.player, 7)
                         else:
                             add_to_player_report(
@@ -997,8 +1041,6 @@ class Heal(Action):
 
 
 class Steal(Action):
-    victim_to_thieves: Dict['Player', Set['Player']] = {}
-
     def __init__(self, game: Optional['Game'], player: "Player", target: "Player"):
         super().__init__(priority=60, game=game, player=player, fragile=True,
                          public_description=f"{player.name} robbed {target.name}.",
@@ -1019,9 +1061,9 @@ class Steal(Action):
             if self.target.get_awareness() > self.player.get_awareness():
                 self.player.report += f"You failed to rob {self.target.name}." + os.linesep
                 return
-        if self.target not in Steal.victim_to_thieves:
-            Steal.victim_to_thieves[self.target] = set()
-        Steal.victim_to_thieves[self.target].add(self.player)
+        if self.target not in self.context.victim_to_thieves:
+            self.context.victim_to_thieves[self.target] = set()
+        self.context.victim_to_thieves[self.target].add(self.player)
         trap = False
         items = {}
         for item in self.target.get_items():
@@ -1036,8 +1078,6 @@ class Steal(Action):
 
 
 class StealFollow(Action):
-    handled: Set['Player'] = set()
-
     def __init__(self, game: Optional['Game'], player: "Player", target: "Player",
                  items: Dict['Item', int], trap: bool):
         super().__init__(priority=61, game=game, player=player, fragile=False)
@@ -1046,9 +1086,9 @@ class StealFollow(Action):
         self.trap = trap
 
     def _act(self):
-        if len(Steal.victim_to_thieves[self.target]) > 1:
+        if len(self.context.victim_to_thieves[self.target]) > 1:
             involved = " and ".join(sorted([get_main_report().face_mask_replacement(player.name, self.player.name)
-                                            for player in Steal.victim_to_thieves[self.target]]))
+                                            for player in self.context.victim_to_thieves[self.target]]))
             self.player.report += f"{involved} fought over the loot." + os.linesep
             self.player.report += "It was all lost." + os.linesep
 
@@ -1066,8 +1106,8 @@ class StealFollow(Action):
             get_main_report().broadcast(
                 f"A booby trap exploded in {self.player.name}'s face!")
 
-        if self.target not in StealFollow.handled:
-            StealFollow.handled.add(self.target)
+        if self.target not in self.context.steal_handled:
+            self.context.steal_handled.add(self.target)
             self.target.report += os.linesep + "Somebody robbed you!" + os.linesep
             for item, amount in self.items.items():
                 self.target.lose_item(item, amount)
@@ -1299,8 +1339,8 @@ class Canvas(Action):
         self.target = target
 
     def _act(self):
-        if not Action.can_act(self.target) or self.target not in Action.artist_canvas \
-                or Action.artist_canvas[self.target] != self.player or self.player.tattoo:
+        if not Action.can_act(self.target) or self.target not in self.context.artist_canvas \
+                or self.context.artist_canvas[self.target] != self.player or self.player.tattoo:
             if self.player.tattoo:
                 self.player.report += "You already have a tattoo." + os.linesep
             self.player.report += f"{self.player.name} failed to get a tattoo from {self.target.name}, " \
@@ -1308,10 +1348,10 @@ class Canvas(Action):
                                   os.linesep
             Train(self.game, self.player)
         else:
-            Action.canvas_artist[self.player] = self.target
-            rune = Action.artist_rune[self.target]
+            self.context.canvas_artist[self.player] = self.target
+            rune = self.context.artist_rune[self.target]
             get_main_report().add_action(self.player, f"{self.player.name} got tattooed by {self.target.name}.",
-                                         hidden=self.player in Illusion.handled)
+                                         hidden=self.player in self.context.illusion_handled)
             self.player.report += f"{self.player.name} got tattooed by {self.target.name} " \
                                   f"with {rune.get_ability_name()}." + \
                                   os.linesep
@@ -1382,8 +1422,8 @@ class Tattoo(Action):
                                       os.linesep
                 Train(self.game, self.player)
             else:
-                Action.artist_canvas[self.player] = self.target
-                Action.artist_rune[self.player] = self.rune
+                self.context.artist_canvas[self.player] = self.target
+                self.context.artist_rune[self.player] = self.rune
                 TattooFollow(self.game, self.player, self.target, self.rune)
 
 
@@ -1396,9 +1436,9 @@ class TattooFollow(Action):
         self.rune = rune
 
     def _act(self):
-        if Action.canvas_artist.get(self.target) == self.player:
+        if self.context.canvas_artist.get(self.target) == self.player:
             get_main_report().add_action(self.player, f"{self.player.name} tattooed {self.target.name}.",
-                                         hidden=self.player in Illusion.handled)
+                                         hidden=self.player in self.context.illusion_handled)
             self.player.report += f"{self.player.name} tattooed {self.target.name} " \
                                   f"with {self.rune.name}." + os.linesep
             if self.player.is_altruistic():
@@ -1442,8 +1482,8 @@ class MultiAttack(Action):
         interruption_strings = []
         attacked_someone = False
 
-        if self.player in MasterIllusion.redirect:
-            self.targets = [MasterIllusion.redirect[self.player].get(
+        if self.player in self.context.illusion_redirect:
+            self.targets = [self.context.illusion_redirect[self.player].get(
                 target, target) for target in self.targets]
             self.targets = list(set(self.targets))
 
@@ -1457,8 +1497,8 @@ class MultiAttack(Action):
                         f"{target.name} ({target.action.combat_on_interrupt}),")
                 else:
                     interruption_strings.append(f"{target.name},")
-                Action.interrupted_players.add(target)
-                Action.attacked.add(target)
+                self.context.interrupted_players.add(target)
+                self.context.attacked.add(target)
                 get_combat_handler().add_attack(self.player, target)
                 if target.fake_action.on_interrupt:
                     target.fake_action.public_description = target.fake_action.on_interrupt
@@ -1476,8 +1516,8 @@ class MultiAttack(Action):
             self.public_description += "."
 
             get_main_report().add_action(self.player, self.public_description,
-                                         hidden=self.player in Illusion.handled)
-            Action.not_wandering.add(self.player)
+                                         hidden=self.player in self.context.illusion_handled)
+            self.context.not_wandering.add(self.player)
             self.player.turn_conditions.append(Condition.ATTACKED)
 
 
@@ -1518,18 +1558,18 @@ class Spy(Action):
                         HandleSkill(self.game, self.target, skill, self.player)
                 return
         SpyFollow(self.game, self.player, self.target, counter_int)
-        if self.player not in Action.spied:
-            Action.spied[self.player] = set()
-        Action.spied[self.player].add(self.target)
+        if self.player not in self.context.spied:
+            self.context.spied[self.player] = set()
+        self.context.spied[self.player].add(self.target)
 
         if counter_int:
             Action.add_action_record(player=self.target, action=type(self.target.fake_action),
                                      target=getattr(
                                          self.target.fake_action, 'target', None),
                                      fake=True)
-            if self.player not in Action.fake_spied:
-                Action.fake_spied[self.player] = set()
-            Action.fake_spied[self.player].add(self.target)
+            if self.player not in self.context.fake_spied:
+                self.context.fake_spied[self.player] = set()
+            self.context.fake_spied[self.player].add(self.target)
 
         for skill in self.player.get_skills():
             if skill.trigger == Trigger.SPY:
@@ -1557,16 +1597,14 @@ class SpyFollow(Action):
 # Free Actions
 
 class ConsumeItem(Action):
-    unique_pair: Set[Tuple['Player', 'Item']] = set()
-
     def __init__(self, game: Optional['Game'], player: "Player", item: "Item"):
-        if (player, item) in ConsumeItem.unique_pair:
+        if (player, item) in game.turn_context.consume_unique_pair:
             raise Exception(
                 f"{player.name} is trying to consume multiple copies of the same item ({item.name}).")
         super().__init__(priority=-20 if item.pin == DIMENSIONAL_KEY else 10, game=game, player=player, fragile=False,
                          public_description=f"{player.name} used {item.name}")
         self.item = item
-        ConsumeItem.unique_pair.add((player, item))
+        self.context.consume_unique_pair.add((player, item))
 
     def act(self):
         if self.item.pin == self.player.tattoo:
@@ -1580,13 +1618,13 @@ class ConsumeItem(Action):
                 HandleSkill.handle_noncombat_skill(
                     self.game, self.player, skill)
             if self.item.pin == POISON_GAS:
-                Action.no_class.add(self.player)
+                self.context.no_class.add(self.player)
                 get_combat_handler().add_solitary_combat(self.player)
 
             if isinstance(self.item, Rune):
                 if self.item.is_disruptive():
                     if not self.player.has_ability("Quiet Attune"):
-                        Action.no_class.add(self.player)
+                        self.context.no_class.add(self.player)
                 self.player.temporary_abilities.append(
                     self.item.get_ability_pin())
 
@@ -1599,21 +1637,12 @@ class ConsumeItem(Action):
 
 
 class Trade(Action):
-    unique_pair: Set[Tuple['Player', 'Player']] = set()
-
-    # {(Sender, Recipient): (Credits, {Item: Amount})}
-    item_conditions: Dict[Tuple['Player', 'Player'],
-                          Tuple[int, Dict['Item', int]]] = {}
-
-    # Used to prevent a player from promising the same items/credits to multiple players
-    reserved: Dict['Player', Tuple[int, Dict['Item', int], List[str]]] = {}
-
     def __init__(self, game: Optional['Game'], player: "Player", target: "Player",
                  items: Optional[Dict['Item', int]] = None, money: int = 0,
                  automata: Optional[List[Union['Automata', str]]] = None,
                  action_condition: Optional[ACTION_CONDITION] = None,
                  item_condition: Optional[ITEM_CONDITION] = None):
-        if (player, target) in Trade.unique_pair:
+        if (player, target) in game.turn_context.trade_unique_pair:
             raise Exception(
                 f"{player.name} is trying to trade with {target.name} multiple times")
         if money < 0:
@@ -1643,7 +1672,7 @@ class Trade(Action):
         self.automata = automata
         self.action_condition = action_condition
         self.item_condition = item_condition
-        Trade.unique_pair.add((player, target))
+        self.context.trade_unique_pair.add((player, target))
 
     def act(self):
         if self.target.is_dead() or self.target.has_condition(Condition.HIDING):
@@ -1660,7 +1689,7 @@ class Trade(Action):
                                           f"because the forbidden action occurred." + os.linesep
                 return
         failed_trade = False
-        reserved_credits, reserved_items, reserved_automata_names = Trade.reserved.get(
+        reserved_credits, reserved_items, reserved_automata_names = self.context.trade_reserved.get(
             self.player, (0, {}, []))
         if self.credits:
             reserved_credits += self.credits
@@ -1698,7 +1727,7 @@ class Trade(Action):
                                           + os.linesep
                     failed_trade = True
                 reserved_automata_names.append(automaton.name)
-        Trade.reserved[self.player] = (
+        self.context.trade_reserved[self.player] = (
             reserved_credits, reserved_items, reserved_automata_names)
         if failed_trade:
             return
@@ -1706,7 +1735,7 @@ class Trade(Action):
         if self.automata:
             items_and_automata[get_item_by_name(
                 "Automata")] = len(self.automata)
-        Trade.item_conditions[(self.player, self.target)] = (
+        self.context.trade_item_conditions[(self.player, self.target)] = (
             self.credits, items_and_automata)
         TradeFollow(self.game, self.player, self.target,
                     self.items, self.credits, self.automata,
@@ -1728,19 +1757,19 @@ class TradeFollow(Action):
 
     def _act(self):
         if self.item_condition:
-            pending_credits, pending_items = Trade.item_conditions.get(
+            pending_credits, pending_items = self.context.trade_item_conditions.get(
                 (self.item_condition[0], self.player), (0, {}))
             if pending_credits < self.item_condition[1]:
                 self.player.report += f"You did not trade with {self.target.name} because " \
                                       f"{self.item_condition[0].name} did not send you enough credits." + os.linesep
-                Trade.item_conditions[(self.player, self.target)] = (0, {})
+                self.context.trade_item_conditions[(self.player, self.target)] = (0, {})
                 return
             for (item, amount) in self.item_condition[2].items():
                 if item not in pending_items or pending_items[item] < amount:
                     self.player.report += f"You did not trade with {self.target.name} because " \
                                           f"{self.item_condition[0].name} did not send you enough {item.name}." \
                                           + os.linesep
-                    Trade.item_conditions[(self.player, self.target)] = (0, {})
+                    self.context.trade_item_conditions[(self.player, self.target)] = (0, {})
                     return
         TradeFinal(self.game, self.player, self.target, self.items,
                    self.credits, self.automata, self.item_condition)
@@ -1761,19 +1790,19 @@ class TradeFinal(Action):
 
     def _act(self):
         if self.item_condition:
-            pending_credits, pending_items = Trade.item_conditions.get(
+            pending_credits, pending_items = self.context.trade_item_conditions.get(
                 (self.item_condition[0], self.player), (0, {}))
             if pending_credits < self.item_condition[1]:
                 self.player.report += f"You did not trade with {self.target.name} because " \
                                       f"{self.item_condition[0].name} did not send you enough credits." + os.linesep
-                Trade.item_conditions[(self.player, self.target)] = (0, {})
+                self.context.trade_item_conditions[(self.player, self.target)] = (0, {})
                 return
             for (item, amount) in self.item_condition[2].items():
                 if item not in pending_items or pending_items[item] < amount:
                     self.player.report += f"You did not trade with {self.target.name} because " \
                                           f"{self.item_condition[0].name} did not send you enough {item.name}." \
                                           + os.linesep
-                    Trade.item_conditions[(self.player, self.target)] = (0, {})
+                    self.context.trade_item_conditions[(self.player, self.target)] = (0, {})
                     return
         if self.credits:
             plural = '' if self.credits == 1 else 's'
@@ -1909,7 +1938,7 @@ class Attune(Action):
             self.player.report += f"You attuned to {'/'.join([circuit.name for circuit in self.circuits])}." \
                                   + os.linesep
             if not self.player.has_ability("Quiet Attune"):
-                Action.no_class.add(self.player)
+                self.context.no_class.add(self.player)
                 get_main_report().set_attunement(self.player, self.circuits)
             for skill in self.player.get_skills():
                 if skill.trigger == Trigger.NONCOMBAT_POST_ATTUNE:
@@ -1920,8 +1949,6 @@ class Attune(Action):
 
 
 class UseHydro(Action):
-    locked: Set['Player'] = set()
-
     def __init__(self, game: Optional['Game'], player: "Player", ability: "Ability",
                  will: List[int], contingency: bool):
         super().__init__(33 if contingency else -5, game=game, player=player, fragile=False, prevents_wandering=False)
@@ -1930,13 +1957,13 @@ class UseHydro(Action):
         self.contingency = contingency
 
     def act(self):
-        if self.contingency and self.player not in Action.attacked:
+        if self.contingency and self.player not in self.context.attacked:
             return
 
         if self.ability.pin in self.player.hydro_spells:
             return  # Trying to use the same ability twice
 
-        if self.contingency and self.player in UseHydro.locked:
+        if self.contingency and self.player in self.context.hydro_locked:
             self.player.report += f"You were prevented from using {self.ability.name}!" + os.linesep
             return
 
@@ -1971,8 +1998,6 @@ class UseHydro(Action):
 
 
 class Illusion(Action):
-    handled: Set['Player'] = set()
-
     def __init__(self, game: Optional['Game'], player: "Player", target: "Player",
                  fake_action: 'Action', fake_training: Optional['Ability'] = None):
         # Randomly sort multiple illusions on the same target
@@ -1985,7 +2010,7 @@ class Illusion(Action):
         if not self.player.has_condition(Condition.ILLUSIONIST):
             return
 
-        if self.target not in Illusion.handled:
+        if self.target not in self.context.illusion_handled:
             self.target.fake_action = self.fake_action
             if isinstance(self.fake_action, Wander):
                 self.target.action.maintains_hiding = True
@@ -2009,7 +2034,7 @@ class Illusion(Action):
                     else:
                         get_main_report().set_training(self.target, "nothing")
 
-            Illusion.handled.add(self.target)
+            self.context.illusion_handled.add(self.target)
 
 
 class IllusionFollow(Action):
@@ -2020,7 +2045,7 @@ class IllusionFollow(Action):
         self.fake_training = fake_training
 
     def act(self):
-        if self.player in Action.interrupted_players:
+        if self.player in self.context.interrupted_players:
             get_main_report().add_action(
                 self.player, self.fake_action.on_interrupt, fake=True)
         else:
@@ -2043,8 +2068,6 @@ class IllusionFollow(Action):
 
 
 class MasterIllusion(Action):
-    redirect: Dict['Player', Dict['Player', 'Player']] = {}
-
     def __init__(self, game: Optional['Game'], player: "Player",
                  target: "Player", defended: "Player", redirected: "Player"):
         # Randomly sort multiple illusions on the same target
@@ -2064,10 +2087,10 @@ class MasterIllusion(Action):
                               f"with {self.redirected.name}." + \
                               os.linesep + os.linesep
 
-        if self.defended not in MasterIllusion.redirect.get(self.target, {}):
-            if self.target not in MasterIllusion.redirect:
-                MasterIllusion.redirect[self.target] = {}
-            MasterIllusion.redirect[self.target][self.defended] = self.redirected
+        if self.defended not in self.context.illusion_redirect.get(self.target, {}):
+            if self.target not in self.context.illusion_redirect:
+                self.context.illusion_redirect[self.target] = {}
+            self.context.illusion_redirect[self.target][self.defended] = self.redirected
             if isinstance(self.target.action, Attack):
                 if self.target.action.target == self.defended:
                     self.target.action.public_description = f"{self.target.name} attacked {self.redirected.name}"
@@ -2088,7 +2111,7 @@ class NoncombatSkillStep(Action):
         super().__init__(0, game=game, player=None)
 
     def act(self):
-        for player in Action.players:
+        for player in self.context.players:
             if not player.is_dead():
                 if player.concept and not player.has_condition(Condition.AEROMANCER):
                     player.turn_conditions.append(Condition.AEROMANCER)
@@ -2108,7 +2131,7 @@ class EndOfTurnSkillStep(Action):
         super().__init__(125, game=game, player=None)
 
     def act(self):
-        for player in Action.players:
+        for player in self.context.players:
             if not player.is_dead():
                 for skill in player.get_skills():
                     if skill.trigger == Trigger.END_OF_TURN:
@@ -2121,7 +2144,7 @@ class TattooStep(Action):
         super().__init__(9, game=game, player=None)
 
     def act(self):
-        for player in Action.players:
+        for player in self.context.players:
             if not player.is_dead():
                 if player.tattoo is not None:
                     rune = get_item(player.tattoo)
@@ -2136,7 +2159,7 @@ class TattooStep(Action):
                             player.temporary_skills.append(skill)
                     if rune.is_disruptive():
                         if not player.has_ability("Quiet Attune"):
-                            Action.no_class.add(player)
+                            self.context.no_class.add(player)
                     player.temporary_abilities.append(rune.get_ability_pin())
 
 
@@ -2146,7 +2169,7 @@ class ContingencyBlockSimStep(Action):
 
     def act(self):
         handler = get_combat_handler()
-        UseHydro.locked = handler.drain_sim()
+        self.context.hydro_locked = handler.drain_sim()
 
 
 class CombatSimStep(Action):
@@ -2157,8 +2180,9 @@ class CombatSimStep(Action):
 
     def act(self):
         handler = get_combat_handler()
+        policy = self.game.scoring_policy
         fast_attune_players = []
-        for player in Action.players:
+        for player in self.context.players:
             if handler.player_in_combat(player):
                 if player.has_ability("Fast Attune III"):
                     fast_attune_players.append(player)
@@ -2173,23 +2197,14 @@ class CombatSimStep(Action):
                 circuit_possibilities = reacting_player.get_possible_attunement()
             elif reacting_player.has_ability("Fast Attune I"):
                 circuit_possibilities = reacting_player.get_one_swap_attunement()
-            # Personal score, negative score of others, contains gold, size attuned
-            best_score_so_far = (-999999999999999999, 0, False, 0)
+            best_score_so_far = None
             best_so_far = None
-            for possibility in circuit_possibilities:
-                sim_results = handler.simulate_combat(
-                    {reacting_player: possibility})
-                secondary = 0
-                for sim_player, score in sim_results.items():
-                    if sim_player.is_automata and sim_player.owner == reacting_player.name:
-                        secondary += score
-                    elif reacting_player.name != sim_player.name:
-                        secondary -= score
-                score = (sim_results[reacting_player],
-                         secondary,
-                         Element.GOLD in possibility,
-                         -1*len(possibility))
-                if score > best_score_so_far:
+            # Every possibility is simulated first so that the outcomes can be scored in one batch
+            outcomes = policy.score_outcomes([handler.simulate_combat_states({reacting_player: possibility}, policy)
+                                              for possibility in circuit_possibilities])
+            for possibility, sim_results in zip(circuit_possibilities, outcomes):
+                score = policy.rank_attunement(reacting_player, possibility, sim_results)
+                if best_score_so_far is None or score > best_score_so_far:
                     best_score_so_far = score
                     best_so_far = possibility
             if best_so_far:
@@ -2203,7 +2218,7 @@ class CombatSimStep(Action):
             if not final_player.has_ability("Quiet Attune"):
                 get_main_report().set_attunement(final_player, circuits)
                 if circuits:
-                    Action.no_class.add(final_player)
+                    self.context.no_class.add(final_player)
             final_player.tentative_conditions.clear()
             for skill in final_player.get_skills():
                 if skill.trigger == Trigger.NONCOMBAT_POST_ATTUNE:
@@ -2215,11 +2230,11 @@ class CombatStep(Action):
         super().__init__(35, game=game, player=None)
 
     def act(self):
-        was_alive = {player: not player.is_dead() for player in Action.players}
+        was_alive = {player: not player.is_dead() for player in self.context.players}
 
         get_combat_handler().process_all_combat()
 
-        for player in Action.players:
+        for player in self.context.players:
             player.report += COMBAT_PLACEHOLDER + os.linesep + os.linesep
 
             if get_combat_handler().hot_blood_check(player) and player.is_hotblooded():
@@ -2264,7 +2279,7 @@ class CombatStep(Action):
         for player in get_combat_handler().full_escape:
             get_main_report().add_action(
                 player, f"{player.name} escaped combat.")
-            self.interrupted_players.discard(player)
+            self.context.interrupted_players.discard(player)
 
 
 class ProgressStep(Action):
@@ -2285,18 +2300,18 @@ class ProgressStep(Action):
                         player.report += os.linesep
 
         was_progress = False
-        for player in Action.progress_dict:
+        for player in self.context.progress_dict:
             if player.is_dead():
                 continue
 
-            if Action.progress_dict.get(player) > 0:
+            if self.context.progress_dict.get(player) > 0:
                 if player.has_condition(Condition.NO_PROGRESS):
-                    player.report += f"Your {Action.progress_dict[player]} Progress was negated." + os.linesep
-                    Action.progress_dict[player] = 0
+                    player.report += f"Your {self.context.progress_dict[player]} Progress was negated." + os.linesep
+                    self.context.progress_dict[player] = 0
                     continue
 
-                player.gain_progress(Action.progress_dict[player])
-                Action.progress_dict[player] = 0
+                player.gain_progress(self.context.progress_dict[player])
+                self.context.progress_dict[player] = 0
                 was_progress = True
 
         if was_progress:
@@ -2310,12 +2325,9 @@ class WillpowerStep(Action):
 
     def act(self):
         if self.game:
-            for player in Action.players:
+            for player in self.context.players:
                 if not player.is_dead():
-                    player.max_willpower = 0
-                    for skill in player.get_skills(include_this_turn=True):
-                        if skill.effect == Effect.MAX_WILLPOWER:
-                            player.max_willpower += skill.value
+                    player.max_willpower = player.get_max_willpower()
                     if player.max_willpower:
                         player.report += os.linesep
                         if self.game.is_night() or player.has_ability("Rapid Regen II", ignore_this_turn=False):
@@ -2338,7 +2350,7 @@ class StatusChangeStep(Action):
         super().__init__(140, game=game, player=None)
 
     def act(self):
-        for player in Action.players:
+        for player in self.context.players:
             if not player.is_dead():
                 player.report += os.linesep
                 if Condition.SANITARY in player.conditions:
@@ -2346,7 +2358,7 @@ class StatusChangeStep(Action):
                 if player.has_condition(Condition.NO_PROGRESS_NEXT_TURN):
                     self.game.add_event_in_x_turns(1, 149, player)
                 if Condition.PETRIFIED in player.conditions:
-                    if player not in Action.not_wandering:
+                    if player not in self.context.not_wandering:
                         get_main_report().add_action(
                             player, f"{player.name} was stuck as a Statue.")
                     player.conditions.remove(Condition.PETRIFIED)
@@ -2429,54 +2441,5 @@ class SendMessage(Action):
             get_main_report().add_message(self.player, self.targets, self.message)
 
 
-def reset_action_handler():
-    Action.tic_index = 0
-    Action.queue = PriorityQueue()
-    Action.players = set()
-    Action.not_wandering = set()
-    Action.interrupted_players = set()
-    Action.attacked = set()
-    Action.progress_dict = {}
-    Action.no_class = set()  # Used poison gas or attuned
-    # Used for conditional trades based on actions
-    Action.action_record = []
-    Action.spied = {}
-    Action.fake_action_record = []
-    Action.fake_spied = {}
-
-    # Used for teaching/learning handshake
-    # Teacher: Student
-    Action.teacher_student = {}
-    # Student: Teacher
-    Action.student_teacher = {}
-    # Teacher: Ability
-    Action.teacher_ability = {}
-    # Used to allow Altruism to work when multiple players heal the same injured player
-    Action.was_healed = set()
-
-    # Used for tattoo coordination
-    # Artist: Canvas
-    Action.artist_canvas = {}
-    # Canvas: Artist
-    Action.canvas_artist = {}
-    # Artist: Rune
-    Action.artist_rune = {}
-
-    HandleSkill.info_once_dict = {}
-    HandleSkill.info_once_broadcast = set()
-
-    Steal.victim_to_thieves = {}
-    StealFollow.handled = set()
-
-    ConsumeItem.unique_pair = set()
-
-    Trade.unique_pair = set()
-    # {(Sender, Recipient): (Credits, {Item: Amount})}
-    Trade.item_conditions = {}
-    # Used to prevent a player from promising the same items/credits to multiple players
-    Trade.reserved = {}
-
-    Illusion.handled.clear()
-    MasterIllusion.redirect.clear()
-
-    UseHydro.locked.clear()
+def reset_action_handler(game: 'Game'):
+    game.turn_context = TurnContext()
@@ -42,7 +42,7 @@ class Automata(Player):
 
     def serialize(self) -> Dict:
         serialized = {'name': self.name, 'owner': self.owner.name,
-                      'conditions': self.conditions[:], 'items': self.items,
+                      'conditions': self.conditions[:], 'items': self.items.to_list(),
                       'bounty': self.bounty,
                       'relative_conditions': {k: v[:] for k, v in self.relative_conditions.items()},
                       'tattoo': self.tattoo}
@@ -140,6 +140,7 @@ class Automata(Player):
         if not reporting_func:
             reporting_func = self._non_combat_report_callable()
         self.conditions.append(Condition.DEAD)
+        self.game.turn_context.invalidate_actors()
         reporting_func(message, InfoScope.BROADCAST)
         get_main_report().add_death(self)
 
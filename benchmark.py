@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import main
+from actions import Action
+from combat import get_combat_handler
+from profiler import enable_profiling, disable_profiling
+from report import get_main_report
+from scoring import get_scoring_policy, get_scoring_policy_names, DEFAULT_POLICY
+
+HISTORY_FILE = "benchmark_history.json"
+
+METRICS = ['run_turn', 'process_all_combat', 'fast_attune', 'report', 'save']
+
+
+def get_snapshots(prefix: str) -> List[Tuple[int, bool]]:
+    snapshots = []
+    for file_name in os.listdir(f"save/{prefix}"):
+        suffix = file_name[:-len(".json")]
+        if suffix == "current" or suffix[-1] not in "dn":
+            continue
+        snapshots.append((int(suffix[:-1]), suffix[-1] == 'n'))
+    return sorted(snapshots)
+
+
+# Gives every living player a plausible order, the same for a given seed and snapshot
+def plan_turn(rng: random.Random):
+    game = main.GAME
+    alive = sorted([player for player in game.players.values() if not player.is_dead()], key=lambda p: p.name)
+    for player in alive:
+        others = [other for other in alive if other != player]
+        roll = rng.random()
+        try:
+            if roll < 0.45 and others:
+                player.plan_attack(*rng.sample(others, min(1 if rng.random() < 0.8 else 2, len(others))))
+            elif roll < 0.6:
+                player.plan_train()
+            elif roll < 0.7:
+                player.plan_bunker()
+            elif roll < 0.8 and game.is_day():
+                player.plan_class()
+            elif roll < 0.85 and game.is_day():
+                player.plan_doctor()
+            elif others:
+                player.plan_spy(rng.choice(others))
+        except Exception:
+            # Orders that are illegal for this player are skipped, they wander instead
+            pass
+
+
+def load_snapshot(prefix: str, turn: int, night: bool, workers: int):
+    get_main_report().reset()
+    get_combat_handler().reset()
+    get_combat_handler().workers = workers
+    main.load(prefix, turn, night)
+
+
+# Expects the snapshot to have been loaded already
+def run_snapshot(prefix: str, seed: int, scoring: str) -> Dict[str, float]:
+    game = main.GAME
+    game.scoring_policy = get_scoring_policy(scoring)
+    game.advance()
+    plan_turn(random.Random(seed))
+
+    profiler = enable_profiling()
+    was_alive = [player for player in game.players.values() if not player.is_dead()]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            Action.run_turn(game)
+            run_turn = time.perf_counter() - start
+    finally:
+        disable_profiling()
+
+    start = time.perf_counter()
+    for player in was_alive:
+        player.get_report()
+    get_main_report().generate_report(game)
+    report = time.perf_counter() - start
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as save_dir:
+        os.chdir(save_dir)
+        try:
+            start = time.perf_counter()
+            game.save(prefix)
+            save = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    return {'run_turn': run_turn,
+            'process_all_combat': profiler.totals.get(('combat', 'process_all_combat'), [0, 0.0])[1],
+            'fast_attune': profiler.totals.get(('action', 'CombatSimStep'), [0, 0.0])[1],
+            'report': report,
+            'save': save}
+
+
+def benchmark(prefixes: List[str], repeat: int, seed: int, scoring: str,
+              workers: int) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+    results: Dict[str, Dict[str, float]] = {}
+    # Snapshot: Reason
+    skipped: Dict[str, str] = {}
+    for prefix in prefixes:
+        for turn, night in get_snapshots(prefix):
+            name = f"{prefix}/{turn}{'n' if night else 'd'}"
+            best: Dict[str, float] = {}
+            for _ in range(repeat):
+                try:
+                    load_snapshot(prefix, turn, night, workers)
+                except Exception as e:
+                    # Older seasons were saved before some fields existed
+                    skipped[name] = f"{type(e).__name__}: {e}"
+                    break
+                # Anything failing past loading is a regression, not an old save
+                timings = run_snapshot(prefix, seed, scoring)
+                for metric, seconds in timings.items():
+                    best[metric] = min(best.get(metric, seconds), seconds)
+            if name not in skipped:
+                results[name] = best
+    return results, skipped
+
+
+def summarize(results: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    return {metric: sum(timings[metric] for timings in results.values()) for metric in METRICS}
+
+
+def load_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def format_summary(totals: Dict[str, float], previous: Optional[Dict[str, float]]) -> str:
+    summary = f"{'Metric':<20}{'Total ms':>12}{'Change':>10}" + os.linesep
+    for metric in METRICS:
+        change = ""
+        if previous and previous.get(metric):
+            change = f"{(totals[metric] - previous[metric]) / previous[metric] * 100:+.1f}%"
+        summary += f"{metric:<20}{totals[metric] * 1000:>12.1f}{change:>10}" + os.linesep
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time turn resolution against the archived saves.")
+    parser.add_argument('prefixes', nargs='*', help="Seasons to replay, every folder in save/ by default")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per snapshot, the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the scripted orders")
+    parser.add_argument('--history', default=HISTORY_FILE, help="JSON file the results are appended to")
+    parser.add_argument('--scoring', default=DEFAULT_POLICY, choices=get_scoring_policy_names(),
+                        help="Scoring policy simulated outcomes are evaluated with")
+    parser.add_argument('--workers', type=int, default=0, help="Processes combat groups are resolved in, 0 for none")
+    parser.add_argument('--label', default="", help="Note stored with this run, e.g. the change being measured")
+    args = parser.parse_args()
+
+    season_prefixes = args.prefixes or sorted(os.listdir("save"))
+    snapshot_results, skipped_snapshots = benchmark(season_prefixes, args.repeat, args.seed, args.scoring,
+                                                      args.workers)
+    for season in season_prefixes:
+        season_skipped = [name for name in skipped_snapshots if name.startswith(season + "/")]
+        if season_skipped:
+            print(f"Skipped {len(season_skipped)} {season} snapshots ({skipped_snapshots[season_skipped[0]]})")
+
+    history = load_history(args.history)
+    total_timings = summarize(snapshot_results)
+    previous_totals = None
+    for entry in reversed(history):
+        if entry['prefixes'] == season_prefixes and entry['seed'] == args.seed \
+                and entry.get('scoring', DEFAULT_POLICY) == args.scoring \
+                and entry.get('workers', 0) == args.workers \
+                and sorted(entry['results']) == sorted(snapshot_results):
+            previous_totals = entry['totals']
+            break
+    print(f"{len(snapshot_results)} snapshots")
+    print(format_summary(total_timings, previous_totals))
+
+    history.append({'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'label': args.label,
+                    'python': platform.python_version(), 'prefixes': season_prefixes,
+                    'seed': args.seed, 'repeat': args.repeat, 'scoring': args.scoring,
+                    'workers': args.workers,
+                    'totals': total_timings, 'results': snapshot_results})
+    with open(args.history, 'w') as f:
+        json.dump(history, f, indent=4)
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import copy
+import heapq
+import io
 import os
+import pickle
 import random
-from queue import PriorityQueue
-from typing import TYPE_CHECKING, Dict, Tuple, List, FrozenSet, Callable, Set, Any, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Tuple, List, FrozenSet, Callable, Set, Any, Optional, Iterable
 
 from constants import Condition, Effect, InfoScope, Trigger, DamageType, InjuryModifier, \
     SELF_PLACEHOLDER, TARGET_PLACEHOLDER, NONCOMBAT_TRIGGERS, Element, CONDITION_IMMUNITY, Temperament
-from items import get_item, get_item_by_name
+from items import Item, get_item, get_item_by_name, Inventory
+from profiler import get_profiler
+from scoring import ScoreState, ScoringPolicy, STATE_FIELDS, mean_states
 from skill import Skill, get_skill
 
 if TYPE_CHECKING:
+    from game import Game
     from player import Player
 
 DEBUG = False
@@ -25,9 +33,37 @@ ABLATIVE_SKILL_B = get_skill(125)
 
 Event_List = List[Tuple[str, List['Player'], InfoScope]]
 
-# Type for priority queue, takes PRIORITY, INDEX (to ensure total ordering even with equal priorities),
-# and function to call
-Tic = Tuple[float, float, Callable[[], None]]
+# Skill triggers whose targets depend on who is in range
+RANGED_TRIGGERS = frozenset([Trigger.ATTACK, Trigger.ATTACKED, Trigger.RANGE, Trigger.RANGE_IGNORE_SPEED,
+                             Trigger.RANGE_EX_SELF])
+
+# Outcome: Reads whether a simulated player came to it, estimated by CombatHandler.estimate_outcomes
+OUTCOME_FIELDS: Dict[str, Callable[['CombatHandler', 'Player'], int]] = {
+    'dead': lambda _sim, player: STATE_FIELDS['dead'](player),
+    'injured': lambda _sim, player: STATE_FIELDS['injured'](player),
+    'petrified': lambda _sim, player: STATE_FIELDS['petrified'](player),
+    'escaped': lambda sim, player: int(player in sim.full_escape),
+}
+
+
+# A scheduled step of combat, run by its CombatGroup in order of PRIORITY, then INDEX (to ensure total ordering
+# even with equal priorities)
+# Kind names the step, player and targets are who it concerns, args holds anything else the step needs
+class Tic:
+    __slots__ = ('priority', 'index', 'kind', 'player', 'skill', 'targets', 'args')
+
+    def __init__(self, priority: float, index: int, kind: str, player: 'Player',
+                 skill: Optional[Skill] = None, targets: Optional[List['Player']] = None, args: Tuple = ()):
+        self.priority = priority
+        self.index = index
+        self.kind = kind
+        self.player = player
+        self.skill = skill
+        self.targets = targets
+        self.args = args
+
+    def __lt__(self, other: 'Tic') -> bool:
+        return (self.priority, self.index) < (other.priority, other.index)
 
 
 class CombatHandler:
@@ -46,10 +82,16 @@ class CombatHandler:
         self.report_dict = {}
         self.attacker_to_defenders: Dict["Player", Set["Player"]] = {}
         self.combat_group_to_events = {}
+        # (Player, Observer has intuition): (Range version, Report), built by spies after combat
+        self.observer_reports: Dict[Tuple['Player', bool], Tuple[int, str]] = {}
         # Used if 'attacked' isn't appropriate
         self.verb_dict: Dict['Player', str] = {}
         # One directional edges used to calculate range
         self.range_edges: List[Tuple['Player', 'Player']] = []
+        # Set once combat is over, after which range is only read, e.g. by reports
+        self.range_frozen = False
+        # Player: Everyone they can reach through range edges after combat, ignoring escape
+        self.in_sight: Dict['Player', FrozenSet['Player']] = {}
 
         # First populated when attempting to ambush, then pruned
         self.ambushes: Dict['Player', Set['Player']] = {}
@@ -69,104 +111,130 @@ class CombatHandler:
         self.full_escape: Set['Player'] = set()
         self.no_escape: Set['Player'] = set()
         self.contingency_locked: Set['Player'] = set()
+        # Bumped whenever an escape or range edge could change who is in range of whom
+        self.range_version = 0
 
         self.wide_check = False
         self.is_real = False
+        # Combat groups are resolved in this many worker processes when above 1, kept across resets
+        self.workers = 0
+        # Every combat group records a trace when set, kept across resets
+        # Doesn't change the random stream, sequential groups draw from the game's generator as usual
+        self.record_trace = False
+        # Group: Trace, see CombatGroup
+        self.combat_group_to_trace: Dict[FrozenSet['Player'], Dict] = {}
+        # The game and its attacks before combat, pickled when recording traces, for replaying them
+        self.trace_snapshot: Optional[bytes] = None
+        # Group key: Seed, used instead of newly drawn seeds when replaying traces of parallel combat
+        self.replay_seeds: Dict[str, int] = {}
+        # Group keys in the order they were traced, groups are resolved in this order when replaying traces
+        self.replay_order: List[str] = []
 
     def add_info_once(self, players: List['Player'], text: str):
-        player_name_key = ", ".join(sorted([p.name for p in players]))
+        player_name_key = group_key(players)
         if player_name_key not in self.info_once:
             self.info_once[player_name_key] = set()
         self.info_once[player_name_key].add(text)
+
     def get_info_once(self, players: List['Player']) -> Set:
-        player_name_key = ", ".join(sorted([p.name for p in players]))
+        player_name_key = group_key(players)
         return self.info_once.get(player_name_key, set())
 
-    def simulate_combat(self, circuit_change: Dict['Player', Tuple[Element, ...]]) -> Dict['Player', int]:
-        sim = CombatHandler(self.for_speed)
-        player_to_clone: Dict["Player", "Player"] = {}
-
-        clone_game = None
-
-        def make_and_modify_clone(player: 'Player'):
-            assert clone_game
-            clone = player.make_copy_for_simulation(clone_game)
-            if player in circuit_change:
-                assert clone.set_attunement(circuit_change[player]), \
-                    f"Somehow an illegal circuit configuration is being tested for {player.name} " \
-                    f"({circuit_change[player]})"
-            player_to_clone[player] = clone
-
-        for attacker, defender_set in self.attacker_to_defenders.items():
-            for defender in defender_set:
-                if clone_game is None:
-                    clone_game = attacker.game.clone()
-                if attacker not in player_to_clone:
-                    make_and_modify_clone(attacker)
-                if defender not in player_to_clone:
-                    make_and_modify_clone(defender)
-                sim.add_attack(
-                    player_to_clone[attacker], player_to_clone[defender])
-
-        for self_attacker in self.solitary_combat:
-            if clone_game is None:
-                clone_game = self_attacker.game.clone()
-            if self_attacker not in player_to_clone:
-                make_and_modify_clone(self_attacker)
-            sim.add_solitary_combat(player_to_clone[self_attacker])
+    def simulate_combat(self, circuit_change: Dict['Player', Tuple[Element, ...]],
+                        policy: ScoringPolicy) -> Dict['Player', int]:
+        return policy.score_outcomes([self.simulate_combat_states(circuit_change, policy)])[0]
 
+    # State of every player involved after simulating combat, limited to the fields the policy reads,
+    # for scoring many simulations in a batch
+    def simulate_combat_states(self, circuit_change: Dict['Player', Tuple[Element, ...]],
+                               policy: ScoringPolicy) -> Dict['Player', ScoreState]:
+        sim_start = time.perf_counter()
+        sim, player_to_clone = self.make_sim(self.for_speed, circuit_change)
         sim.process_all_combat()
-        return {player: clone.get_score() for player, clone in player_to_clone.items()}
+        states = {player: policy.get_state(clone) for player, clone in player_to_clone.items()}
+        profiler = get_profiler()
+        if profiler:
+            profiler.record('simulation', 'simulate_combat', sim_start, time.perf_counter() - sim_start)
+        return states
+
+    # Odds of each outcome in OUTCOME_FIELDS for every player involved, over SAMPLES simulations of this combat
+    # Every simulation copies the same cloned snapshot and draws its own random seed from SEED,
+    # so the same seed always gives the same odds
+    def estimate_outcomes(self, samples: int, seed: int = 0,
+                          circuit_change: Optional[Dict['Player', Tuple[Element, ...]]] = None) \
+            -> Dict['Player', Dict[str, float]]:
+        assert samples > 0, "Need at least one sample to estimate outcomes."
+        involved = list(self.attacker_to_defenders) + list(self.solitary_combat)
+        rng_state = involved[0].game.rng.getstate() if involved else None
+        sim_start = time.perf_counter()
+        snapshot, player_to_clone = self.make_sim(self.for_speed, circuit_change or {})
+        if involved:
+            # Cloning the game draws from its generator, which asking for odds shouldn't disturb
+            involved[0].game.rng.setstate(rng_state)
+        players = list(player_to_clone)
+        snapshot_clones = [player_to_clone[player] for player in players]
+        rng = random.Random(seed)
+
+        # One row per sample and player
+        rows: List[Tuple[int, ...]] = []
+        for _ in range(samples):
+            sim, clones = copy.deepcopy((snapshot, snapshot_clones))
+            if clones:
+                clones[0].game.rng.seed(rng.getrandbits(32))
+            sim.process_all_combat()
+            for clone in clones:
+                rows.append(tuple(getter(sim, clone) for getter in OUTCOME_FIELDS.values()))
+
+        odds = mean_states(rows, len(players))
+        profiler = get_profiler()
+        if profiler:
+            profiler.record('simulation', 'estimate_outcomes', sim_start, time.perf_counter() - sim_start)
+        return {player: dict(zip(OUTCOME_FIELDS, player_odds)) for player, player_odds in zip(players, odds)}
 
     def speed_sim(self) -> Set[Tuple['Player', 'Player']]:
-        sim = CombatHandler(True)
-        player_to_clone: Dict["Player", "Player"] = {}
-        clone_to_player: Dict["Player", "Player"] = {}
-
-        clone_game = None
-
-        def make_and_modify_clone(_player: 'Player'):
-            assert clone_game
-            clone = _player.make_copy_for_simulation(clone_game)
-            player_to_clone[_player] = clone
-            clone_to_player[clone] = _player
-
-        for attacker, defender_set in self.attacker_to_defenders.items():
-            for defender in defender_set:
-                if clone_game is None:
-                    clone_game = attacker.game.clone()
-                if attacker not in player_to_clone:
-                    make_and_modify_clone(attacker)
-                if defender not in player_to_clone:
-                    make_and_modify_clone(defender)
-                sim.add_attack(
-                    player_to_clone[attacker], player_to_clone[defender])
-
-        for self_attacker in self.solitary_combat:
-            if clone_game is None:
-                clone_game = self_attacker.game.clone()
-            if self_attacker not in player_to_clone:
-                make_and_modify_clone(self_attacker)
-            sim.add_solitary_combat(player_to_clone[self_attacker])
-
+        sim_start = time.perf_counter()
+        sim, player_to_clone = self.make_sim(True)
+        clone_to_player = {clone: player for player, clone in player_to_clone.items()}
         sim.process_all_combat()
         escape = set()
         for player, escaped in sim.escape:
             escape.add((clone_to_player[player], clone_to_player[escaped]))
+        profiler = get_profiler()
+        if profiler:
+            profiler.record('simulation', 'speed_sim', sim_start, time.perf_counter() - sim_start)
         return escape
 
     def drain_sim(self) -> Set['Player']:
-        sim = CombatHandler()
+        sim_start = time.perf_counter()
+        sim, player_to_clone = self.make_sim(False)
+        clone_to_player = {clone: player for player, clone in player_to_clone.items()}
+        sim.process_all_combat()
+        locked = set()
+        for locked_clone in sim.contingency_locked:
+            locked.add(clone_to_player[locked_clone])
+        profiler = get_profiler()
+        if profiler:
+            profiler.record('simulation', 'drain_sim', sim_start, time.perf_counter() - sim_start)
+        return locked
+
+    # A handler with the same attacks as this one between clones of the players, in a clone of their game
+    # Returns the handler and Player: Clone
+    def make_sim(self, for_speed: bool, circuit_change: Optional[Dict['Player', Tuple[Element, ...]]] = None) \
+            -> Tuple['CombatHandler', Dict['Player', 'Player']]:
+        sim = CombatHandler(for_speed)
         player_to_clone: Dict["Player", "Player"] = {}
-        clone_to_player: Dict["Player", "Player"] = {}
+        circuit_change = circuit_change or {}
 
         clone_game = None
 
-        def make_and_modify_clone(_player: 'Player'):
+        def make_and_modify_clone(player: 'Player'):
             assert clone_game
-            clone = _player.make_copy_for_simulation(clone_game)
-            player_to_clone[_player] = clone
-            clone_to_player[clone] = _player
+            clone = player.make_copy_for_simulation(clone_game)
+            if player in circuit_change:
+                assert clone.set_attunement(circuit_change[player]), \
+                    f"Somehow an illegal circuit configuration is being tested for {player.name} " \
+                    f"({circuit_change[player]})"
+            player_to_clone[player] = clone
 
         for attacker, defender_set in self.attacker_to_defenders.items():
             for defender in defender_set:
@@ -186,11 +254,7 @@ class CombatHandler:
                 make_and_modify_clone(self_attacker)
             sim.add_solitary_combat(player_to_clone[self_attacker])
 
-        sim.process_all_combat()
-        locked = set()
-        for locked_clone in sim.contingency_locked:
-            locked.add(clone_to_player[locked_clone])
-        return locked
+        return sim, player_to_clone
 
     def add_attack(self, attacker: "Player", defender: "Player"):
         if attacker not in self.attacker_to_defenders:
@@ -225,6 +289,12 @@ class CombatHandler:
                 self.verb_dict[player] = new_verbs
 
     def process_all_combat(self):
+        combat_start = time.perf_counter()
+        if self.record_trace:
+            involved = list(self.attacker_to_defenders) + list(self.solitary_combat)
+            if involved:
+                self.trace_snapshot = pickle.dumps((involved[0].game, self.attacker_to_defenders,
+                                                    self.solitary_combat))
         # Calculate Combat Groups
         combat_groups = []
         for (attacker, defender_set) in self.attacker_to_defenders.items():
@@ -263,955 +333,110 @@ class CombatHandler:
                 if (defender, attacker) not in simplified_attack_to_defend:
                     simplified_attack_to_defend.add((attacker, defender))
 
-        for _group in combat_groups:
-            # For generating reports
-            group: FrozenSet[Player] = frozenset(_group)
-            self.combat_group_to_events[group] = []
-
-            combat = {}
-            survivability = {}
-            conditions: Dict['Player', List[Condition]] = {
-                p: [] for p in group}
-
-            queue: PriorityQueue[Tic] = PriorityQueue()
-
-            # Prevent certain things from happening redundantly, like armor break
-            only_once: Set[Any] = set()
-            # Special Disarm Theft logic
-            # Victim: Thieves
-            disarm_thief: Dict[Player, List[Player]] = {p: [] for p in group}
-
-            # For looting
-            dead_list = []
-
-            def get_damage_type(a: 'Player', initial_damage_type: DamageType = DamageType.DEFAULT) -> DamageType:
-                if Condition.PETRIFY in conditions[a]:
-                    return DamageType.PETRIFY
-                return initial_damage_type
-
-            def get_injury_modifiers(a: 'Player') -> List[InjuryModifier]:
-                modifiers = []
-                if Condition.INFLICT_GRIEVOUS in conditions[a]:
-                    modifiers.append(InjuryModifier.GRIEVOUS)
-                if Condition.INFLICT_CAUTERIZE in conditions[a]:
-                    modifiers.append(InjuryModifier.PERMANENT)
-                return modifiers
-
-            def get_speed(a: "Player"):
-                speed = self.speed.get(a, 0)
-                if Condition.AMBUSHED in conditions.get(a, []):
-                    speed -= 1
-                if Condition.SNIPED in conditions.get(a, []):
-                    speed -= 2
-                speed += conditions[a].count(Condition.INCREASED_SPEED)
-                if Condition.TARGET_LOCKED in conditions.get(a, []):
-                    speed = 0
-                return max(speed, 0)
-
-            # Generate a tic to remove a condition from a player
-            def condition_remove_tic(priority: int, p: Player, c: Condition) -> Tic:
-                self.tic_index += 1
-
-                def condition_remove():
-                    if c in conditions[p]:
-                        conditions[p].remove(c)
-                    if c in p.conditions:
-                        p.conditions.remove(c)
-
-                return priority + 1, self.tic_index, condition_remove
-
-            # Generate a tic to remove an item from a player's inventory
-            def item_remove_tic(priority: int, p: Player, item_index: int) -> Tic:
-                self.tic_index += 1
-
-                def item_remove():
-                    if item_index in p.items:
-                        p.items.remove(item_index)
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{p.name}'s {get_item(item_index).name} was "
-                                                   f"{get_item(item_index).destruction_message}.",
-                                                   [p], InfoScope.PRIVATE)
-
-                return priority + 1, self.tic_index, item_remove
-
-            # We need priority to tic before checking, otherwise defending snipers wouldn't be able to counter-snipe
-            def sniper_tic(priority: float, p: Player) -> Tic:
-                self.tic_index += 1
-
-                def snipe():
-                    # Attacking the sniper or having sniper yourself lets you hit back against a sniper
-                    for target in self.attacker_to_defenders.get(p, []):
-                        if Condition.SNIPING not in conditions[target]:
-                            if p not in self.attacker_to_defenders.get(target, []):
-                                if (target, p) in self.range_edges:
-                                    self.range_edges.remove((target, p))
-
-                return priority + 1, self.tic_index, snipe
-
-            def ambush_tic(ambusher: 'Player', ambushee: 'Player', verb: str) -> Tic:
-                self.tic_index += 1
-
-                def confirm_ambush():
-                    if ambushee not in self.ambushes.get(ambusher, set()):
-                        return
-
-                    failed_ambush = False
-                    if Condition.AMBUSH_IMMUNE in conditions.get(ambushee):
-                        failed_ambush = True
-
-                    if Condition.AMBUSH_AWARE in conditions[ambushee]:
-                        if ambushee.get_awareness() > ambusher.get_awareness():
-                            failed_ambush = True
-
-                    if failed_ambush:
-                        self.ambushes[ambusher].discard(ambushee)
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{ambusher.name} failed to ambush {ambushee.name}.",
-                                                   [ambusher, ambushee], InfoScope.PUBLIC)
-                        return
-
-                    # Ambushes cancel each other out
-                    if ambusher in self.ambushes.get(ambushee, set()):
-                        self.ambushes[ambushee].discard(ambusher)
-                        self.ambushes[ambusher].discard(ambushee)
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{ambusher.name} and {ambushee.name} failed to "
-                                                   f"ambush each other.",
-                                                   [ambusher, ambushee], InfoScope.PUBLIC)
-                        return
-                    if 'counter' not in verb:
-                        self.update_verb_dict(ambusher, verb)
-                    conditions[ambushee].append(Condition.AMBUSHED)
-
-                return 6, self.tic_index, confirm_ambush
-
-            def speed_ambush_tic(ambusher: 'Player', ambushee: 'Player') -> Tic:
-                self.tic_index += 1
-
-                def confirm_ambush():
-                    if ambushee in self.ambushes.get(ambusher, set()):
-                        return  # Already handled
-
-                    if ambusher in self.ambushes.get(ambushee, set()):
-                        return  # Can't speed ambush ambushers
-
-                    if get_speed(ambusher) - get_speed(ambushee) < 2:
-                        return  # Not fast enough
-
-                    if Condition.AMBUSH_AWARE in conditions[ambushee]:
-                        if ambushee.get_awareness() > ambusher.get_awareness():
-                            return
-
-                    self.update_verb_dict(ambusher, "blitzed")
-                    if ambusher not in self.ambushes:
-                        self.ambushes[ambusher] = set()
-                    self.ambushes[ambusher].add(ambushee)
-                    conditions[ambushee].append(Condition.AMBUSHED)
-
-                return 25, self.tic_index, confirm_ambush
-
-            def drain_tic(drainer: 'Player', will_bag: 'Player') -> Tic:
-                self.tic_index += 1
-
-                if will_bag not in self.drained_by:
-                    self.drained_by[will_bag] = set()
-                self.drained_by[will_bag].add(drainer)
-                self.drainers.add(drainer)
-
-                def drain():
-                    if will_bag in self.drained:
-                        return  # Already handled
-
-                    if will_bag.willpower > 0:
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"You lost {will_bag.willpower} Willpower.",
-                                                   [will_bag], InfoScope.PRIVATE)
-                        if will_bag in self.drainers or len(self.drained_by[will_bag]) > 1:
-                            self._append_to_event_list(self.combat_group_to_events[group],
-                                                       f"{will_bag.name}'s {will_bag.willpower} Willpower "
-                                                       f"was lost in the confusion.",
-                                                       list(self.drained_by[will_bag]), InfoScope.PRIVATE)
-                        elif len(self.drained_by[will_bag]) == 1:
-                            assert drainer in self.drained_by[will_bag]
-                            if drainer in self.drained_by:
-                                self._append_to_event_list(self.combat_group_to_events[group],
-                                                           f"{will_bag.name}'s {will_bag.willpower} Willpower "
-                                                           f"was lost in the confusion.",
-                                                           list(self.drained_by[will_bag]), InfoScope.PRIVATE)
-                            else:
-                                drainer.willpower += will_bag.willpower
-                                drainer.willpower = min(
-                                    drainer.willpower, drainer.max_willpower)
-                                self._append_to_event_list(self.combat_group_to_events[group],
-                                                           f"You stole {will_bag.willpower} Willpower. "
-                                                           f"({drainer.willpower}/{drainer.max_willpower})",
-                                                           [drainer], InfoScope.PRIVATE)
-                        will_bag.willpower = 0
-                    self.drained.add(will_bag)
-
-                return 25, self.tic_index, drain
-
-            def skill_tic(p: Player, skill: 'Skill', _targets: Optional[List[Player]] = None) -> Tic:
-                self.tic_index += 1
-
-                def handle_skill():
-                    if skill.trigger == Trigger.NONCOMBAT:
-                        return
-
-                    if skill.fragile and skill.fragile in conditions[p]:
-                        return
-                    if skill.self_has_condition and skill.self_has_condition not in conditions[p]:
-                        return
-                    if skill.self_not_condition and skill.self_not_condition in conditions[p]:
-                        return
-                    if Condition.PETRIFIED in conditions[p] and not skill.works_when_petrified:
-                        return
-
-                    targets: List['Player'] = []
-                    if _targets is not None:
-                        targets = _targets
-                    else:
-                        if skill.trigger == Trigger.SELF:
-                            targets = [p]
-                        elif skill.trigger == Trigger.ATTACK:
-                            if p in self.attacker_to_defenders:
-                                targets = [target for target in self.attacker_to_defenders[p]
-                                           if self.check_range(p, target) or skill.effect == Effect.AMBUSH]
-                        elif skill.trigger == Trigger.ATTACKED:
-                            for a, d_set in self.attacker_to_defenders.items():
-                                for d in d_set:
-                                    if d == p:
-                                        if a not in targets and self.check_range(d, a):
-                                            targets.append(a)
-                        elif skill.trigger == Trigger.ATTACKED_IGNORE_RANGE:
-                            for a, d_set in self.attacker_to_defenders.items():
-                                for d in d_set:
-                                    if d == p:
-                                        if a not in targets:
-                                            targets.append(a)
-                        elif skill.trigger == Trigger.ENEMY:  # EXPLICITLY IGNORES RANGE
-                            if p in self.attacker_to_defenders:
-                                for x in self.attacker_to_defenders[p]:
-                                    if x not in targets:
-                                        targets.append(x)
-                            for o in self.attacker_to_defenders:
-                                if p in self.attacker_to_defenders[o]:
-                                    if o not in targets:
-                                        targets.append(o)
-                        elif skill.trigger == Trigger.RANGE:
-                            targets = [
-                                o for o in group if self.check_range(p, o)]
-                        elif skill.trigger == Trigger.RANGE_IGNORE_SPEED:
-                            targets = [o for o in group if self.check_range(
-                                p, o, ignore_escape=True)]
-                        elif skill.trigger == Trigger.RANGE_EX_SELF:
-                            targets = [o for o in group if self.check_range(
-                                p, o) and o.name != p.name]
-                        elif skill.trigger == Trigger.COMBAT_INJURY:
-                            targets = [p]
-
-                        if skill.trigger != Trigger.SELF:
-                            if skill.target_has_condition:
-                                targets = [target for target in targets
-                                           if skill.target_has_condition in conditions[target]]
-                            if skill.target_not_condition:
-                                targets = [target for target in targets if
-                                           skill.target_not_condition not in conditions[target]]
-
-                    if not targets:
-                        return
-
-                    targets = [
-                        target for target in targets if not target.is_dead()]
-
-                    if skill.effect == Effect.INTUITION:
-                        # Ensure there is no way to tell WHICH player is which Aeromancer
-                        random.shuffle(targets)
-
-                    times = 1  # For repeated CONDITION type effects
-                    if skill.value_b and isinstance(skill.value_b, int):
-                        times = skill.value_b
-
-                    for original_target in targets:
-                        if skill.effect in [Effect.INFO, Effect.INFO_ONCE]:
-                            continue
-
-                        target = original_target
-                        if skill.self_override:
-                            target = p  # Effect based on target conditions, but impacts only self
-
-                        if skill.effect == Effect.COMBAT:
-                            # If combat value is set to -1, then it can't be changed
-                            if combat[target] >= 0:
-                                combat[target] += skill.value
-                                # Combat can't be lowered below zero by regular means
-                                if combat[target] < 0:
-                                    combat[target] = 0
-                        elif skill.effect == Effect.NO_COMBAT:
-                            combat[target] = -1
-                        elif skill.effect == Effect.SURVIVABILITY:
-                            # If combat value is set to -1, then it can't be changed
-                            if survivability[target] >= 0:
-                                survivability[target] += skill.value
-                                # Combat can't be lowered below zero by regular means
-                                if survivability[target] < 0:
-                                    survivability[target] = 0
-                        elif skill.effect == Effect.NO_SURVIVABILITY:
-                            survivability[target] = -1
-                        elif skill.effect == Effect.IMBALANCE:
-                            for _ in range(skill.value):
-                                if combat[target] >= survivability[target]:
-                                    combat[target] += 1
-                                else:
-                                    survivability[target] += 1
-                        elif skill.effect == Effect.BALANCE:
-                            for _ in range(skill.value):
-                                if combat[target] < survivability[target]:
-                                    combat[target] += 1
-                                else:
-                                    survivability[target] += 1
-                        elif skill.effect in [Effect.CONDITION, Effect.TENTATIVE_CONDITION, Effect.TURN_CONDITION]:
-                            condition = Condition[skill.value]
-                            if condition not in CONDITION_IMMUNITY \
-                                    or not CONDITION_IMMUNITY[condition] in conditions[target]:
-                                if skill.value_b is None:
-                                    if condition not in conditions[target]:
-                                        conditions[target].append(condition)
-                                        if skill.effect == Effect.TURN_CONDITION:
-                                            target.turn_conditions.append(condition)
-                                else:
-                                    for _ in range(times):
-                                        conditions[target].append(condition)
-                                        if skill.effect == Effect.TURN_CONDITION:
-                                            target.turn_conditions.append(condition)
-                        elif skill.effect == Effect.REMOVE_CONDITION:
-                            for _ in range(times):
-                                queue.put(condition_remove_tic(
-                                    skill.priority, target, Condition[skill.value]))
-                        elif skill.effect == Effect.REL_CONDITION:
-                            condition = Condition[skill.value]
-                            for _ in range(times):
-                                p.add_relative_condition(target, condition)
-                        elif skill.effect == Effect.PERMANENT_CONDITION:
-                            condition = Condition[skill.value]
-                            if condition not in CONDITION_IMMUNITY \
-                                    or not CONDITION_IMMUNITY[condition] in conditions[target]:
-                                for _ in range(times):
-                                    conditions[target].append(condition)
-                                    target.conditions.append(condition)
-                        elif skill.effect == Effect.DISARM:
-                            queue.put(condition_remove_tic(
-                                skill.priority, target, Condition.ARMED))
-                            if target.get_held_weapon():
-                                disarm_thief[target].append(p)
-                        elif skill.effect == Effect.ARMOR_BREAK:
-                            queue.put(condition_remove_tic(
-                                skill.priority, target, Condition.ARMORED))
-                            # Don't want to destroy redundant copies
-                            tag = ("Armor Break", target.name,
-                                   target.get_worn_armor().pin)
-                            if tag not in only_once:
-                                only_once.add(tag)
-                                queue.put(item_remove_tic(
-                                    skill.priority, target, target.get_worn_armor().pin))
-                        elif skill.effect == Effect.WEAPON:
-                            combat[target] += skill.value
-                            # Only one weapon can apply its bonus
-                            conditions[target].append(Condition.ARMED_SET)
-                        elif skill.effect == Effect.ARMOR:
-                            survivability[target] += skill.value
-                            # Only one weapon can apply its bonus
-                            conditions[target].append(Condition.ARMOR_SET)
-                        elif skill.effect == Effect.SNIPING:
-                            self.update_verb_dict(target, skill.text)
-                            # Modify description of action in place to make the report read cleaner
-                            conditions[target].append(Condition.SNIPING)
-                            for sniped in self.attacker_to_defenders.get(target, []):
-                                conditions[sniped].append(Condition.SNIPED)
-                            queue.put(sniper_tic(skill.priority + 0.1, target))
-                        elif skill.effect == Effect.DAMAGE:
-                            queue.put(damage_tic(skill.priority + 1, source=p, target=target,
-                                                 dmg_type=get_damage_type(p),
-                                                 injury_modifiers=get_injury_modifiers(
-                                                     p),
-                                                 target_not_condition=skill.target_not_condition))
-                        elif skill.effect == Effect.GRIEVOUS:
-                            queue.put(damage_tic(skill.priority + 1, source=p, target=target,
-                                                 dmg_type=get_damage_type(p),
-                                                 injury_modifiers=get_injury_modifiers(
-                                                     p) + [InjuryModifier.GRIEVOUS],
-                                                 target_not_condition=skill.target_not_condition))
-                        elif skill.effect == Effect.NONLETHAL:
-                            queue.put(damage_tic(skill.priority + 1, source=p, target=target,
-                                                 dmg_type=get_damage_type(
-                                                     p, DamageType.NONLETHAL),
-                                                 injury_modifiers=get_injury_modifiers(
-                                                     p),
-                                                 target_not_condition=skill.target_not_condition))
-                        elif skill.effect == Effect.PETRIFY:
-                            queue.put(damage_tic(skill.priority + 1, source=p, target=target,
-                                                 dmg_type=get_damage_type(
-                                                     p, DamageType.PETRIFY),
-                                                 injury_modifiers=get_injury_modifiers(
-                                                     p),
-                                                 target_not_condition=skill.target_not_condition))
-                        elif skill.effect == Effect.MINI_PETRIFY:
-                            queue.put(damage_tic(skill.priority + 1, source=p, target=target,
-                                                 dmg_type=get_damage_type(
-                                                     p, DamageType.PETRIFY),
-                                                 injury_modifiers=get_injury_modifiers(
-                                                     p) + [InjuryModifier.MINI],
-                                                 target_not_condition=skill.target_not_condition))
-                        elif skill.effect == Effect.KILL:
-                            queue.put(kill_tic(skill.priority + 1, target))
-                        elif skill.effect == Effect.AMBUSH:
-                            if p not in self.ambushes:
-                                self.ambushes[p] = set()
-                            self.ambushes[p].add(target)
-                            queue.put(ambush_tic(p, target, skill.text))
-                        elif skill.effect == Effect.SPEED:
-                            if target not in self.speed:
-                                self.speed[target] = 0
-                            self.speed[target] += skill.value
-                            if self.speed[target] < 0:
-                                self.speed[target] = 0
-                            if self.speed[target] >= 2:
-                                for v in self.attacker_to_defenders.get(target, []):
-                                    queue.put(speed_ambush_tic(target, v))
-                        elif skill.effect == Effect.DRAIN:
-                            queue.put(drain_tic(p, target))
-                        elif skill.effect == Effect.INTUITION:
-                            if target.concept:
-                                self._append_to_event_list(self.combat_group_to_events[group],
-                                                           skill.text.replace(
-                                                               SELF_PLACEHOLDER, p.name)
-                                                           .replace(TARGET_PLACEHOLDER, target.name)
-                                                           .replace("%REPLACE_WITH_CONCEPT%", target.concept),
-                                                           [p],
-                                                           InfoScope.PERSONAL)
-                        elif skill.effect == Effect.CONSUME:
-                            for _ in range(times):
-                                if Condition[skill.value] in conditions[target]:
-                                    conditions[target].remove(
-                                        Condition[skill.value])
-                                    for condition in skill.condition_list:
-                                        conditions[target].append(condition)
-                        elif skill.effect == Effect.TEMP_SKILL:
-                            from skill import get_skill
-                            temp_skill = get_skill(skill.value)
-                            if temp_skill.trigger != Trigger.POST_COMBAT:
-                                raise Exception(
-                                    f"Trying to apply a temp skill that won't activate! {skill.value}")
-                            temp_skill.player_of_origin = p
-                            target.temporary_skills.append(temp_skill)
-                        elif skill.effect == Effect.DUST:
-                            target.destroy_consumables_and_reactives()
-
-                        else:
-                            raise Exception(
-                                f"Unhandled effect type in combat! {skill.effect.name}")
-
-                    if skill.info != InfoScope.HIDDEN:
-                        for target in targets:
-
-                            msg = skill.text.replace(SELF_PLACEHOLDER, p.name).replace(
-                                TARGET_PLACEHOLDER, target.name)
-                            if skill.effect != Effect.INFO_ONCE or msg not in self.get_info_once(group):
-                                message_origin = p
-                                if skill.player_of_origin:
-                                    message_origin = skill.player_of_origin
-                                msg_grp = [p, target]
-                                if skill.info == InfoScope.PERSONAL:
-                                    msg_grp = [p]
-                                elif skill.info in [InfoScope.IMPERSONAL, InfoScope.NARROW_IMPERSONAL, InfoScope.SUBTLE_IMPERSONAL]:
-                                    msg_grp = [target]
-                                self._append_to_event_list(self.combat_group_to_events[group], msg,
-                                                           msg_grp,
-                                                           skill.info, message_origin)
-                            if skill.effect == Effect.INFO_ONCE:
-                                self.add_info_once(group, msg)
-
-                return skill.priority, self.tic_index, handle_skill
-
-            def petrify_tic(base_priority: int, p: Player, long=False, mini=False) -> Tic:
-                self.tic_index += 1
-
-                def petrify():
-                    def reporting_function(message: str, info_scope: InfoScope):
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   message, [p], info_scope, p)
-
-                    p.petrify(reporting_function, mini=mini, long=long)
-                    if Condition.PETRIFIED in p.conditions:
-                        conditions[p].append(Condition.GAS_IMMUNE)
-                        conditions[p].append(Condition.PETRIFIED)
-
-                return base_priority, self.tic_index, petrify
-
-            def kill_tic(base_priority: int, p: Player) -> Tic:
-                self.tic_index += 1
-
-                def kill():
-                    was_alive = not p.is_dead()
-
-                    def reporting_function(message: str, info_scope: InfoScope):
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   message, [p], info_scope, p)
-
-                    p.kill(reporting_function)
-
-                    if was_alive and p.is_dead():
-                        dead_list.append(p)
-
-                return base_priority, self.tic_index, kill
-
-            def wound_tic(base_priority: int, p: Player, injury_modifiers: List[InjuryModifier]) -> Tic:
-                self.tic_index += 1
-
-                def wound():
-                    if Condition.COMBAT_REGEN in conditions[p]:
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   "You regenerated, ignoring the wound.", [p], InfoScope.PRIVATE)
-                        return
-
-                    was_alive = not p.is_dead()
-
-                    _injury_modifiers = injury_modifiers
-
-                    if Condition.GRIEVOUS_IMMUNE in conditions[p] and InjuryModifier.GRIEVOUS in _injury_modifiers:
-                        if InjuryModifier.PERMANENT not in _injury_modifiers:
-                            _injury_modifiers = [modifier for modifier in injury_modifiers
-                                                 if modifier != InjuryModifier.GRIEVOUS]
-
-                    def reporting_function(message: str, info_scope: InfoScope):
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   message, [p], info_scope, p)
-
-                    wounded = p.wound(_injury_modifiers, reporting_function)
-                    if wounded and not p.is_dead():
-                        for injured_skill in p.get_skills():
-                            if injured_skill.trigger == Trigger.COMBAT_INJURY:
-                                queue.put(skill_tic(p, injured_skill))
-
-                    if was_alive and p.is_dead():
-                        dead_list.append(p)
-
-                return base_priority, self.tic_index, wound
-
-            def damage_tic(base_priority: int, source: Player, target: Player, dmg_type: DamageType,
-                           injury_modifiers: List[InjuryModifier],
-                           target_not_condition: Optional[Condition] = None) -> Tic:
-                self.tic_index += 1
-
-                # Damage is marked here for other logic, in the tic constructor, not the tic
-                # If something can create a damage_tic without damaging, something has gone wrong
-                # Yes this means someone petrified by poison gas and hit by normal poison gas is damaged by both
-                # But that generally doesn't matter
-                # Try to avoid target_not_condition whenever possible
-                if target not in self.damaged_by:
-                    self.damaged_by[target] = set()
-                self.damaged_by[target].add(source)
-
-                priority = base_priority
-                if dmg_type == DamageType.PETRIFY:
-                    priority += 5
-                if dmg_type == DamageType.NONLETHAL:
-                    priority += 10
-
-                # Permanent Grievous -> Permanent -> Grievous -> Regular Injury
-                priority += 3
-                for modifier in injury_modifiers:
-                    priority -= int(modifier)
-
-                def wound():
-                    if not target_not_condition or target_not_condition not in conditions[target]:
-                        if InjuryModifier.NONLETHAL in injury_modifiers:
-                            if Condition.NONLETHAL_IMMUNE in conditions[target]:
-                                return
-                        queue.put(
-                            wound_tic(priority + 1, target, injury_modifiers))
-                        for damaged_skill in target.get_skills():
-                            if damaged_skill.trigger == Trigger.COMBAT_DAMAGED:
-                                queue.put(
-                                    skill_tic(target, damaged_skill, [source]))
-
-                def petrify():
-                    if not target_not_condition or target_not_condition not in conditions[target]:
-                        queue.put(petrify_tic(priority + 1, target, long=Condition.LONG_PETRIFY in conditions[source],
-                                              mini=InjuryModifier.MINI in injury_modifiers))
-                        for damaged_skill in target.get_skills():
-                            if damaged_skill.trigger == Trigger.COMBAT_DAMAGED:
-                                queue.put(
-                                    skill_tic(target, damaged_skill, [source]))
-
-                def nonlethal():
-                    if not target_not_condition or target_not_condition not in conditions[target]:
-                        if Condition.NONLETHAL_IMMUNE in conditions[target]:
-                            return
-                        if Condition.INJURED not in target.conditions:
-                            queue.put(
-                                wound_tic(priority + 1, target, injury_modifiers + [InjuryModifier.NONLETHAL]))
-                            for damaged_skill in target.get_skills():
-                                if damaged_skill.trigger == Trigger.COMBAT_DAMAGED:
-                                    queue.put(
-                                        skill_tic(target, damaged_skill, [source]))
-
-                if dmg_type == DamageType.DEFAULT:
-                    return priority, self.tic_index, wound
-
-                if dmg_type == DamageType.NONLETHAL:
-                    return priority, self.tic_index, nonlethal
-
-                if dmg_type == DamageType.PETRIFY:
-                    return priority, self.tic_index, petrify
-
-            def get_combat(p: 'Player', d: Optional['Player'] = None):
-                if Condition.PETRIFIED in conditions[p]:
-                    return -1
-                c = combat[p]
-                if c < 0:
-                    return c
-
-                if Condition.DEADLY_AMBUSH in conditions[p] and d in self.ambushes.get(p):
-                    c += 2
-
-                if d and Condition.USING_AERO in conditions[d] and Condition.UNNATURAL_INTUITION in conditions[p]:
-                    c += 1
-
-                if d and d.check_relative_condition(p, Condition.SABOTAGED_KNOWLEDGE):
-                    c -= 2
-                elif d and p.check_relative_condition(d, Condition.KNOW):
-                    c += 1
-
-                if c < 0:
-                    c = 0
-                return c
-
-            def get_survivability(p: 'Player', a: Optional['Player'] = None):
-                if Condition.PETRIFIED in conditions[p]:
-                    return 10 - conditions[p].count(Condition.CRUMBLING)
-                s = survivability[p]
-                if s >= 0:
-                    if a and Condition.USING_AERO in conditions[a] and Condition.UNNATURAL_INTUITION in conditions[p]:
-                        s += 1
-
-                    if a and a.check_relative_condition(p, Condition.SABOTAGED_KNOWLEDGE):
-                        s -= 2
-                    elif a and p.check_relative_condition(a, Condition.KNOW):
-                        s += 2
-
-                    if p.is_hotblooded():
-                        s += 1
-
-                    if s < 0:
-                        s = 0
-
-                if Condition.FIRE_BODY in conditions[p]:
-                    if not a or Condition.GEO_LOCKED in conditions[a] or Element.WATER not in a.circuits:
-                        s = max(s, get_combat(p, a))
-
-                return s
-
-            def combat_tic(offense: Player, defense: Player, ambushed_tic=False) -> Tic:
-                self.tic_index += 1
-
-                priority = ATTACK_PRIORITY
-                if ambushed_tic:
-                    priority += 20
-
-                def fight():
-                    # Ambushed players attempt to damage 20 priority later
-                    if not ambushed_tic and offense in self.ambushes.get(defense, set()):
-                        queue.put(combat_tic(offense, defense, True))
-                        return
-
-                    if offense.is_dead() or defense.is_dead():
-                        return
-
-                    if self.check_range(offense, defense):
-                        self.hot_blood.add(offense.name)
-                        self.full_escape.discard(defense)
-                        self.full_escape.discard(offense)
-                        self.no_escape.add(defense)
-                        self.no_escape.add(offense)
-                        if DEBUG:
-                            self._append_to_event_list(self.combat_group_to_events[group],
-                                                       f"{offense.name} ({get_combat(offense, defense)}) attacking "
-                                                       f"{defense.name} ({get_survivability(defense, offense)})",
-                                                       [offense, defense],
-                                                       InfoScope.PRIVATE)
-                        if self._one_on_one(offense, defense, get_combat, get_survivability,
-                                            self.combat_group_to_events[group]):
-                            queue.put(damage_tic(DAMAGE_PRIORITY, source=offense, target=defense,
-                                                 dmg_type=get_damage_type(
-                                                     offense),
-                                                 injury_modifiers=get_injury_modifiers(offense)))
-                            # Damaged by is handled inside the damage_tic CONSTRUCTOR
-                            if defense in disarm_thief[offense]:
-                                # Injured attacker, so not disarm stolen
-                                disarm_thief[offense].remove(defense)
-                            if defense not in self.injured_by:
-                                self.injured_by[defense] = set()
-                            self.injured_by[defense].add(offense)
-                        else:
-                            if offense in disarm_thief[defense]:
-                                # Failed to injure defender, so not disarm stolen
-                                disarm_thief[defense].remove(offense)
-                    else:
-                        if get_speed(defense) - get_speed(offense) >= 2:
-                            if defense not in self.no_escape:
-                                self.full_escape.add(defense)
-                        else:
-                            self.full_escape.discard(defense)
-                            self.no_escape.add(defense)
-
-                return priority, self.tic_index, fight
-
-            def debug_tic(priority: int, p: Player):
-                self.tic_index += 1
-
-                def debug_print():
-                    self._append_to_event_list(self.combat_group_to_events[group],
-                                               f"{p.name} ({get_combat(p)}/{get_survivability(p)}) "
-                                               f"(S{get_speed(p)}) "
-                                               f"{[i.name for i in p.get_items()]}"
-                                               f"{[c.name for c in conditions[p]]}"
-                                               f"{p.relative_condition_debug()}",
-                                               [p])
-
-                return priority, self.tic_index, debug_print
-
-            def escape_message_tic(p: Player, e: Player):
-                self.tic_index += 1
-
-                def escape_message():
-                    self._append_to_event_list(self.combat_group_to_events[group],
-                                               f"{p.name} escaped {e.name}.",
-                                               [p, e], info=InfoScope.PUBLIC)
-
-                return -1, self.tic_index, escape_message
-
-            if not self.for_speed:
-                self.escape = self.speed_sim()
-                for player, escaped in self.escape:
-                    if player in group:
-                        queue.put(escape_message_tic(player, escaped))
-
-            for player in group:
-                combat[player] = 1
-                survivability[player] = 1
-                conditions[player] = player.conditions[:] + player.turn_conditions[:]
-
-                if player.willpower:
-                    conditions[player].append(Condition.HAS_WILLPOWER)
-
-                # Bunker Effect
-                bunker_combat_skill = Skill(-1, text="Bunker Combat +1", effect=Effect.COMBAT, value=1, priority=21,
-                                            info=InfoScope.HIDDEN, trigger=Trigger.SELF,
-                                            self_has_condition=Condition.BUNKERING)
-                bunker_survive_skill = Skill(-1, text="Bunker Survive +2", effect=Effect.SURVIVABILITY,
-                                             value=2, priority=21,
-                                             info=InfoScope.HIDDEN, trigger=Trigger.SELF,
-                                             self_has_condition=Condition.BUNKERING)
-
-                queue.put(skill_tic(player, bunker_combat_skill))
-                queue.put(skill_tic(player, bunker_survive_skill))
-                if not player.distracted:
-                    queue.put(skill_tic(player, bunker_combat_skill))
-                    queue.put(skill_tic(player, bunker_survive_skill))
-
-                combat[player] += conditions[player].count(Condition.HONED)
-                survivability[player] += conditions[player].count(
-                    Condition.FORGED)
-
-                if Condition.COMBAT_DOWN in conditions[player]:
-                    combat_down_skill = Skill(-1, text="Combat -X", effect=Effect.COMBAT,
-                                              value=-1 * conditions[player].count(Condition.COMBAT_DOWN),
-                                              priority=69, info=InfoScope.HIDDEN, trigger=Trigger.SELF)
-                    queue.put(skill_tic(player, combat_down_skill))
-
-                if Condition.SURVIVABILITY_DOWN in conditions[player]:
-                    survivability_down_skill = Skill(-1, text="Survivability -X", effect=Effect.SURVIVABILITY,
-                                                     value=-1 * conditions[player].count(Condition.SURVIVABILITY_DOWN),
-                                                     priority=69, info=InfoScope.HIDDEN, trigger=Trigger.SELF)
-                    queue.put(skill_tic(player, survivability_down_skill))
-
-                if survivability[player] > combat[player]:
-                    survivability[player] += conditions[player].count(
-                        Condition.IMBALANCE)
-                else:
-                    combat[player] += conditions[player].count(
-                        Condition.IMBALANCE)
-                bal = conditions[player].count(Condition.BALANCE)
-                while bal:
-                    bal -= 1
-                    if combat[player] < survivability[player]:
-                        combat[player] += 1
-                    else:
-                        survivability[player] += 1
-                if Condition.PETRIFIED in conditions[player]:
-                    conditions[player].append(Condition.GAS_IMMUNE)
-
-                if player.circuits:
-                    conditions[player].append(Condition.USING_GEO)
-
-                if player.hydro_spells:
-                    conditions[player].append(Condition.USING_HYDRO)
-
-                if player.concept:
-                    conditions[player].append(Condition.USING_AERO)
-
-                if ABLATIVE in player.items:
-                    if player in [_d for _def in self.attacker_to_defenders.values() for _d in _def]:
-                        queue.put(skill_tic(player, ABLATIVE_SKILL_A))
-                        queue.put(skill_tic(player, ABLATIVE_SKILL_B))
-                        player.lose_item(get_item(ABLATIVE))
-
-                for _skill in player.get_skills():
-                    # Apply effects from skills to players in order of skill priority
-                    if not player.has_condition(Condition.PETRIFIED) or _skill.works_when_petrified:
-                        if _skill.trigger not in NONCOMBAT_TRIGGERS:
-                            queue.put(skill_tic(player, _skill))
-                        elif _skill.effect == Effect.TENTATIVE_CONDITION:
-                            modified_skill = _skill.copy()
-                            modified_skill.effect = Effect.CONDITION
-                            modified_skill.trigger = Trigger.SELF
-                            queue.put(skill_tic(player, modified_skill))
-
-            if DEBUG:
-                for player in group:
-                    queue.put(debug_tic(99, player))
-
-            for (attacker, defender) in simplified_attack_to_defend:
-                if attacker in group:
-                    queue.put(combat_tic(attacker, defender))
-                    queue.put(combat_tic(defender, attacker))
-
-            # Go through the priority queue
-            while not queue.empty():
-                tic = queue.get()
-                if self.for_speed and tic[0] > 179:
-                    # Speed Cannot See past priority 179
-                    break
-                tic[2]()
-
-            if self.for_speed:
-                def find_neighbors_in_range(start: Player, goal: Player) -> Set[Player]:
-                    if start == goal:
-                        return set()
-                    adjacency: Dict[Player, Set[Player]] = {}
-                    for a, b in self.range_edges:
-                        adjacency.setdefault(a, set()).add(b)
-                    visited: Set[Player] = {start}
-                    sweep: Set[Player] = {start}
-                    neighbors: Set[Player] = set()
-                    while sweep:
-                        next_sweep: Set[Player] = set()
-                        for node in sweep:
-                            for p in adjacency.get(node, []):
-                                if p == goal:
-                                    neighbors.add(node)
-                                    continue
-                                if p not in visited:
-                                    visited.add(p)
-                                    next_sweep.add(p)
-                        sweep = next_sweep
-                    return neighbors
-
-                for player, other_set in self.damaged_by.items():
-                    if player not in group:
-                        continue
-                    for other in other_set:
-                        if other not in group:
-                            continue
-                        neighbors = find_neighbors_in_range(other, player)
-                        for neighbor in neighbors:
-                            speed_dif = get_speed(player) - get_speed(neighbor)
-                            if speed_dif > 0:
-                                self.escape.add((player, neighbor))
-
-            # Disarm Stealing happens BEFORE Looting corpses
-            for (victim, thieves) in disarm_thief.items():
-                if thieves:
-                    stolen = victim.get_held_weapon()
-                    victim.items.remove(stolen.pin)
-                    living_thieves = [
-                        thief for thief in thieves if thief not in dead_list]
-                    if len(living_thieves) == 1:
-                        thief = living_thieves[0]
-                        thief.items.append(stolen.pin)
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{thief.name} stole {victim.name}'s "
-                                                   f"{stolen.name}.",
-                                                   [victim, thief], InfoScope.PRIVATE)
-                    elif victim not in dead_list:
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{victim.name}'s {stolen.name} was lost.",
-                                                   [victim], InfoScope.PRIVATE)
-
-            survivors = [player for player in group if player not in dead_list]
-            revelers = set()
-            for player in dead_list:
-                if not player.is_automata:
-                    for murderer in self.injured_by.get(player, set()):
-                        if murderer not in dead_list and murderer.is_bloodthirsty():
-                            if player not in self.blood_thirst:
-                                self.blood_thirst[player] = set()
-                            self.blood_thirst[player].add(murderer)
-                            revelers.add(murderer)
-                        if murderer not in dead_list and murderer.is_psycho():
-                            if player.temperaments[0] not in murderer.temperaments:
-                                self.psycho_gains[murderer] = self.psycho_gains.get(murderer, set())
-                                self.psycho_gains[murderer].add(player.temperaments[0])
-                loot_items = [item for item in player.get_items() if item.loot]
-                # Looting can't happen if there is more than one survivor
-                if len(survivors) == 1:
-                    looter = survivors[0]
-                    for item in loot_items:
-                        looter.items.append(item.pin)
-                        self._append_to_event_list(self.combat_group_to_events[group],
-                                                   f"{looter.name} looted {player.name}'s "
-                                                   f"{item.name}.",
-                                                   [looter], InfoScope.PRIVATE)
-                else:
-                    self._append_to_event_list(self.combat_group_to_events[group],
-                                               f"{player.name}'s items were lost in the confusion.",
-                                               survivors, InfoScope.PRIVATE)
-
-                if player.bounty:
-                    bounty = player.bounty
-                    player.bounty = 0
-
-                    enemies = []
-                    for fighter in survivors:
-                        if player in self.attacker_to_defenders.get(fighter, set()) \
-                                or fighter in self.attacker_to_defenders.get(player, set()):
-                            enemies.append(fighter)
-                    if enemies:
-                        per_enemy_bounty = bounty // len(enemies)
-                        if per_enemy_bounty:
-                            credit = "credit"
-                            if per_enemy_bounty > 1:
-                                credit = "credits"
-                            self._append_to_event_list(self.combat_group_to_events[group],
-                                                       f"You earned {per_enemy_bounty} "
-                                                       f"{credit} for killing {player.name}.",
-                                                       enemies, InfoScope.PRIVATE)
-                            for bounty_hunter in enemies:
-                                bounty_hunter.gain_credits(per_enemy_bounty)
-
-            for murderer in revelers:
-                self._append_to_event_list(self.combat_group_to_events[group],
-                                           f"{murderer.name} reveled in the blood.",
-                                           [murderer], InfoScope.PUBLIC)
-
-            for player in group:
-                if Condition.NO_CONTINGENCY in conditions[player]:
-                    self.contingency_locked.add(player)
-                if player in self.full_escape:
-                    self._append_to_event_list(self.combat_group_to_events[group],
-                                               f"{player.name} escaped completely.",
-                                               [player], InfoScope.PUBLIC)
+        if self.replay_order:
+            # Sequential groups share the random stream, so they must take their turns as they did when traced
+            combat_groups.sort(key=lambda g: self.replay_order.index(group_key(g))
+                               if group_key(g) in self.replay_order else len(self.replay_order))
+
+        if self.workers > 1 and len(combat_groups) > 1:
+            self._resolve_in_parallel([frozenset(_group) for _group in combat_groups], simplified_attack_to_defend)
+        elif self.replay_seeds and combat_groups:
+            # Replaying parallel combat, each group with the seed it was traced with
+            game = next(iter(combat_groups[0])).game
+            seeds, final_seed = self._draw_group_seeds(game, combat_groups)
+            for _group, seed in zip(combat_groups, seeds):
+                game.rng.seed(seed)
+                CombatGroup(self, frozenset(_group), seed).resolve(simplified_attack_to_defend)
+            game.rng.seed(final_seed)
+        else:
+            for _group in combat_groups:
+                CombatGroup(self, frozenset(_group)).resolve(simplified_attack_to_defend)
+
+        self.observer_reports.clear()
+        self.in_sight.clear()
+        self.range_frozen = True
+
+        profiler = get_profiler()
+        if profiler:
+            profiler.record('combat', 'process_all_combat' if self.is_real else 'process_all_combat (simulation)',
+                            combat_start, time.perf_counter() - combat_start)
+
+    # Combat groups share no players, so each one can be resolved on a copy of the game in a worker process
+    # Each worker receives the game before combat once, then groups are sent as their players' names and a seed
+    # Every group gets its own random seed, drawn in group order, so the outcome doesn't depend on the worker count
+    # Results are merged back in group order, as if the groups had been resolved here one after another
+    def _resolve_in_parallel(self, groups: List[FrozenSet['Player']],
+                             simplified_attack_to_defend: Set[Tuple['Player', 'Player']]):
+        from report import get_main_report
+
+        game = next(iter(groups[0])).game
+        seeds, final_seed = self._draw_group_seeds(game, groups)
+        payloads = [(sorted(player.name for player in group), seed) for group, seed in zip(groups, seeds)]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(groups)), initializer=_start_combat_worker,
+                                 initargs=(game, self, get_main_report(), simplified_attack_to_defend)) as executor:
+            results = list(executor.map(_resolve_group_in_worker, payloads))
+
+        for group, result in zip(groups, results):
+            self._merge_group(group, _SharedUnpickler(io.BytesIO(result), game).load())
+        game.rng.seed(final_seed)
+
+    # A seed for each group and one to continue with afterwards
+    def _draw_group_seeds(self, game: 'Game', groups: List[Set['Player']]) -> Tuple[List[int], int]:
+        seeds = [game.rng.getrandbits(32) for _ in groups]
+        final_seed = game.rng.getrandbits(32)
+        if self.replay_seeds:
+            seeds = [self.replay_seeds.get(group_key(group), seed) for group, seed in zip(groups, seeds)]
+        return seeds, final_seed
+
+    def _merge_group(self, group: FrozenSet['Player'], result: Tuple):
+        from actions import Action
+        from report import get_main_report
+
+        (tic_count, events, trace, broadcasts, members, range_edges, info_once, wide_check,
+         player_states, descriptions, actors_changed, deaths, other_actions, report_changes) = result
+        game = next(iter(group)).game
+        for player in group:
+            player.items = Inventory(player_states[player.name].pop('items'))
+            for field, value in player_states[player.name].items():
+                setattr(player, field, value)
+            player.action.public_description = descriptions[player.name]
+        if actors_changed:
+            game.turn_context.invalidate_actors()
+
+        self.combat_group_to_events[group] = events
+        if trace is not None:
+            self.combat_group_to_trace[group] = trace
+        self.broadcast_events.extend(broadcasts)
+        for field in COMBAT_GROUP_FIELDS:
+            _merge_members(getattr(self, field), members[field], group.__contains__)
+        names = {player.name for player in group}
+        _merge_members(self.hot_blood, members['hot_blood'], names.__contains__)
+        _merge_members(self.escape, members['escape'], lambda pair: pair[0] in group)
+        self.range_edges = [edge for edge in self.range_edges if edge[0] not in group] + range_edges
+        if info_once is not None:
+            self.info_once[group_key(group)] = info_once
+        self.wide_check = self.wide_check or wide_check
+        self.tic_index += tic_count
+        self.range_version += 1
+
+        # Actions queued by deaths, numbered as if they had been queued here
+        # The worker only handled the group's own death triggers, everyone else's are handled here
+        context = game.turn_context
+        outside = [player for player in context.players if player not in group]
+        for dead, triggers, resurrections in deaths:
+            _requeue(game, triggers)
+            Action.handle_death_triggers(game, dead, outside)
+            _requeue(game, resurrections)
+        _requeue(game, other_actions)
+
+        report = get_main_report()
+        new_dead, new_actions, new_broadcasts = report_changes
+        for player in new_dead:
+            report.add_death(player)
+        for action in new_actions:
+            report.add_action(*action)
+        for content, intuition_required in new_broadcasts:
+            report.broadcast(content, intuition_required)
 
     def check_range(self, player, target, ignore_escape=False):
         # Quick little BFS to check if player can reach target using edges, with a small bit of
@@ -1235,7 +460,8 @@ class CombatHandler:
             visited.append(current)
             for nxt in [edge[1] for edge in self.range_edges if edge[0] == current]:
                 if nxt == target:
-                    self.range_edges.append((player, target))
+                    if not self.range_frozen:
+                        self.range_edges.append((player, target))
                     return True
                 if nxt not in visited:
                     queue.append(nxt)
@@ -1355,12 +581,17 @@ class CombatHandler:
                             report += event[0] + os.linesep
                     elif event[2] in [InfoScope.PUBLIC, InfoScope.BROADCAST] or player in event[1]:
                         report += event[0] + os.linesep
+                in_sight = self.get_in_sight(player)
                 for other in group:
-                    if not self.check_range(player, other, ignore_escape=True):
+                    if other not in in_sight:
                         report = report.replace(other.name, "Someone")
         return report
 
     def get_combat_report_for_player_as_observer(self, player: "Player", observer: "Player"):
+        intuition = observer.has_condition(Condition.INTUITION)
+        cached = self.observer_reports.get((player, intuition))
+        if cached and cached[0] == self.range_version:
+            return cached[1]
         report = ""
         for (group, events) in self.combat_group_to_events.items():
             if player in group:
@@ -1370,15 +601,42 @@ class CombatHandler:
                                       .replace("attacked", self.verb_dict.get(other, 'attacked')) + os.linesep
                 for event in events:
                     if event[2] == InfoScope.WIDE:
-                        if observer.has_condition(Condition.INTUITION):
+                        if intuition:
                             report += event[0] + os.linesep
                     elif event[2] in [InfoScope.PUBLIC, InfoScope.BROADCAST]:
                         report += event[0] + os.linesep
+                in_sight = self.get_in_sight(player)
                 for other in group:
-                    if not self.check_range(player, other, ignore_escape=True):
+                    if other not in in_sight:
                         report = report.replace(other.name, "Someone")
+        self.observer_reports[(player, intuition)] = (self.range_version, report)
         return report
 
+    # Reachability is worked out for a whole combat group at once, the first time one of its members asks
+    # Same as check_range with ignore_escape, which later reports would otherwise repeat for every pair
+    def get_in_sight(self, player: "Player") -> FrozenSet['Player']:
+        if player in self.in_sight:
+            return self.in_sight[player]
+        adjacency: Dict['Player', Set['Player']] = {}
+        for a, b in self.range_edges:
+            adjacency.setdefault(a, set()).add(b)
+        for group in self.combat_group_to_events:
+            if player in group:
+                for member in group:
+                    reached = {member}
+                    sweep = [member]
+                    while sweep:
+                        for nxt in adjacency.get(sweep.pop(), ()):
+                            if nxt not in reached:
+                                reached.add(nxt)
+                                sweep.append(nxt)
+                    self.in_sight[member] = frozenset(reached)
+        return self.in_sight.setdefault(player, frozenset([player]))
+
+    # The trace of every combat group, in the order they were resolved
+    def get_trace(self) -> List[Dict]:
+        return list(self.combat_group_to_trace.values())
+
     def get_public_combat_report(self, intuition=False, ignore_player: Optional['Player'] = None):
         report = ""
         for (group, events) in self.combat_group_to_events.items():
@@ -1407,8 +665,11 @@ class CombatHandler:
         self.report_dict = {}
         self.attacker_to_defenders = {}
         self.combat_group_to_events = {}
+        self.observer_reports = {}
         self.verb_dict = {}  # Used if 'attacked' isn't appropriate
         self.range_edges = []  # One directional edges used to calculate range
+        self.range_frozen = False
+        self.in_sight = {}
 
         self.ambushes = {}  # First populated when attempting to ambush, then pruned
 
@@ -1427,10 +688,1235 @@ class CombatHandler:
         self.full_escape.clear()
         self.no_escape.clear()
         self.contingency_locked.clear()
+        self.range_version = 0
+
+        self.combat_group_to_trace = {}
+        self.trace_snapshot = None
+        self.replay_seeds = {}
+        self.replay_order = []
 
         self.wide_check = False
 
 
+# The state of a single combat group while its combat is resolved
+class CombatGroup:
+    def __init__(self, handler: CombatHandler, group: FrozenSet['Player'], seed: Optional[int] = None):
+        self.handler = handler
+        self.group = group
+        # For generating reports
+        self.events: Event_List = []
+        handler.combat_group_to_events[group] = self.events
+
+        # Recorded if the handler records traces
+        # Tics hold [Priority, Kind, Player, Skill pin, Targets, Combat changes, Survivability changes]
+        # Outcome holds Name: Outcome fields, conditions and items after combat
+        self.trace: Optional[Dict] = None
+        if handler.record_trace:
+            self.trace = {'group': group_key(group), 'seed': seed, 'attacks': [], 'tics': [], 'outcome': {}}
+            handler.combat_group_to_trace[group] = self.trace
+
+        self.combat: Dict['Player', int] = {}
+        self.survivability: Dict['Player', int] = {}
+        self.conditions: Dict['Player', List[Condition]] = {p: [] for p in group}
+
+        # Heap of Tics
+        self.queue: List[Tic] = []
+
+        # Prevent certain things from happening redundantly, like armor break
+        self.only_once: Set[Any] = set()
+        # Special Disarm Theft logic
+        # Victim: Thieves
+        self.disarm_thief: Dict['Player', List['Player']] = {p: [] for p in group}
+
+        # For looting
+        self.dead_list: List['Player'] = []
+
+        # Defender: Attackers, in the order the attacks were added
+        self.attackers: Dict['Player', List['Player']] = {p: [] for p in group}
+        for attacker, defenders in handler.attacker_to_defenders.items():
+            for defender in defenders:
+                if defender in self.attackers and attacker not in self.attackers[defender]:
+                    self.attackers[defender].append(attacker)
+        # (Trigger, Player, Is Ambush): Targets before target conditions are checked
+        # Targets of triggers that depend on range are dropped whenever the handler's range version changes
+        self.fixed_targets: Dict[Tuple[Trigger, 'Player', bool], List['Player']] = {}
+        self.ranged_targets: Dict[Tuple[Trigger, 'Player', bool], List['Player']] = {}
+        self.ranged_targets_version = handler.range_version
+
+    def add_event(self, message: str, affected: List['Player'], info: InfoScope = InfoScope.PUBLIC,
+                  aero: Optional['Player'] = None):
+        self.handler._append_to_event_list(self.events, message, affected, info, aero)
+
+    def get_damage_type(self, a: 'Player', initial_damage_type: DamageType = DamageType.DEFAULT) -> DamageType:
+        if Condition.PETRIFY in self.conditions[a]:
+            return DamageType.PETRIFY
+        return initial_damage_type
+
+    def get_injury_modifiers(self, a: 'Player') -> List[InjuryModifier]:
+        modifiers = []
+        if Condition.INFLICT_GRIEVOUS in self.conditions[a]:
+            modifiers.append(InjuryModifier.GRIEVOUS)
+        if Condition.INFLICT_CAUTERIZE in self.conditions[a]:
+            modifiers.append(InjuryModifier.PERMANENT)
+        return modifiers
+
+    def get_speed(self, a: "Player"):
+        conditions = self.conditions
+        speed = self.handler.speed.get(a, 0)
+        if Condition.AMBUSHED in conditions.get(a, []):
+            speed -= 1
+        if Condition.SNIPED in conditions.get(a, []):
+            speed -= 2
+        speed += conditions[a].count(Condition.INCREASED_SPEED)
+        if Condition.TARGET_LOCKED in conditions.get(a, []):
+            speed = 0
+        return max(speed, 0)
+
+    def push(self, tic: Tic):
+        heapq.heappush(self.queue, tic)
+
+    def _next_index(self) -> int:
+        self.handler.tic_index += 1
+        return self.handler.tic_index
+
+    # Generate a tic to remove a condition from a player
+    def condition_remove_tic(self, priority: int, p: 'Player', c: Condition) -> Tic:
+        return Tic(priority + 1, self._next_index(), 'condition_remove', p, args=(c,))
+
+    def _condition_remove(self, tic: Tic):
+        p, (c,) = tic.player, tic.args
+        if c in self.conditions[p]:
+            self.conditions[p].remove(c)
+        if c in p.conditions:
+            p.conditions.remove(c)
+
+    # Generate a tic to remove an item from a player's inventory
+    def item_remove_tic(self, priority: int, p: 'Player', item_index: int) -> Tic:
+        return Tic(priority + 1, self._next_index(), 'item_remove', p, args=(item_index,))
+
+    def _item_remove(self, tic: Tic):
+        p, (item_index,) = tic.player, tic.args
+        if item_index in p.items:
+            p.items.remove(item_index)
+            self.add_event(f"{p.name}'s {get_item(item_index).name} was "
+                           f"{get_item(item_index).destruction_message}.",
+                           [p], InfoScope.PRIVATE)
+
+    # We need priority to tic before checking, otherwise defending snipers wouldn't be able to counter-snipe
+    def sniper_tic(self, priority: float, p: 'Player') -> Tic:
+        return Tic(priority + 1, self._next_index(), 'snipe', p)
+
+    def _snipe(self, tic: Tic):
+        handler = self.handler
+        p = tic.player
+        # Attacking the sniper or having sniper yourself lets you hit back against a sniper
+        for target in handler.attacker_to_defenders.get(p, []):
+            if Condition.SNIPING not in self.conditions[target]:
+                if p not in handler.attacker_to_defenders.get(target, []):
+                    if (target, p) in handler.range_edges:
+                        handler.range_edges.remove((target, p))
+                        handler.range_version += 1
+
+    def ambush_tic(self, ambusher: 'Player', ambushee: 'Player', verb: str) -> Tic:
+        return Tic(6, self._next_index(), 'ambush', ambusher, targets=[ambushee], args=(verb,))
+
+    def _ambush(self, tic: Tic):
+        handler = self.handler
+        ambusher, ambushee, (verb,) = tic.player, tic.targets[0], tic.args
+        if ambushee not in handler.ambushes.get(ambusher, set()):
+            return
+
+        failed_ambush = False
+        if Condition.AMBUSH_IMMUNE in self.conditions.get(ambushee):
+            failed_ambush = True
+
+        if Condition.AMBUSH_AWARE in self.conditions[ambushee]:
+            if ambushee.get_awareness() > ambusher.get_awareness():
+                failed_ambush = True
+
+        if failed_ambush:
+            handler.ambushes[ambusher].discard(ambushee)
+            self.add_event(f"{ambusher.name} failed to ambush {ambushee.name}.",
+                           [ambusher, ambushee], InfoScope.PUBLIC)
+            return
+
+        # Ambushes cancel each other out
+        if ambusher in handler.ambushes.get(ambushee, set()):
+            handler.ambushes[ambushee].discard(ambusher)
+            handler.ambushes[ambusher].discard(ambushee)
+            self.add_event(f"{ambusher.name} and {ambushee.name} failed to "
+                           f"ambush each other.",
+                           [ambusher, ambushee], InfoScope.PUBLIC)
+            return
+        if 'counter' not in verb:
+            handler.update_verb_dict(ambusher, verb)
+        self.conditions[ambushee].append(Condition.AMBUSHED)
+
+    def speed_ambush_tic(self, ambusher: 'Player', ambushee: 'Player') -> Tic:
+        return Tic(25, self._next_index(), 'speed_ambush', ambusher, targets=[ambushee])
+
+    def _speed_ambush(self, tic: Tic):
+        handler = self.handler
+        ambusher, ambushee = tic.player, tic.targets[0]
+        if ambushee in handler.ambushes.get(ambusher, set()):
+            return  # Already handled
+
+        if ambusher in handler.ambushes.get(ambushee, set()):
+            return  # Can't speed ambush ambushers
+
+        if self.get_speed(ambusher) - self.get_speed(ambushee) < 2:
+            return  # Not fast enough
+
+        if Condition.AMBUSH_AWARE in self.conditions[ambushee]:
+            if ambushee.get_awareness() > ambusher.get_awareness():
+                return
+
+        handler.update_verb_dict(ambusher, "blitzed")
+        if ambusher not in handler.ambushes:
+            handler.ambushes[ambusher] = set()
+        handler.ambushes[ambusher].add(ambushee)
+        self.conditions[ambushee].append(Condition.AMBUSHED)
+
+    def drain_tic(self, drainer: 'Player', will_bag: 'Player') -> Tic:
+        handler = self.handler
+        index = self._next_index()
+
+        if will_bag not in handler.drained_by:
+            handler.drained_by[will_bag] = set()
+        handler.drained_by[will_bag].add(drainer)
+        handler.drainers.add(drainer)
+
+        return Tic(25, index, 'drain', drainer, targets=[will_bag])
+
+    def _drain(self, tic: Tic):
+        handler = self.handler
+        drainer, will_bag = tic.player, tic.targets[0]
+        if will_bag in handler.drained:
+            return  # Already handled
+
+        if will_bag.willpower > 0:
+            self.add_event(f"You lost {will_bag.willpower} Willpower.",
+                           [will_bag], InfoScope.PRIVATE)
+            if will_bag in handler.drainers or len(handler.drained_by[will_bag]) > 1:
+                self.add_event(f"{will_bag.name}'s {will_bag.willpower} Willpower "
+                               f"was lost in the confusion.",
+                               list(handler.drained_by[will_bag]), InfoScope.PRIVATE)
+            elif len(handler.drained_by[will_bag]) == 1:
+                assert drainer in handler.drained_by[will_bag]
+                if drainer in handler.drained_by:
+                    self.add_event(f"{will_bag.name}'s {will_bag.willpower} Willpower "
+                                   f"was lost in the confusion.",
+                                   list(handler.drained_by[will_bag]), InfoScope.PRIVATE)
+                else:
+                    drainer.willpower += will_bag.willpower
+                    drainer.willpower = min(
+                        drainer.willpower, drainer.max_willpower)
+                    self.add_event(f"You stole {will_bag.willpower} Willpower. "
+                                   f"({drainer.willpower}/{drainer.max_willpower})",
+                                   [drainer], InfoScope.PRIVATE)
+            will_bag.willpower = 0
+        handler.drained.add(will_bag)
+
+    def find_targets(self, p: 'Player', trigger: Trigger, ambush: bool) -> List['Player']:
+        handler = self.handler
+        if trigger in (Trigger.SELF, Trigger.COMBAT_INJURY):
+            return [p]
+        if trigger == Trigger.ATTACK:
+            return [target for target in handler.attacker_to_defenders.get(p, [])
+                    if handler.check_range(p, target) or ambush]
+        if trigger == Trigger.ATTACKED:
+            return [a for a in self.attackers[p] if handler.check_range(p, a)]
+        if trigger == Trigger.ATTACKED_IGNORE_RANGE:
+            return self.attackers[p][:]
+        if trigger == Trigger.ENEMY:  # EXPLICITLY IGNORES RANGE
+            targets = list(handler.attacker_to_defenders.get(p, []))
+            targets.extend(a for a in self.attackers[p] if a not in targets)
+            return targets
+        if trigger == Trigger.RANGE:
+            return [o for o in self.group if handler.check_range(p, o)]
+        if trigger == Trigger.RANGE_IGNORE_SPEED:
+            return [o for o in self.group if handler.check_range(p, o, ignore_escape=True)]
+        if trigger == Trigger.RANGE_EX_SELF:
+            return [o for o in self.group if handler.check_range(p, o) and o.name != p.name]
+        return []
+
+    def get_skill_targets(self, p: 'Player', skill: Skill) -> List['Player']:
+        trigger = skill.trigger
+        if trigger in RANGED_TRIGGERS:
+            if self.ranged_targets_version != self.handler.range_version:
+                self.ranged_targets.clear()
+                self.ranged_targets_version = self.handler.range_version
+            table = self.ranged_targets
+        else:
+            table = self.fixed_targets
+        key = (trigger, p, trigger == Trigger.ATTACK and skill.effect == Effect.AMBUSH)
+        if key not in table:
+            table[key] = self.find_targets(p, trigger, key[2])
+        targets = table[key]
+
+        if trigger != Trigger.SELF:
+            if skill.target_has_condition:
+                targets = [target for target in targets
+                           if skill.target_has_condition in self.conditions[target]]
+            if skill.target_not_condition:
+                targets = [target for target in targets if
+                           skill.target_not_condition not in self.conditions[target]]
+        return targets
+
+    def skill_tic(self, p: 'Player', skill: Skill, _targets: Optional[List['Player']] = None) -> Tic:
+        return Tic(skill.priority, self._next_index(), 'skill', p, skill=skill, targets=_targets)
+
+    def _skill(self, tic: Tic):
+        handler = self.handler
+        conditions = self.conditions
+        p, skill = tic.player, tic.skill
+        if skill.trigger == Trigger.NONCOMBAT:
+            return
+
+        if skill.fragile and skill.fragile in conditions[p]:
+            return
+        if skill.self_has_condition and skill.self_has_condition not in conditions[p]:
+            return
+        if skill.self_not_condition and skill.self_not_condition in conditions[p]:
+            return
+        if Condition.PETRIFIED in conditions[p] and not skill.works_when_petrified:
+            return
+
+        if tic.targets is not None:
+            targets = tic.targets
+        else:
+            targets = self.get_skill_targets(p, skill)
+
+        if not targets:
+            return
+
+        targets = [
+            target for target in targets if not target.is_dead()]
+
+        if skill.effect == Effect.INTUITION:
+            # Ensure there is no way to tell WHICH player is which Aeromancer
+            p.game.rng.shuffle(targets)
+        if self.trace is not None:
+            tic.targets = targets
+
+        times = 1  # For repeated CONDITION type effects
+        if skill.value_b and isinstance(skill.value_b, int):
+            times = skill.value_b
+
+        if targets and skill.effect not in (Effect.INFO, Effect.INFO_ONCE):
+            if skill.effect not in COMBAT_EFFECT_HANDLERS:
+                raise Exception(
+                    f"Unhandled effect type in combat! {skill.effect.name}")
+            apply = COMBAT_EFFECT_HANDLERS[skill.effect]
+            for target in targets:
+                if skill.self_override:
+                    target = p  # Effect based on target conditions, but impacts only self
+                apply(self, p, skill, target, times)
+
+        if skill.info != InfoScope.HIDDEN:
+            for target in targets:
+
+                msg = skill.text.replace(SELF_PLACEHOLDER, p.name).replace(
+                    TARGET_PLACEHOLDER, target.name)
+                if skill.effect != Effect.INFO_ONCE or msg not in handler.get_info_once(self.group):
+                    message_origin = p
+                    if skill.player_of_origin:
+                        message_origin = skill.player_of_origin
+                    msg_grp = [p, target]
+                    if skill.info == InfoScope.PERSONAL:
+                        msg_grp = [p]
+                    elif skill.info in [InfoScope.IMPERSONAL, InfoScope.NARROW_IMPERSONAL,
+                                        InfoScope.SUBTLE_IMPERSONAL]:
+                        msg_grp = [target]
+                    self.add_event(msg, msg_grp, skill.info, message_origin)
+                if skill.effect == Effect.INFO_ONCE:
+                    handler.add_info_once(self.group, msg)
+
+    def petrify_tic(self, base_priority: int, p: 'Player', long=False, mini=False) -> Tic:
+        return Tic(base_priority, self._next_index(), 'petrify', p, args=(long, mini))
+
+    def _petrify(self, tic: Tic):
+        p, (long, mini) = tic.player, tic.args
+
+        def reporting_function(message: str, info_scope: InfoScope):
+            self.add_event(message, [p], info_scope, p)
+
+        p.petrify(reporting_function, mini=mini, long=long)
+        if Condition.PETRIFIED in p.conditions:
+            self.conditions[p].append(Condition.GAS_IMMUNE)
+            self.conditions[p].append(Condition.PETRIFIED)
+
+    def kill_tic(self, base_priority: int, p: 'Player') -> Tic:
+        return Tic(base_priority, self._next_index(), 'kill', p)
+
+    def _kill(self, tic: Tic):
+        p = tic.player
+        was_alive = not p.is_dead()
+
+        def reporting_function(message: str, info_scope: InfoScope):
+            self.add_event(message, [p], info_scope, p)
+
+        p.kill(reporting_function)
+
+        if was_alive and p.is_dead():
+            self.dead_list.append(p)
+
+    def wound_tic(self, base_priority: int, p: 'Player', injury_modifiers: List[InjuryModifier]) -> Tic:
+        return Tic(base_priority, self._next_index(), 'wound', p, args=(injury_modifiers,))
+
+    def _wound(self, tic: Tic):
+        p, (injury_modifiers,) = tic.player, tic.args
+        if Condition.COMBAT_REGEN in self.conditions[p]:
+            self.add_event("You regenerated, ignoring the wound.", [p], InfoScope.PRIVATE)
+            return
+
+        was_alive = not p.is_dead()
+
+        _injury_modifiers = injury_modifiers
+
+        if Condition.GRIEVOUS_IMMUNE in self.conditions[p] and InjuryModifier.GRIEVOUS in _injury_modifiers:
+            if InjuryModifier.PERMANENT not in _injury_modifiers:
+                _injury_modifiers = [modifier for modifier in injury_modifiers
+                                     if modifier != InjuryModifier.GRIEVOUS]
+
+        def reporting_function(message: str, info_scope: InfoScope):
+            self.add_event(message, [p], info_scope, p)
+
+        wounded = p.wound(_injury_modifiers, reporting_function)
+        if wounded and not p.is_dead():
+            for injured_skill in p.get_skills():
+                if injured_skill.trigger == Trigger.COMBAT_INJURY:
+                    self.push(self.skill_tic(p, injured_skill))
+
+        if was_alive and p.is_dead():
+            self.dead_list.append(p)
+
+    def damage_tic(self, base_priority: int, source: 'Player', target: 'Player', dmg_type: DamageType,
+                   injury_modifiers: List[InjuryModifier],
+                   target_not_condition: Optional[Condition] = None) -> Tic:
+        handler = self.handler
+        index = self._next_index()
+
+        # Damage is marked here for other logic, in the tic constructor, not the tic
+        # If something can create a damage_tic without damaging, something has gone wrong
+        # Yes this means someone petrified by poison gas and hit by normal poison gas is damaged by both
+        # But that generally doesn't matter
+        # Try to avoid target_not_condition whenever possible
+        if target not in handler.damaged_by:
+            handler.damaged_by[target] = set()
+        handler.damaged_by[target].add(source)
+
+        priority = base_priority
+        if dmg_type == DamageType.PETRIFY:
+            priority += 5
+        if dmg_type == DamageType.NONLETHAL:
+            priority += 10
+
+        # Permanent Grievous -> Permanent -> Grievous -> Regular Injury
+        priority += 3
+        for modifier in injury_modifiers:
+            priority -= int(modifier)
+
+        return Tic(priority, index, 'damage', source, targets=[target],
+                   args=(dmg_type, injury_modifiers, target_not_condition))
+
+    def _damage(self, tic: Tic):
+        conditions = self.conditions
+        source, target, priority = tic.player, tic.targets[0], tic.priority
+        dmg_type, injury_modifiers, target_not_condition = tic.args
+        if target_not_condition and target_not_condition in conditions[target]:
+            return
+
+        if dmg_type == DamageType.DEFAULT:
+            if InjuryModifier.NONLETHAL in injury_modifiers:
+                if Condition.NONLETHAL_IMMUNE in conditions[target]:
+                    return
+            self.push(self.wound_tic(priority + 1, target, injury_modifiers))
+        elif dmg_type == DamageType.PETRIFY:
+            self.push(self.petrify_tic(priority + 1, target, long=Condition.LONG_PETRIFY in conditions[source],
+                                       mini=InjuryModifier.MINI in injury_modifiers))
+        elif dmg_type == DamageType.NONLETHAL:
+            if Condition.NONLETHAL_IMMUNE in conditions[target]:
+                return
+            if Condition.INJURED in target.conditions:
+                return
+            self.push(self.wound_tic(priority + 1, target, injury_modifiers + [InjuryModifier.NONLETHAL]))
+
+        for damaged_skill in target.get_skills():
+            if damaged_skill.trigger == Trigger.COMBAT_DAMAGED:
+                self.push(self.skill_tic(target, damaged_skill, [source]))
+
+    def get_combat(self, p: 'Player', d: Optional['Player'] = None):
+        conditions = self.conditions
+        if Condition.PETRIFIED in conditions[p]:
+            return -1
+        c = self.combat[p]
+        if c < 0:
+            return c
+
+        if Condition.DEADLY_AMBUSH in conditions[p] and d in self.handler.ambushes.get(p):
+            c += 2
+
+        if d and Condition.USING_AERO in conditions[d] and Condition.UNNATURAL_INTUITION in conditions[p]:
+            c += 1
+
+        if d and d.check_relative_condition(p, Condition.SABOTAGED_KNOWLEDGE):
+            c -= 2
+        elif d and p.check_relative_condition(d, Condition.KNOW):
+            c += 1
+
+        if c < 0:
+            c = 0
+        return c
+
+    def get_survivability(self, p: 'Player', a: Optional['Player'] = None):
+        conditions = self.conditions
+        if Condition.PETRIFIED in conditions[p]:
+            return 10 - conditions[p].count(Condition.CRUMBLING)
+        s = self.survivability[p]
+        if s >= 0:
+            if a and Condition.USING_AERO in conditions[a] and Condition.UNNATURAL_INTUITION in conditions[p]:
+                s += 1
+
+            if a and a.check_relative_condition(p, Condition.SABOTAGED_KNOWLEDGE):
+                s -= 2
+            elif a and p.check_relative_condition(a, Condition.KNOW):
+                s += 2
+
+            if p.is_hotblooded():
+                s += 1
+
+            if s < 0:
+                s = 0
+
+        if Condition.FIRE_BODY in conditions[p]:
+            if not a or Condition.GEO_LOCKED in conditions[a] or Element.WATER not in a.circuits:
+                s = max(s, self.get_combat(p, a))
+
+        return s
+
+    def combat_tic(self, offense: 'Player', defense: 'Player', ambushed_tic=False) -> Tic:
+        priority = ATTACK_PRIORITY
+        if ambushed_tic:
+            priority += 20
+        return Tic(priority, self._next_index(), 'fight', offense, targets=[defense], args=(ambushed_tic,))
+
+    def _fight(self, tic: Tic):
+        handler = self.handler
+        disarm_thief = self.disarm_thief
+        offense, defense, (ambushed_tic,) = tic.player, tic.targets[0], tic.args
+        # Ambushed players attempt to damage 20 priority later
+        if not ambushed_tic and offense in handler.ambushes.get(defense, set()):
+            self.push(self.combat_tic(offense, defense, True))
+            return
+
+        if offense.is_dead() or defense.is_dead():
+            return
+
+        if handler.check_range(offense, defense):
+            handler.hot_blood.add(offense.name)
+            handler.full_escape.discard(defense)
+            handler.full_escape.discard(offense)
+            handler.no_escape.add(defense)
+            handler.no_escape.add(offense)
+            if DEBUG:
+                self.add_event(f"{offense.name} ({self.get_combat(offense, defense)}) attacking "
+                               f"{defense.name} ({self.get_survivability(defense, offense)})",
+                               [offense, defense],
+                               InfoScope.PRIVATE)
+            if handler._one_on_one(offense, defense, self.get_combat, self.get_survivability,
+                                   self.events):
+                self.push(self.damage_tic(DAMAGE_PRIORITY, source=offense, target=defense,
+                                          dmg_type=self.get_damage_type(
+                                              offense),
+                                          injury_modifiers=self.get_injury_modifiers(offense)))
+                # Damaged by is handled inside the damage_tic CONSTRUCTOR
+                if defense in disarm_thief[offense]:
+                    # Injured attacker, so not disarm stolen
+                    disarm_thief[offense].remove(defense)
+                if defense not in handler.injured_by:
+                    handler.injured_by[defense] = set()
+                handler.injured_by[defense].add(offense)
+            else:
+                if offense in disarm_thief[defense]:
+                    # Failed to injure defender, so not disarm stolen
+                    disarm_thief[defense].remove(offense)
+        else:
+            if self.get_speed(defense) - self.get_speed(offense) >= 2:
+                if defense not in handler.no_escape:
+                    handler.full_escape.add(defense)
+            else:
+                handler.full_escape.discard(defense)
+                handler.no_escape.add(defense)
+
+    def debug_tic(self, priority: int, p: 'Player') -> Tic:
+        return Tic(priority, self._next_index(), 'debug', p)
+
+    def _debug(self, tic: Tic):
+        p = tic.player
+        self.add_event(f"{p.name} ({self.get_combat(p)}/{self.get_survivability(p)}) "
+                       f"(S{self.get_speed(p)}) "
+                       f"{[i.name for i in p.get_items()]}"
+                       f"{[c.name for c in self.conditions[p]]}"
+                       f"{p.relative_condition_debug()}",
+                       [p])
+
+    def escape_message_tic(self, p: 'Player', e: 'Player') -> Tic:
+        return Tic(-1, self._next_index(), 'escape_message', p, targets=[e])
+
+    def _escape_message(self, tic: Tic):
+        self.add_event(f"{tic.player.name} escaped {tic.targets[0].name}.",
+                       [tic.player, tic.targets[0]], info=InfoScope.PUBLIC)
+
+    # Kind: Runs a tic of that kind
+    RUNNERS: Dict[str, Callable[['CombatGroup', Tic], None]] = {
+        'condition_remove': _condition_remove,
+        'item_remove': _item_remove,
+        'snipe': _snipe,
+        'ambush': _ambush,
+        'speed_ambush': _speed_ambush,
+        'drain': _drain,
+        'skill': _skill,
+        'petrify': _petrify,
+        'kill': _kill,
+        'wound': _wound,
+        'damage': _damage,
+        'fight': _fight,
+        'debug': _debug,
+        'escape_message': _escape_message,
+    }
+
+    def run(self, tic: Tic):
+        self.RUNNERS[tic.kind](self, tic)
+
+    def resolve(self, simplified_attack_to_defend: Set[Tuple['Player', 'Player']]):
+        handler = self.handler
+        group = self.group
+        combat = self.combat
+        survivability = self.survivability
+        conditions = self.conditions
+        queue = self.queue
+        disarm_thief = self.disarm_thief
+        dead_list = self.dead_list
+
+        if not handler.for_speed:
+            handler.escape = handler.speed_sim()
+            handler.range_version += 1
+            for player, escaped in handler.escape:
+                if player in group:
+                    self.push(self.escape_message_tic(player, escaped))
+
+        for player in group:
+            combat[player] = 1
+            survivability[player] = 1
+            conditions[player] = player.conditions[:] + player.turn_conditions[:]
+
+            if player.willpower:
+                conditions[player].append(Condition.HAS_WILLPOWER)
+
+            # Bunker Effect
+            bunker_combat_skill = Skill(-1, text="Bunker Combat +1", effect=Effect.COMBAT, value=1, priority=21,
+                                        info=InfoScope.HIDDEN, trigger=Trigger.SELF,
+                                        self_has_condition=Condition.BUNKERING)
+            bunker_survive_skill = Skill(-1, text="Bunker Survive +2", effect=Effect.SURVIVABILITY,
+                                         value=2, priority=21,
+                                         info=InfoScope.HIDDEN, trigger=Trigger.SELF,
+                                         self_has_condition=Condition.BUNKERING)
+
+            self.push(self.skill_tic(player, bunker_combat_skill))
+            self.push(self.skill_tic(player, bunker_survive_skill))
+            if not player.distracted:
+                self.push(self.skill_tic(player, bunker_combat_skill))
+                self.push(self.skill_tic(player, bunker_survive_skill))
+
+            combat[player] += conditions[player].count(Condition.HONED)
+            survivability[player] += conditions[player].count(
+                Condition.FORGED)
+
+            if Condition.COMBAT_DOWN in conditions[player]:
+                combat_down_skill = Skill(-1, text="Combat -X", effect=Effect.COMBAT,
+                                          value=-1 * conditions[player].count(Condition.COMBAT_DOWN),
+                                          priority=69, info=InfoScope.HIDDEN, trigger=Trigger.SELF)
+                self.push(self.skill_tic(player, combat_down_skill))
+
+            if Condition.SURVIVABILITY_DOWN in conditions[player]:
+                survivability_down_skill = Skill(-1, text="Survivability -X", effect=Effect.SURVIVABILITY,
+                                                 value=-1 * conditions[player].count(Condition.SURVIVABILITY_DOWN),
+                                                 priority=69, info=InfoScope.HIDDEN, trigger=Trigger.SELF)
+                self.push(self.skill_tic(player, survivability_down_skill))
+
+            if survivability[player] > combat[player]:
+                survivability[player] += conditions[player].count(
+                    Condition.IMBALANCE)
+            else:
+                combat[player] += conditions[player].count(
+                    Condition.IMBALANCE)
+            bal = conditions[player].count(Condition.BALANCE)
+            while bal:
+                bal -= 1
+                if combat[player] < survivability[player]:
+                    combat[player] += 1
+                else:
+                    survivability[player] += 1
+            if Condition.PETRIFIED in conditions[player]:
+                conditions[player].append(Condition.GAS_IMMUNE)
+
+            if player.circuits:
+                conditions[player].append(Condition.USING_GEO)
+
+            if player.hydro_spells:
+                conditions[player].append(Condition.USING_HYDRO)
+
+            if player.concept:
+                conditions[player].append(Condition.USING_AERO)
+
+            if ABLATIVE in player.items:
+                if player in [_d for _def in handler.attacker_to_defenders.values() for _d in _def]:
+                    self.push(self.skill_tic(player, ABLATIVE_SKILL_A))
+                    self.push(self.skill_tic(player, ABLATIVE_SKILL_B))
+                    player.lose_item(get_item(ABLATIVE))
+
+            for _skill in player.get_skills():
+                # Apply effects from skills to players in order of skill priority
+                if not player.has_condition(Condition.PETRIFIED) or _skill.works_when_petrified:
+                    if _skill.trigger not in NONCOMBAT_TRIGGERS:
+                        self.push(self.skill_tic(player, _skill))
+                    elif _skill.effect == Effect.TENTATIVE_CONDITION:
+                        modified_skill = _skill.copy()
+                        modified_skill.effect = Effect.CONDITION
+                        modified_skill.trigger = Trigger.SELF
+                        self.push(self.skill_tic(player, modified_skill))
+
+        if DEBUG:
+            for player in group:
+                self.push(self.debug_tic(99, player))
+
+        for (attacker, defender) in simplified_attack_to_defend:
+            if attacker in group:
+                self.push(self.combat_tic(attacker, defender))
+                self.push(self.combat_tic(defender, attacker))
+                if self.trace is not None:
+                    self.trace['attacks'].append([attacker.name, defender.name])
+
+        # Go through the priority queue
+        profiler = get_profiler()
+        while queue:
+            tic = heapq.heappop(queue)
+            if handler.for_speed and tic.priority > 179:
+                # Speed Cannot See past priority 179
+                break
+            if self.trace is not None:
+                combat_before, survivability_before = dict(combat), dict(survivability)
+            if profiler:
+                tic_start = time.perf_counter()
+                self.run(tic)
+                if tic.skill:
+                    profiler.record('combat skill', f"{tic.skill.pin} {tic.skill.effect.name}",
+                                    tic_start, time.perf_counter() - tic_start)
+                else:
+                    profiler.record('combat tic', tic.kind, tic_start, time.perf_counter() - tic_start)
+            else:
+                self.run(tic)
+            if self.trace is not None:
+                self.trace['tics'].append([
+                    tic.priority, tic.kind, tic.player.name, tic.skill.pin if tic.skill else None,
+                    [target.name for target in tic.targets] if tic.targets is not None else None,
+                    _changes(combat_before, combat), _changes(survivability_before, survivability)])
+
+        if handler.for_speed:
+            def find_neighbors_in_range(start: 'Player', goal: 'Player') -> Set['Player']:
+                if start == goal:
+                    return set()
+                adjacency: Dict['Player', Set['Player']] = {}
+                for a, b in handler.range_edges:
+                    adjacency.setdefault(a, set()).add(b)
+                visited: Set['Player'] = {start}
+                sweep: Set['Player'] = {start}
+                neighbors: Set['Player'] = set()
+                while sweep:
+                    next_sweep: Set['Player'] = set()
+                    for node in sweep:
+                        for p in adjacency.get(node, []):
+                            if p == goal:
+                                neighbors.add(node)
+                                continue
+                            if p not in visited:
+                                visited.add(p)
+                                next_sweep.add(p)
+                    sweep = next_sweep
+                return neighbors
+
+            for player, other_set in handler.damaged_by.items():
+                if player not in group:
+                    continue
+                for other in other_set:
+                    if other not in group:
+                        continue
+                    neighbors = find_neighbors_in_range(other, player)
+                    for neighbor in neighbors:
+                        speed_dif = self.get_speed(player) - self.get_speed(neighbor)
+                        if speed_dif > 0:
+                            handler.escape.add((player, neighbor))
+                            handler.range_version += 1
+
+        # Disarm Stealing happens BEFORE Looting corpses
+        for (victim, thieves) in disarm_thief.items():
+            if thieves:
+                stolen = victim.get_held_weapon()
+                victim.items.remove(stolen.pin)
+                living_thieves = [
+                    thief for thief in thieves if thief not in dead_list]
+                if len(living_thieves) == 1:
+                    thief = living_thieves[0]
+                    thief.items.append(stolen.pin)
+                    self.add_event(f"{thief.name} stole {victim.name}'s "
+                                   f"{stolen.name}.",
+                                   [victim, thief], InfoScope.PRIVATE)
+                elif victim not in dead_list:
+                    self.add_event(f"{victim.name}'s {stolen.name} was lost.",
+                                   [victim], InfoScope.PRIVATE)
+
+        survivors = [player for player in group if player not in dead_list]
+        revelers = set()
+        for player in dead_list:
+            if not player.is_automata:
+                for murderer in handler.injured_by.get(player, set()):
+                    if murderer not in dead_list and murderer.is_bloodthirsty():
+                        if player not in handler.blood_thirst:
+                            handler.blood_thirst[player] = set()
+                        handler.blood_thirst[player].add(murderer)
+                        revelers.add(murderer)
+                    if murderer not in dead_list and murderer.is_psycho():
+                        if player.temperaments[0] not in murderer.temperaments:
+                            handler.psycho_gains[murderer] = handler.psycho_gains.get(murderer, set())
+                            handler.psycho_gains[murderer].add(player.temperaments[0])
+            loot_items = [item for item in player.get_items() if item.loot]
+            # Looting can't happen if there is more than one survivor
+            if len(survivors) == 1:
+                looter = survivors[0]
+                for item in loot_items:
+                    looter.items.append(item.pin)
+                    self.add_event(f"{looter.name} looted {player.name}'s "
+                                   f"{item.name}.",
+                                   [looter], InfoScope.PRIVATE)
+            else:
+                self.add_event(f"{player.name}'s items were lost in the confusion.",
+                               survivors, InfoScope.PRIVATE)
+
+            if player.bounty:
+                bounty = player.bounty
+                player.bounty = 0
+
+                enemies = []
+                for fighter in survivors:
+                    if player in handler.attacker_to_defenders.get(fighter, set()) \
+                            or fighter in handler.attacker_to_defenders.get(player, set()):
+                        enemies.append(fighter)
+                if enemies:
+                    per_enemy_bounty = bounty // len(enemies)
+                    if per_enemy_bounty:
+                        credit = "credit"
+                        if per_enemy_bounty > 1:
+                            credit = "credits"
+                        self.add_event(f"You earned {per_enemy_bounty} "
+                                       f"{credit} for killing {player.name}.",
+                                       enemies, InfoScope.PRIVATE)
+                        for bounty_hunter in enemies:
+                            bounty_hunter.gain_credits(per_enemy_bounty)
+
+        for murderer in revelers:
+            self.add_event(f"{murderer.name} reveled in the blood.",
+                           [murderer], InfoScope.PUBLIC)
+
+        for player in group:
+            if Condition.NO_CONTINGENCY in conditions[player]:
+                handler.contingency_locked.add(player)
+            if player in handler.full_escape:
+                self.add_event(f"{player.name} escaped completely.",
+                               [player], InfoScope.PUBLIC)
+
+        if self.trace is not None:
+            for player in group:
+                outcome = {field: getter(handler, player) for field, getter in OUTCOME_FIELDS.items()}
+                outcome['conditions'] = sorted(condition.name for condition in player.conditions)
+                outcome['items'] = sorted(player.items.to_list())
+                self.trace['outcome'][player.name] = outcome
+
+
+def group_key(players: Iterable['Player']) -> str:
+    return ", ".join(sorted(player.name for player in players))
+
+
+# Name: Change for every player whose stat changed
+def _changes(before: Dict['Player', int], after: Dict['Player', int]) -> Dict[str, int]:
+    return {player.name: value - before.get(player, 0) for player, value in after.items()
+            if value != before.get(player, 0)}
+
+
+# Effect: Applies a combat skill to one target, called with (Group, User, Skill, Target, Times)
+COMBAT_EFFECT_HANDLERS: Dict[Effect, Callable[[CombatGroup, 'Player', Skill, 'Player', int], None]] = {}
+
+
+def combat_effect(*effects: Effect):
+    def register(handler: Callable[[CombatGroup, 'Player', Skill, 'Player', int], None]):
+        for effect in effects:
+            assert effect not in COMBAT_EFFECT_HANDLERS, f"Combat effect {effect.name} is handled twice"
+            COMBAT_EFFECT_HANDLERS[effect] = handler
+        return handler
+
+    return register
+
+
+def _is_immune(group: CombatGroup, target: 'Player', condition: Condition) -> bool:
+    return condition in CONDITION_IMMUNITY and CONDITION_IMMUNITY[condition] in group.conditions[target]
+
+
+@combat_effect(Effect.COMBAT)
+def _combat(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    # If combat value is set to -1, then it can't be changed
+    if group.combat[target] >= 0:
+        group.combat[target] += skill.value
+        # Combat can't be lowered below zero by regular means
+        if group.combat[target] < 0:
+            group.combat[target] = 0
+
+
+@combat_effect(Effect.NO_COMBAT)
+def _no_combat(group: CombatGroup, _p: 'Player', _skill: Skill, target: 'Player', _times: int):
+    group.combat[target] = -1
+
+
+@combat_effect(Effect.SURVIVABILITY)
+def _survivability(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    # If survivability value is set to -1, then it can't be changed
+    if group.survivability[target] >= 0:
+        group.survivability[target] += skill.value
+        # Survivability can't be lowered below zero by regular means
+        if group.survivability[target] < 0:
+            group.survivability[target] = 0
+
+
+@combat_effect(Effect.NO_SURVIVABILITY)
+def _no_survivability(group: CombatGroup, _p: 'Player', _skill: Skill, target: 'Player', _times: int):
+    group.survivability[target] = -1
+
+
+@combat_effect(Effect.IMBALANCE)
+def _imbalance(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    for _ in range(skill.value):
+        if group.combat[target] >= group.survivability[target]:
+            group.combat[target] += 1
+        else:
+            group.survivability[target] += 1
+
+
+@combat_effect(Effect.BALANCE)
+def _balance(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    for _ in range(skill.value):
+        if group.combat[target] < group.survivability[target]:
+            group.combat[target] += 1
+        else:
+            group.survivability[target] += 1
+
+
+@combat_effect(Effect.CONDITION, Effect.TENTATIVE_CONDITION, Effect.TURN_CONDITION)
+def _condition(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', times: int):
+    condition = skill.condition
+    if not _is_immune(group, target, condition):
+        if skill.value_b is None:
+            if condition not in group.conditions[target]:
+                group.conditions[target].append(condition)
+                if skill.effect == Effect.TURN_CONDITION:
+                    target.turn_conditions.append(condition)
+        else:
+            for _ in range(times):
+                group.conditions[target].append(condition)
+                if skill.effect == Effect.TURN_CONDITION:
+                    target.turn_conditions.append(condition)
+
+
+@combat_effect(Effect.REMOVE_CONDITION)
+def _remove_condition(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', times: int):
+    for _ in range(times):
+        group.push(group.condition_remove_tic(skill.priority, target, skill.condition))
+
+
+@combat_effect(Effect.REL_CONDITION)
+def _relative_condition(_group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', times: int):
+    for _ in range(times):
+        p.add_relative_condition(target, skill.condition)
+
+
+@combat_effect(Effect.PERMANENT_CONDITION)
+def _permanent_condition(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', times: int):
+    condition = skill.condition
+    if not _is_immune(group, target, condition):
+        for _ in range(times):
+            group.conditions[target].append(condition)
+            target.conditions.append(condition)
+
+
+@combat_effect(Effect.DISARM)
+def _disarm(group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', _times: int):
+    group.push(group.condition_remove_tic(skill.priority, target, Condition.ARMED))
+    if target.get_held_weapon():
+        group.disarm_thief[target].append(p)
+
+
+@combat_effect(Effect.ARMOR_BREAK)
+def _armor_break(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    group.push(group.condition_remove_tic(skill.priority, target, Condition.ARMORED))
+    # Don't want to destroy redundant copies
+    tag = ("Armor Break", target.name, target.get_worn_armor().pin)
+    if tag not in group.only_once:
+        group.only_once.add(tag)
+        group.push(group.item_remove_tic(skill.priority, target, target.get_worn_armor().pin))
+
+
+@combat_effect(Effect.WEAPON)
+def _weapon(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    group.combat[target] += skill.value
+    # Only one weapon can apply its bonus
+    group.conditions[target].append(Condition.ARMED_SET)
+
+
+@combat_effect(Effect.ARMOR)
+def _armor(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    group.survivability[target] += skill.value
+    # Only one armor can apply its bonus
+    group.conditions[target].append(Condition.ARMOR_SET)
+
+
+@combat_effect(Effect.SNIPING)
+def _sniping(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    # Modify description of action in place to make the report read cleaner
+    group.handler.update_verb_dict(target, skill.text)
+    group.conditions[target].append(Condition.SNIPING)
+    for sniped in group.handler.attacker_to_defenders.get(target, []):
+        group.conditions[sniped].append(Condition.SNIPED)
+    group.push(group.sniper_tic(skill.priority + 0.1, target))
+
+
+# Effect: (Damage Type, Extra Injury Modifiers)
+DAMAGE_EFFECTS: Dict[Effect, Tuple[DamageType, List[InjuryModifier]]] = {
+    Effect.DAMAGE: (DamageType.DEFAULT, []),
+    Effect.GRIEVOUS: (DamageType.DEFAULT, [InjuryModifier.GRIEVOUS]),
+    Effect.NONLETHAL: (DamageType.NONLETHAL, []),
+    Effect.PETRIFY: (DamageType.PETRIFY, []),
+    Effect.MINI_PETRIFY: (DamageType.PETRIFY, [InjuryModifier.MINI]),
+}
+
+
+@combat_effect(*DAMAGE_EFFECTS)
+def _damage(group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', _times: int):
+    damage_type, modifiers = DAMAGE_EFFECTS[skill.effect]
+    group.push(group.damage_tic(skill.priority + 1, source=p, target=target,
+                                     dmg_type=group.get_damage_type(p, damage_type),
+                                     injury_modifiers=group.get_injury_modifiers(p) + modifiers,
+                                     target_not_condition=skill.target_not_condition))
+
+
+@combat_effect(Effect.KILL)
+def _kill(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    group.push(group.kill_tic(skill.priority + 1, target))
+
+
+@combat_effect(Effect.AMBUSH)
+def _ambush(group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', _times: int):
+    ambushes = group.handler.ambushes
+    if p not in ambushes:
+        ambushes[p] = set()
+    ambushes[p].add(target)
+    group.push(group.ambush_tic(p, target, skill.text))
+
+
+@combat_effect(Effect.SPEED)
+def _speed(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', _times: int):
+    speed = group.handler.speed
+    if target not in speed:
+        speed[target] = 0
+    speed[target] += skill.value
+    if speed[target] < 0:
+        speed[target] = 0
+    if speed[target] >= 2:
+        for v in group.handler.attacker_to_defenders.get(target, []):
+            group.push(group.speed_ambush_tic(target, v))
+
+
+@combat_effect(Effect.DRAIN)
+def _drain(group: CombatGroup, p: 'Player', _skill: Skill, target: 'Player', _times: int):
+    group.push(group.drain_tic(p, target))
+
+
+@combat_effect(Effect.INTUITION)
+def _intuition(group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', _times: int):
+    if target.concept:
+        group.add_event(skill.text.replace(SELF_PLACEHOLDER, p.name)
+                        .replace(TARGET_PLACEHOLDER, target.name)
+                        .replace("%REPLACE_WITH_CONCEPT%", target.concept),
+                        [p],
+                        InfoScope.PERSONAL)
+
+
+@combat_effect(Effect.CONSUME)
+def _consume(group: CombatGroup, _p: 'Player', skill: Skill, target: 'Player', times: int):
+    for _ in range(times):
+        if skill.condition in group.conditions[target]:
+            group.conditions[target].remove(skill.condition)
+            for condition in skill.condition_list:
+                group.conditions[target].append(condition)
+
+
+@combat_effect(Effect.TEMP_SKILL)
+def _temp_skill(_group: CombatGroup, p: 'Player', skill: Skill, target: 'Player', _times: int):
+    temp_skill = get_skill(skill.value)
+    if temp_skill.trigger != Trigger.POST_COMBAT:
+        raise Exception(
+            f"Trying to apply a temp skill that won't activate! {skill.value}")
+    temp_skill.player_of_origin = p
+    target.temporary_skills.append(temp_skill)
+
+
+@combat_effect(Effect.DUST)
+def _dust(_group: CombatGroup, _p: 'Player', _skill: Skill, target: 'Player', _times: int):
+    target.destroy_consumables_and_reactives()
+
+
+# Player fields combat can change, copied back from worker processes
+# Items are sent as pins and rebuilt into an Inventory, so its counts and caches stay consistent
+COMBAT_PLAYER_FIELDS = ('conditions', 'turn_conditions', 'relative_conditions', 'credits', 'willpower',
+                        'bounty', 'temporary_skills', 'report')
+# Handler fields holding sets of players or dictionaries keyed by player, merged for the group's players
+COMBAT_GROUP_FIELDS = ('drainers', 'drained', 'full_escape', 'no_escape', 'contingency_locked', 'blood_thirst',
+                       'psycho_gains', 'injured_by', 'drained_by', 'damaged_by', 'ambushes', 'speed', 'verb_dict')
+
+
+# Results from workers refer to the game, players and items by name, so they resolve to the originals
+class _SharedPickler(pickle.Pickler):
+    def __init__(self, file, game: 'Game'):
+        super().__init__(file)
+        self.shared = {id(game): ('game',)}
+        for player in list(game.players.values()) + list(game.automata.values()):
+            self.shared[id(player)] = ('player', player.name)
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Item):
+            return 'item', obj.pin
+        return self.shared.get(id(obj))
+
+
+class _SharedUnpickler(pickle.Unpickler):
+    def __init__(self, file, game: 'Game'):
+        super().__init__(file)
+        self.game = game
+
+    def persistent_load(self, pid):
+        if pid[0] == 'game':
+            return self.game
+        if pid[0] == 'player':
+            return self.game.get_player(pid[1])
+        return get_item(pid[1])
+
+
+# The game, handler, main report and attacks before combat, set once in each worker process
+_worker_combat: Optional[Tuple['Game', CombatHandler, Any, Set[Tuple['Player', 'Player']]]] = None
+
+
+def _start_combat_worker(game: 'Game', handler: CombatHandler, report,
+                         simplified_attack_to_defend: Set[Tuple['Player', 'Player']]):
+    global _worker_combat
+    from report import Report
+
+    Report.MAIN_REPORT = report
+    _worker_combat = (game, handler, report, simplified_attack_to_defend)
+
+
+def _resolve_group_in_worker(payload: Tuple[List[str], int]) -> bytes:
+    from actions import HandleSkill, Resurrect
+
+    names, seed = payload
+    game, handler, report, simplified_attack_to_defend = _worker_combat
+    group = frozenset(game.get_player(name) for name in names)
+    context = game.turn_context
+    # Death triggers of players outside the group are left to the main process, which knows how they fared
+    players = context.players
+    context.players = {player for player in players if player in group}
+    first_index = context.tic_index
+    tic_index = handler.tic_index
+    broadcasts = len(handler.broadcast_events)
+    report_dead = set(report.dead)
+    report_actions = len(report.actions)
+    report_broadcasts = len(report.broadcast_events)
+    context.actors_changed = False
+    game.rng.seed(seed)
+
+    combat_group = CombatGroup(handler, group, seed)
+    combat_group.resolve(simplified_attack_to_defend)
+    context.players = players | context.players
+
+    queued = sorted([action for action in context.queue.queue if action.idx >= first_index], key=lambda a: a.idx)
+    deaths = []
+    for dead in combat_group.dead_list:
+        if not dead.is_automata:
+            deaths.append((dead,
+                           [action for action in queued if isinstance(action, HandleSkill)
+                            and action.skill.trigger == Trigger.PLAYER_DIED and action.targets == [dead]],
+                           [action for action in queued if isinstance(action, Resurrect) and action.player == dead]))
+    claimed = {id(action) for _, triggers, resurrections in deaths for action in triggers + resurrections}
+    other_actions = [action for action in queued if id(action) not in claimed]
+
+    members = {field: _group_members(getattr(handler, field), group.__contains__) for field in COMBAT_GROUP_FIELDS}
+    members['hot_blood'] = _group_members(handler.hot_blood, set(names).__contains__)
+    members['escape'] = _group_members(handler.escape, lambda pair: pair[0] in group)
+    player_states = {player.name: {field: getattr(player, field) for field in COMBAT_PLAYER_FIELDS}
+                     for player in group}
+    for player in group:
+        player_states[player.name]['items'] = player.items.to_list()
+    descriptions = {player.name: player.action.public_description for player in group}
+    report_changes = ([player for player in report.dead if player not in report_dead],
+                      report.actions[report_actions:], report.broadcast_events[report_broadcasts:])
+
+    result = io.BytesIO()
+    _SharedPickler(result, game).dump((handler.tic_index - tic_index, handler.combat_group_to_events[group],
+                                       handler.combat_group_to_trace.get(group),
+                                       handler.broadcast_events[broadcasts:], members,
+                                       [edge for edge in handler.range_edges if edge[0] in group],
+                                       handler.info_once.get(group_key(group)), handler.wide_check,
+                                       player_states, descriptions, context.actors_changed, deaths, other_actions,
+                                       report_changes))
+    return result.getvalue()
+
+
+# Queues actions made elsewhere, numbered as if they were made now
+def _requeue(game: 'Game', actions: List[Any]):
+    for action in actions:
+        action.idx = game.turn_context.next_index()
+        if action.player:
+            game.turn_context.players.add(action.player)
+        game.turn_context.queue.put(action)
+
+
+# A copy of a set or dictionary with only the members in_group accepts
+def _group_members(container, in_group: Callable[[Any], bool]):
+    if isinstance(container, dict):
+        return {member: value for member, value in container.items() if in_group(member)}
+    return {member for member in container if in_group(member)}
+
+
+def _merge_members(target, source, in_group: Callable[[Any], bool]):
+    for member in [member for member in target if in_group(member)]:
+        if isinstance(target, dict):
+            del target[member]
+        else:
+            target.discard(member)
+    for member in source:
+        if in_group(member):
+            if isinstance(target, dict):
+                target[member] = source[member]
+            else:
+                target.add(member)
+
+
 def get_combat_handler() -> CombatHandler:
     if CombatHandler.REAL_HANDLER is None:
         CombatHandler.REAL_HANDLER = CombatHandler()
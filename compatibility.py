@@ -0,0 +1,108 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+from typing import Dict, List, Tuple
+
+import main
+from actions import Action
+from benchmark import get_snapshots, plan_turn
+from combat import get_combat_handler
+from report import get_main_report
+
+BASELINE_FILE = "compatibility_baseline.json"
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+# Lines about players in the same step are written in set order, which changes from run to run
+def _lines(report: str) -> List[str]:
+    return sorted(report.splitlines())
+
+
+# Runs a snapshot's next turn with the benchmark's scripted orders, fingerprinting the state, every report and the
+# random draws that follow
+def replay_snapshot(prefix: str, turn: int, night: bool, seed: int) -> Dict[str, str]:
+    get_main_report().reset()
+    get_combat_handler().reset()
+    main.load(prefix, turn, night)
+    game = main.GAME
+    game.advance()
+    plan_turn(random.Random(seed))
+    was_alive = sorted([player for player in game.players.values() if not player.is_dead()], key=lambda p: p.name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        Action.run_turn(game)
+    outputs = {'state': _digest(game.serialize()),
+               'reports': _digest({player.name: _lines(player.get_report()) for player in was_alive}),
+               'main': _digest(_lines(get_main_report().generate_report(game)))}
+    # Few saves reach the random abilities, so the game's next draws are compared directly
+    names = sorted(game.players)
+    outputs['random'] = _digest([game.random() for _ in range(3)] + [game.choice(names) for _ in range(3)])
+    return outputs
+
+
+# "Prefix/TurnNight Seed", as runs are named in the baseline
+def _parse_run(run: str) -> Tuple[str, int, bool, int]:
+    name, seed = run.rsplit(" ", 1)
+    prefix, snapshot = name.rsplit("/", 1)
+    return prefix, int(snapshot[:-1]), snapshot[-1] == 'n', int(seed)
+
+
+# Snapshot Seed: Output: Digest, for every snapshot that loads
+def record(prefixes: List[str], seeds: List[int]) -> Dict[str, Dict[str, str]]:
+    outputs: Dict[str, Dict[str, str]] = {}
+    for prefix in prefixes:
+        for turn, night in get_snapshots(prefix):
+            try:
+                main.load(prefix, turn, night)
+            except Exception:
+                # Older seasons were saved before some fields existed
+                continue
+            for seed in seeds:
+                outputs[f"{prefix}/{turn}{'n' if night else 'd'} {seed}"] = replay_snapshot(prefix, turn, night, seed)
+    return outputs
+
+
+# Replays every run in the baseline, returning Run: Problem for each one that no longer matches
+def check(baseline: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    differences: Dict[str, str] = {}
+    for run, expected in sorted(baseline.items()):
+        try:
+            outputs = replay_snapshot(*_parse_run(run))
+        except Exception as e:
+            differences[run] = f"{type(e).__name__}: {e}"
+            continue
+        changed = [output for output in expected if outputs.get(output) != expected[output]]
+        if changed:
+            differences[run] = f"{', '.join(changed)} changed"
+    return differences
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check that the archived saves still play out as recorded.")
+    parser.add_argument('prefixes', nargs='*', help="Seasons to record, every folder in save/ by default")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3], help="Seeds for the scripted orders")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="JSON file of the recorded outputs")
+    parser.add_argument('--record', action='store_true', help="Overwrite the baseline instead of checking it")
+    args = parser.parse_args()
+
+    if args.record:
+        recorded = record(args.prefixes or sorted(os.listdir("save")), args.seeds)
+        with open(args.baseline, 'w') as f:
+            json.dump(recorded, f, indent=4, sort_keys=True)
+        print(f"Recorded {len(recorded)} runs")
+    else:
+        with open(args.baseline, 'r') as f:
+            baseline_outputs = json.load(f)
+        found = check(baseline_outputs)
+        for difference_run, problem in found.items():
+            print(f"{difference_run}: {problem}")
+        print(f"{len(baseline_outputs) - len(found)} of {len(baseline_outputs)} runs match")
+        if found:
+            sys.exit(1)
@@ -1,30 +1,69 @@
 import json
 import random
-from typing import Tuple, List, TYPE_CHECKING, Dict, Optional
+from typing import Tuple, List, TYPE_CHECKING, Dict, Optional, Iterable
 import os
 
+from scoring import ScoringPolicy, get_scoring_policy
 from skill import get_skill
+from turn_context import TurnContext
 
 if TYPE_CHECKING:
     from player import Player
 
+# Turn, Night, Skill Pin, Source player name, target names
+EVENT = Tuple[int, bool, int, str, List[str]]
+
+
+# Scheduled events bucketed by the half turn they happen on
+class EventCalendar:
+    def __init__(self, events: Iterable[EVENT] = ()):
+        self.next_index = 0
+        # (Turn, Night): [(Insertion index, Event)]
+        self.calendar: Dict[Tuple[int, bool], List[Tuple[int, EVENT]]] = {}
+        for event in events:
+            self.add(event)
+
+    def add(self, event: EVENT):
+        key = (event[0], event[1])
+        if key not in self.calendar:
+            self.calendar[key] = []
+        self.calendar[key].append((self.next_index, event))
+        self.next_index += 1
+
+    # Removes and returns the events for the given half turn, in the order they were added
+    def pop_due(self, turn: int, night: bool) -> List[EVENT]:
+        return [event for _, event in self.calendar.pop((turn, night), [])]
+
+    # All events in the order they were added, as stored in the save files
+    def to_list(self) -> List[EVENT]:
+        return [event for _, event in sorted([indexed_event for bucket in self.calendar.values()
+                                              for indexed_event in bucket], key=lambda e: e[0])]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.calendar.values())
+
 
 class Game:
-    def __init__(self, turn=1, night=False):
-        self.seed = int(random.random() * 100000)
+    def __init__(self, turn=1, night=False, rng: Optional[random.Random] = None):
+        # Simulations share the generator of the game they copy, so they continue the same sequence
+        self.rng = rng if rng else random.Random()
+        self.seed = int(self.rng.random() * 100000)
         # Sets turn to one before provided, with the expectation that advance happens first
         self.turn = turn
         if not night:
             self.turn -= 1
         self.night = not night
-        # Turn, Night, Skill Pin, Source player name, target names
-        self.events: List[Tuple[int, bool, int, str, List[str]]] = []
+        self.events = EventCalendar()
         self.simulation = False
         self.turn_seed = 0
+        # Used to evaluate simulated outcomes, e.g. for fast attunement
+        self.scoring_policy: ScoringPolicy = get_scoring_policy()
 
         self.players: Dict[str, 'Player'] = {}
         self.automata: Dict[str, 'Player'] = {}
 
+        self.turn_context = TurnContext()
+
     def __str__(self):
         time_of_day = "Day"
         if self.night:
@@ -38,13 +77,15 @@ class Game:
         return f"{self.turn}{time_of_day}"
 
     def clone(self, complete: bool = False):
-        clone = Game()
+        clone = Game(rng=self.rng)
         clone.seed = self.seed
         clone.turn = self.turn
         clone.night = self.night
-        clone.events = []  # Todo if serializing
+        # Simulations never advance or save, so they don't need the scheduled events
+        clone.events = EventCalendar()
         clone.simulation = True
         clone.turn_seed = 0
+        clone.scoring_policy = self.scoring_policy
 
         if complete:
             clone.players = {c.name: c for c in [
@@ -55,7 +96,7 @@ class Game:
     def serialize(self) -> Dict:
         turn = {'turn': self.turn, 'night': self.night, 'seed': self.seed,
                 'remaining': [player.name for player in self.players.values() if not player.is_dead()],
-                'events': self.events,
+                'events': self.events.to_list(),
                 'players': {player_name: player.serialize() for (player_name, player) in self.players.items()},
                 'automata': {automata_name: automata.serialize() for (automata_name, automata) in
                              self.automata.items() if not automata.is_dead()}}
@@ -89,17 +130,17 @@ class Game:
         seed = self.turn * 2
         if self.night:
             seed += 1
-        random.seed(seed*10+self.turn_seed+self.seed)
+        self.rng.seed(seed*10+self.turn_seed+self.seed)
         self.turn_seed += 1
-        return random.random()
+        return self.rng.random()
 
     def choice(self, options):
         seed = self.turn * 2
         if self.night:
             seed += 1
-        random.seed(seed*10+self.turn_seed+self.seed)
+        self.rng.seed(seed*10+self.turn_seed+self.seed)
         self.turn_seed += 1
-        return random.choice(options)
+        return self.rng.choice(options)
 
     def advance(self):
         if self.night:
@@ -111,24 +152,18 @@ class Game:
         seed = self.turn * 2
         if self.night:
             seed += 1
-        random.seed(seed+self.seed)
-
-        handled: List[Tuple[int, bool, int, str, List[str]]] = []
-        for turn, night, skill_pin, source, targets in self.events:
-            if turn == self.turn:
-                if night == self.night:
-                    source_player = self.get_player(source)
-                    target_players = [self.get_player(target)
-                                      for target in targets if not self.get_player(target).is_dead()]
-                    if not source_player.is_dead():
-                        from actions import HandleSkill
-                        skill = get_skill(skill_pin)
-                        skill.targets = target_players
-                        HandleSkill.handle_noncombat_skill(
-                            self, source_player, skill)
-                    handled.append((turn, night, skill_pin, source, targets))
-        for handled_event in handled:
-            self.events.remove(handled_event)
+        self.rng.seed(seed+self.seed)
+
+        for turn, night, skill_pin, source, targets in self.events.pop_due(self.turn, self.night):
+            source_player = self.get_player(source)
+            target_players = [self.get_player(target)
+                              for target in targets if not self.get_player(target).is_dead()]
+            if not source_player.is_dead():
+                from actions import HandleSkill
+                skill = get_skill(skill_pin)
+                skill.targets = target_players
+                HandleSkill.handle_noncombat_skill(
+                    self, source_player, skill)
 
     def is_day(self):
         return not self.night
@@ -156,8 +191,8 @@ class Game:
             return
         if turn == self.turn and (self.night or not night):
             return
-        self.events.append((turn, night, skill_pin, source.name, [
-                           target.name for target in targets]))
+        self.events.add((turn, night, skill_pin, source.name, [
+                        target.name for target in targets]))
 
     def register(self, player: 'Player'):
         name_list = list(self.players.keys()) + list(self.automata.keys())
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import glob
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 
 from yaml import safe_load
 
 from ability import get_ability, get_ability_by_name
-from constants import ItemType
-from skill import Skill, get_skill
+from constants import ItemType, Effect
+from skill import Skill, get_skill, may_have_effect
 
 
 __item_dict = {}
+# Ability pin: Rune, populated as runes are first looked up
+__rune_dict: Dict[int, 'Rune'] = {}
+# Lower case rune name: Ability pin
+__rune_name_dict: Dict[str, int] = {}
 
 RUNE_INDEX = 10000
 
@@ -28,6 +32,8 @@ class Item:
         self.fragile = fragile  # Destroy if would be stolen
         self.stacking = stacking
         self.stuck = stuck  # Can't be traded
+        # Contributes to max willpower while held or consumed
+        self.grants_willpower = may_have_effect(skill_pins, Effect.MAX_WILLPOWER)
         self.destruction_message = "destroyed"
         if self.item_type in [ItemType.CONSUMABLE, ItemType.REACTIVE, ItemType.POTION]:
             self.destruction_message = "consumed"
@@ -45,6 +51,10 @@ class Item:
         except Exception as e:
             raise Exception(f"Failed to parse skills for Item {self.name} ({self.pin})") from e
 
+    # Loaded once and shared, copies of a game keep pointing at the same definitions
+    def __deepcopy__(self, memo):
+        return self
+
     def __str__(self):
         cost = self.cost
         if cost < 0:
@@ -59,6 +69,13 @@ class Rune(Item):
         name = f"{ability.name} Rune"
         super().__init__(pin, name=name, alt_name=name, cost=-2, skill_pins=[], item_type=ItemType.CONSUMABLE,
                          loot=True, fragile=False, stacking=False, stuck=False)
+        self.ability_name = ability.name
+        self.disruptive = bool(ability.geo_qualified_skills)
+        self.grants_willpower = ability.grants_willpower
+        root = ability
+        while root.get_prerequisite():
+            root = root.get_prerequisite()
+        self.simple = root.pin == get_ability_by_name("Circuit I").pin
 
     def get_skills(self, choice=-1, targets=None) -> List[Skill]:
         skills = get_ability(self.pin - RUNE_INDEX).get_skills_for_rune(choice=choice)
@@ -68,28 +85,29 @@ class Rune(Item):
         return skills
 
     def is_disruptive(self) -> bool:
-        if get_ability(self.pin - RUNE_INDEX).geo_qualified_skills:
-            return True
-        return False
+        return self.disruptive
 
     # Rune Crafting 1
     def is_simple_rune(self):
-        ability = get_ability(self.pin - RUNE_INDEX)
-        while ability.get_prerequisite():
-            ability = ability.get_prerequisite()
-        return ability.pin == get_ability_by_name("Circuit I").pin
+        return self.simple
 
     def get_ability_pin(self) -> int:
         return self.pin - RUNE_INDEX
 
     def get_ability_name(self) -> str:
-        return get_ability(self.pin - RUNE_INDEX).name
+        return self.ability_name
+
+
+def get_rune(ability_pin: int) -> Rune:
+    if ability_pin not in __rune_dict:
+        __rune_dict[ability_pin] = Rune(ability_pin + RUNE_INDEX)
+    return __rune_dict[ability_pin]
 
 
 def get_item(pin: int) -> Item:
     try:
         if pin > RUNE_INDEX:
-            return Rune(pin)
+            return get_rune(pin - RUNE_INDEX)
         return __item_dict[pin]
     except (Exception, KeyError):
         raise Exception(f"Item {pin} does not exist.")
@@ -97,13 +115,114 @@ def get_item(pin: int) -> Item:
 
 def get_item_by_name(name: str) -> Item:
     if name.lower().endswith(" rune"):
-        return Rune(get_ability_by_name(name.lower()[:-5]).pin+RUNE_INDEX)
+        if name.lower() not in __rune_name_dict:
+            __rune_name_dict[name.lower()] = get_ability_by_name(name.lower()[:-5]).pin
+        return get_rune(__rune_name_dict[name.lower()])
     for item in __item_dict.values():
         if item.name.lower() == name.lower() or item.alt_name.lower() == name.lower():
             return item
     raise Exception(f"Item {name} not found")
 
 
+# A player's items as pins in the order they were gained, with counts for each pin
+# Resolved items and the best weapon and armor are cached until the inventory changes
+class Inventory:
+    def __init__(self, pins: Iterable[int] = ()):
+        self.pins: List[int] = list(pins)
+        self.counts: Dict[int, int] = {}
+        # Total credit value, counting items that are not for sale at their absolute cost
+        self.value = 0
+        # Pin: Amount, of the items that can grant max willpower
+        self.willpower_counts: Dict[int, int] = {}
+        for pin in self.pins:
+            self.counts[pin] = self.counts.get(pin, 0) + 1
+            self.value += abs(get_item(pin).cost)
+            if get_item(pin).grants_willpower:
+                self.willpower_counts[pin] = self.willpower_counts.get(pin, 0) + 1
+        self._items: Optional[List[Item]] = None
+        self._unique_items: Optional[List[Item]] = None
+        self._equipment: Optional[Tuple[Optional[Item], Optional[Item]]] = None
+
+    def _changed(self):
+        self._items = None
+        self._unique_items = None
+        self._equipment = None
+
+    def append(self, pin: int):
+        self.pins.append(pin)
+        self.counts[pin] = self.counts.get(pin, 0) + 1
+        self.value += abs(get_item(pin).cost)
+        if get_item(pin).grants_willpower:
+            self.willpower_counts[pin] = self.willpower_counts.get(pin, 0) + 1
+        self._changed()
+
+    def remove(self, pin: int):
+        self.pins.remove(pin)
+        self.counts[pin] -= 1
+        if not self.counts[pin]:
+            del self.counts[pin]
+        self.value -= abs(get_item(pin).cost)
+        if pin in self.willpower_counts:
+            self.willpower_counts[pin] -= 1
+            if not self.willpower_counts[pin]:
+                del self.willpower_counts[pin]
+        self._changed()
+
+    def count(self, pin: int) -> int:
+        return self.counts.get(pin, 0)
+
+    def copy(self) -> 'Inventory':
+        return Inventory(self.pins)
+
+    def to_list(self) -> List[int]:
+        return self.pins[:]
+
+    def get_items(self, duplicates=True) -> List[Item]:
+        if self._items is None:
+            resolved = {pin: get_item(pin) for pin in self.counts}
+            self._items = [resolved[pin] for pin in self.pins]
+            self._unique_items = [resolved[pin] for pin in set(self.pins)]
+        if duplicates:
+            return self._items[:]
+        return self._unique_items[:]
+
+    # Most expensive weapon and armor
+    def get_equipment(self) -> Tuple[Optional[Item], Optional[Item]]:
+        if self._equipment is None:
+            weapon: Optional[Item] = None
+            weapon_cost = -100
+            armor: Optional[Item] = None
+            armor_cost = -100
+            for item in self.get_items(duplicates=False):
+                if item.item_type == ItemType.WEAPON:
+                    if abs(item.cost) > weapon_cost:
+                        weapon = item
+                        weapon_cost = abs(item.cost)
+                elif item.item_type == ItemType.ARMOR:
+                    if item.cost > armor_cost:
+                        armor = item
+                        armor_cost = item.cost
+            self._equipment = (weapon, armor)
+        return self._equipment
+
+    def __contains__(self, pin: int) -> bool:
+        return pin in self.counts
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.pins)
+
+    def __len__(self) -> int:
+        return len(self.pins)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Inventory):
+            return self.pins == other.pins
+        return self.pins == other
+
+    def __repr__(self):
+        return repr(self.pins)
+
+
 def __parse_item(pin: int, dictionary: Dict) -> Item:
     for key in dictionary.keys():
         assert key in ['name', 'alt_name', 'cost', 'stuck',
@@ -2,10 +2,11 @@ import json
 import random
 
 import combat
+from ability import get_ability, get_prerequisite_chain
 from actions import *
 from automata import Automata
 from constants import Temperament, Condition, NEGATIVE_CONDITIONS
-from game import Game
+from game import Game, EventCalendar
 from items import get_item_by_name
 from player import Player
 from report import get_main_report
@@ -38,15 +39,14 @@ def create_player(name: str, abilities=None, items=None,
         for skill in ability.get_skills([], [], choice=0):
             if skill.effect == Effect.MAX_WILLPOWER:
                 willpower += skill.value
-        if ability.pin in [306, 307]:
-            continue
-        prereq = ability.get_prerequisite()
-        while prereq and prereq.pin not in devs:
-            devs[prereq.pin] = prereq.cost
+        for prereq_pin in get_prerequisite_chain(ability.pin):
+            if prereq_pin in devs:
+                break
+            prereq = get_ability(prereq_pin)
+            devs[prereq_pin] = prereq.cost
             for skill in prereq.get_skills([], [], choice=0):
                 if skill.effect == Effect.MAX_WILLPOWER:
                     willpower += skill.value
-            prereq = prereq.get_prerequisite()
 
     for ability_name, points in partial_dev.items():
         ability = get_ability_by_name(ability_name)
@@ -96,7 +96,7 @@ def load(file_prefix: str, turn: int = None, night: bool = None):
     GAME = Game()
     GAME.turn = data['turn']
     GAME.night = data['night']
-    GAME.events = [tuple(event) for event in data['events']]
+    GAME.events = EventCalendar(tuple(event) for event in data['events'])
     GAME.seed = data['seed']
 
     for player_name, player_data in data['players'].items():
@@ -0,0 +1,131 @@
+import inspect
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from yaml import safe_load
+
+import actions
+from action_index import ActionIndex
+from constants import Element
+
+if TYPE_CHECKING:
+    from game import Game
+    from player import Player
+
+# Orders that aren't named plan_<order>
+EXTRA_ORDERS = {'set_dev_plan', 'disable_ability'}
+# Orders that need objects an orders file can't describe
+UNSUPPORTED_ORDERS = {'fake_action', 'illusion'}
+
+# Parameters given as player names
+PLAYER_PARAMETERS = {'target', 'targets', 'player'}
+
+
+# Reads a turn's orders from a YAML or JSON file and plans them, in the order they are written
+# Every player (or automaton) has a list of orders, each a plan method without the plan_ prefix, e.g.
+# hotmonkey1:
+#   - consume_item: [Fire Potion, Earth Potion]
+#   - attack: Megaolix
+#   - trade: {target: Megaolix, money: 5, item_names: [Bokken]}
+#   - shop: {args: [Automata], automata_name: Bob}
+#   - train
+# A single value or list is passed positionally, a mapping by keyword with its args passed positionally
+# Players are named wherever a plan method takes players, trade conditions name the action, e.g. [Megaolix, Attack]
+# Returns Name: Problems, for every order that was refused and every conflict between the orders that were planned
+# Refused orders aren't undone, e.g. consume_item may have queued some of its items before failing on the next one,
+# so when any problems come back the game must be loaded again before the fixed orders are retried
+def load_orders(game: 'Game', file_name: str) -> Dict[str, List[str]]:
+    with open(file_name) as file:
+        orders = safe_load(file) or {}
+    return plan_orders(game, orders)
+
+
+def plan_orders(game: 'Game', orders: Dict[str, List[Any]]) -> Dict[str, List[str]]:
+    errors: Dict[str, List[str]] = {}
+    for name, player_orders in orders.items():
+        try:
+            player = game.get_player(name)
+        except Exception as e:
+            errors.setdefault(name, []).append(str(e))
+            continue
+        for order in player_orders or []:
+            try:
+                _plan_order(game, player, order)
+            except Exception as e:
+                errors.setdefault(name, []).append(f"{_describe(order)}: {e}")
+
+    for name, conflicts in ActionIndex(game).get_conflicts().items():
+        errors.setdefault(name, []).extend(conflicts)
+    return errors
+
+
+def _plan_order(game: 'Game', player: 'Player', order: Any):
+    if isinstance(order, str):
+        order = {order: None}
+    if not isinstance(order, dict) or len(order) != 1:
+        raise Exception(f"An order must name a single plan, not {order}.")
+    order_name, arguments = next(iter(order.items()))
+    if order_name in UNSUPPORTED_ORDERS:
+        raise Exception(f"{order_name} can't be given in an orders file.")
+    method_name = order_name if order_name in EXTRA_ORDERS else f"plan_{order_name}"
+    if not hasattr(player, method_name):
+        raise Exception(f"Unknown order {order_name}.")
+    method = getattr(player, method_name)
+
+    if arguments is None:
+        args, kwargs = [], {}
+    elif isinstance(arguments, dict):
+        kwargs = dict(arguments)
+        args = kwargs.pop('args', [])
+        if not isinstance(args, list):
+            args = [args]
+    elif isinstance(arguments, list):
+        args, kwargs = arguments, {}
+    else:
+        args, kwargs = [arguments], {}
+
+    try:
+        bound = inspect.signature(method).bind(*args, **kwargs)
+    except TypeError as e:
+        raise Exception(f"Wrong arguments for {order_name} ({e}).")
+    for parameter, value in bound.arguments.items():
+        bound.arguments[parameter] = _convert(game, parameter, value)
+    method(*bound.args, **bound.kwargs)
+
+
+def _convert(game: 'Game', parameter: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if parameter in PLAYER_PARAMETERS:
+        if isinstance(value, (list, tuple)):
+            return type(value)(game.get_player(name) for name in value)
+        return game.get_player(value)
+    if parameter == 'elements':
+        for element in value:
+            if element.upper() not in Element.__members__:
+                raise Exception(f"Unknown element {element}.")
+        return tuple(Element[element.upper()] for element in value)
+    if parameter == 'action_condition':
+        return _action_condition(game, value)
+    if parameter == 'item_name_condition':
+        return (game.get_player(value[0]), value[1], value[2])
+    return value
+
+
+# [Player, Action, (Target), (Required)]
+def _action_condition(game: 'Game', value: List[Any]) -> Tuple:
+    action = getattr(actions, value[1], None)
+    if not isinstance(action, type) or not issubclass(action, actions.Action):
+        raise Exception(f"Unknown action {value[1]}.")
+    condition = [game.get_player(value[0]), action]
+    if len(value) > 2:
+        condition.append(game.get_player(value[2]) if value[2] is not None else None)
+    if len(value) > 3:
+        condition.append(bool(value[3]))
+    return tuple(condition)
+
+
+def _describe(order: Any) -> str:
+    if isinstance(order, dict) and len(order) == 1:
+        order_name, arguments = next(iter(order.items()))
+        return f"{order_name} {arguments}" if arguments is not None else str(order_name)
+    return str(order)
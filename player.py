@@ -2,14 +2,15 @@ import itertools
 import os
 from typing import Dict, List, NoReturn, Optional, Set, Tuple, Type, Union, Iterable, TYPE_CHECKING
 
-from ability import get_ability, Ability, get_ability_by_name
+from ability import get_ability, Ability, get_ability_by_name, is_unlocked_by
 from actions import Action, Wander, Class, Train, Bunker, Attack, ConsumeItem, Doctor, Teach, Learn, Heal, Shop, \
     ITEM_CONDITION, Trade, ACTION_CONDITION, Disguise, Spy, Blackmail, Taunt, Steal, Attune, Craft, Tattoo, Canvas, \
     MultiAttack, UseHydro, Resurrect, Illusion, MasterIllusion, PlaceBounty, HandleSkill, SendMessage
 from combat import get_combat_handler
-from constants import Temperament, Condition, ItemType, InjuryModifier, InfoScope, COMBAT_PLACEHOLDER, Element, Trigger
+from constants import Temperament, Condition, ItemType, InjuryModifier, InfoScope, COMBAT_PLACEHOLDER, Element, \
+    Trigger, Effect
 from game import Game
-from items import Item, get_item, get_item_by_name, Rune
+from items import Item, get_item, get_item_by_name, Rune, Inventory
 from report import ReportCallable, get_main_report
 from skill import Skill
 
@@ -26,7 +27,6 @@ DIMENSIONAL_KEY = get_item_by_name("Dimensional Key").pin
 
 CONCEPT_I = get_ability_by_name("Dummy Concept I").pin
 LEGACY_MAGIC = get_ability_by_name("Legacy Magic").pin
-REALITY_IMPOSITION = get_ability_by_name("Reality Imposition").pin
 
 CONSUME_PREFER = {MEDKIT: DEPLETED_MEDKIT}
 
@@ -43,10 +43,16 @@ class Player:
 
         self.name = name
         self.progress_dict = progress_dict
+        # Derived stats, kept up to date as progress is gained or lost
+        self._total_dev = sum(progress_dict.values())
+        # Learned abilities that can grant max willpower, kept up to date as abilities are gained
+        self._willpower_ability_pins: List[int] = [
+            pin for (pin, progress) in progress_dict.items()
+            if progress >= get_ability(pin).cost and get_ability(pin).grants_willpower]
         self.academics = academics
         self.temperaments = temperaments
         self.concept = concept.upper() if concept else None
-        self.items = items
+        self.items = Inventory(items)
         self.conditions = conditions
         self.credits = money
         self.willpower = willpower
@@ -65,14 +71,14 @@ class Player:
 
         aeromancer = set()
 
-        complete_ability_pins = [None]
+        complete_ability_pins = set()
         for (ability_pin, progress) in progress_dict.items():
             ability = get_ability(ability_pin)
             if progress < 0 or progress > ability.cost:
                 raise Exception(f"Player {name} has an illegal progress value "
                                 f"{progress} for {ability.name} ({ability_pin})")
             if progress == ability.cost:
-                complete_ability_pins.append(ability_pin)
+                complete_ability_pins.add(ability_pin)
                 if ability.concept:
                     aeromancer.add(ability.concept.upper())
                 if self.game.turn <= 0:
@@ -82,22 +88,12 @@ class Player:
 
         for (ability_pin, progress) in progress_dict.items():
             ability = get_ability(ability_pin)
-            if progress > 0:
-                if ability_pin == LEGACY_MAGIC:
-                    legacy_prereqs = [
-                        pin for pin in complete_ability_pins if pin in range(601, 10001, 100)]
-                    if not len(legacy_prereqs):
-                        raise Exception(f"Player {name} is missing prerequisite "
-                                        f"for ability {ability.name}")
-                elif ability_pin == REALITY_IMPOSITION:
-                    legacy_prereqs = [
-                        pin for pin in complete_ability_pins if pin in range(603, 10003, 100)]
-                    if not len(legacy_prereqs):
-                        raise Exception(f"Player {name} is missing prerequisite "
-                                        f"for ability {ability.name}")
-                elif ability.prerequisite_pin not in complete_ability_pins:
+            if progress > 0 and not is_unlocked_by(ability_pin, complete_ability_pins):
+                if ability.prerequisite:
                     raise Exception(f"Player {name} is missing prerequisite "
-                                    f"for ability {ability.name} ({ability.get_prerequisite().name})")
+                                    f"for ability {ability.name} ({ability.prerequisite.name})")
+                raise Exception(f"Player {name} is missing prerequisite "
+                                f"for ability {ability.name}")
 
         assert len(aeromancer) <= 1 or 'X' in aeromancer
         if not self.concept and len(aeromancer):
@@ -186,7 +182,7 @@ class Player:
     def serialize(self) -> Dict:
         serialized = {'name': self.name, 'progress_dict': self.progress_dict.copy(), 'dev_plan': self.dev_plan[:],
                       'academics': self.academics, 'temperaments': self.temperaments[:], 'concept': self.concept,
-                      'conditions': self.conditions[:], 'items': self.items, 'money': self.credits,
+                      'conditions': self.conditions[:], 'items': self.items.to_list(), 'money': self.credits,
                       'willpower': self.willpower, 'bounty': self.bounty,
                       'relative_conditions': {k: v[:] for k, v in self.relative_conditions.items()},
                       'tattoo': self.tattoo, 'crafted_before': self.crafted_before}
@@ -194,21 +190,7 @@ class Player:
 
     # Used for evaluating simulations
     def get_score(self) -> int:
-        score = 0
-        if self.is_dead():  # Explicitly unaware of resurrection, for better or worse
-            score -= 100000000
-        if self.has_condition(Condition.PETRIFIED):
-            score -= 100
-        if self.has_condition(Condition.CAUTERIZED):
-            score -= 1000
-        if self.has_condition(Condition.GRIEVOUS):
-            score -= 100
-        if self.has_condition(Condition.INJURED):
-            score -= 10
-        score += self.academics * 1000
-        score += self.get_total_credit_value() * 2
-        score += self.get_total_dev()
-        return score
+        return self.game.scoring_policy.score(self)
 
     def get_report(self):
         if get_main_report().aero_broadcast and self.has_condition(Condition.INTUITION):
@@ -235,7 +217,7 @@ class Player:
         if (self.game.is_day() or self.has_condition(Condition.NIGHT_LIGHT)) and self.has_ability("Awareness II"):
             training_count = 0
             training_report = "You are Aware:" + os.linesep
-            for trainer in sorted(get_main_report().training.keys(), key=lambda x: x.name.upper()):
+            for trainer in get_main_report().get_trainers():
                 hidden = False
                 if trainer != self:
                     trained = get_main_report().training[trainer]
@@ -360,28 +342,18 @@ class Player:
                 raise Exception(
                     f"Player {name} already has dev plan ability {ability.name}")
 
-            if ability_pin == LEGACY_MAGIC:
-                legacy_prereqs = [
-                    pin for pin in complete_ability_pins if pin in range(601, 10001, 100)]
-                if not len(legacy_prereqs):
-                    raise Exception(f"Player {name} is missing prerequisite "
-                                    f"for ability {ability.name}")
-            elif ability_pin == REALITY_IMPOSITION:
-                legacy_prereqs = [
-                    pin for pin in complete_ability_pins if pin in range(603, 10003, 100)]
-                if not len(legacy_prereqs):
+            if not is_unlocked_by(ability_pin, complete_ability_pins):
+                if ability.prerequisite:
                     raise Exception(f"Player {name} is missing prerequisite "
-                                    f"for ability {ability.name}")
-            elif ability.prerequisite_pin and ability.prerequisite_pin not in complete_ability_pins:
+                                    f"for dev plan ability {ability.name} ({ability.prerequisite.name})")
                 raise Exception(f"Player {name} is missing prerequisite "
-                                f"for dev plan ability {ability.name} ({ability.get_prerequisite().name})")
-            complete_ability_pins.append(ability_pin)
+                                f"for ability {ability.name}")
+            complete_ability_pins.add(ability_pin)
 
     def set_dev_plan(self, *ability_names: str):
         self.dev_plan = [get_ability_by_name(
             ability).pin for ability in ability_names]
-        complete_ability_pins = [
-            ability.pin for ability in self.get_abilities()]
+        complete_ability_pins = set(ability.pin for ability in self.get_abilities())
         self._validate_dev_plan(
             self.dev_plan, complete_ability_pins, self.name)
 
@@ -805,10 +777,7 @@ class Player:
         return abilities
 
     def get_total_dev(self) -> int:
-        total = 0
-        for (ability_pin, progress) in self.progress_dict.items():
-            total += progress
-        return total
+        return self._total_dev
 
     def _check_attunement(self, attunement: Tuple[Element, ...]) -> bool:
         total_circuits = (self.conditions +
@@ -889,45 +858,25 @@ class Player:
         return all_possibilities
 
     def get_items(self, duplicates=True) -> List[Item]:
-        if duplicates:
-            return [get_item(pin) for pin in self.items]
-        item_set = set(self.items)
-        return [get_item(pin) for pin in item_set]
+        return self.items.get_items(duplicates)
 
     def get_items_display(self) -> Dict[str, int]:
-        sorted_items = sorted(set(self.items), key=lambda x: get_item(x).cost)
-        return [(get_item(pin).name, self.items.count(pin)) for pin in sorted_items] + [("Credits", self.credits)]
+        sorted_items = sorted(self.get_items(duplicates=False), key=lambda x: x.cost)
+        return [(item.name, self.items.count(item.pin)) for item in sorted_items] + [("Credits", self.credits)]
 
     def get_total_credit_value(self) -> int:
-        total = self.credits
-        for item in self.get_items():
-            total += abs(item.cost)
-        return total
+        return self.credits + self.items.value
 
     def get_consumed_items(self) -> List[Item]:
         return [get_item(pin) for pin in self.consumed_items]
 
     def get_held_weapon(self) -> Optional[Item]:
         # Get the most expensive item
-        best: Optional[Item] = None
-        cost = -100
-        for item in self.get_items(False):
-            if item.item_type == ItemType.WEAPON:
-                if abs(item.cost) > cost:
-                    best = item
-                    cost = abs(item.cost)
-        return best
+        return self.items.get_equipment()[0]
 
     def get_worn_armor(self) -> Optional[Item]:
         # Get the most expensive item
-        best: Optional[Item] = None
-        cost = -100
-        for item in self.get_items(False):
-            if item.item_type == ItemType.ARMOR:
-                if item.cost > cost:
-                    best = item
-                    cost = item.cost
-        return best
+        return self.items.get_equipment()[1]
 
     def _get_non_consumable_item_skills(self) -> List[Skill]:
         skills = []
@@ -939,6 +888,24 @@ class Player:
                 skills += item.get_skills()
         return skills
 
+    # Total of the MAX_WILLPOWER skills in get_skills(include_this_turn=True)
+    # The abilities and items that can grant any are tracked as they are gained and lost, only those are expanded
+    def get_max_willpower(self) -> int:
+        skills = []
+        for ability_pin in self._willpower_ability_pins:
+            if ability_pin not in self.disabled_ability_pins:
+                skills += get_ability(ability_pin).get_skills(self.circuits, self.hydro_spells.get(ability_pin, []),
+                                                              choice=self.ability_choices.get(ability_pin, -1))
+        for (item_pin, amount) in self.items.willpower_counts.items():
+            item = get_item(item_pin)
+            if item.item_type not in [ItemType.CONSUMABLE, ItemType.POTION]:
+                skills += item.get_skills() * (amount if item.stacking else 1)
+        for item in self.get_consumed_items():
+            if item.grants_willpower and item.pin != DIMENSIONAL_KEY:
+                skills += item.get_skills(choice=self.item_choices.get(item.pin, -1))
+        skills += self.temporary_skills
+        return sum(skill.value for skill in skills if skill.effect == Effect.MAX_WILLPOWER)
+
     def get_skills(self, include_this_turn: bool = False) -> List[Skill]:
         skills = []
         for ability in self.get_abilities(include_this_turn):
@@ -969,19 +936,6 @@ class Player:
         possible = [e for e in Temperament if e is not (self.temperaments[0] if len(self.temperaments) > 0 else None) and e is not Temperament.PSYCHO]
         return possible[h % len(possible)].name
 
-    def has_prerequisite(self, ability: Ability) -> bool:
-        if ability.pin == 307:
-            for ability_pin in self.progress_dict.keys():
-                if ability_pin >= 600:
-                    if ability_pin % 100 == 3:
-                        if self.has_ability(get_ability(ability_pin).name, strict=True):
-                            return True
-            return False
-        prerequisite = ability.get_prerequisite()
-        if not prerequisite:
-            return True
-        return self.has_ability(prerequisite.name, strict=True)
-
     def has_condition(self, condition: Condition) -> bool:
         return condition in (self.conditions + self.turn_conditions + self.tentative_conditions)
 
@@ -1019,10 +973,7 @@ class Player:
         return results_map
 
     def total_progress(self) -> int:
-        total = 0
-        for progress in self.progress_dict.values():
-            total += progress
-        return total
+        return self._total_dev
 
     def gain_progress(self, progress: int) -> NoReturn:
         if self.is_dead():
@@ -1047,13 +998,17 @@ class Player:
                 if ability_pin not in self.progress_dict:
                     self.progress_dict[ability_pin] = 0
                 self.progress_dict[ability_pin] += progress
+                self._total_dev += progress
 
                 self.report += f'{ability.name} ({self.progress_dict[ability_pin]}/{ability.cost}){os.linesep}'
                 progress = 0
 
     def gain_ability(self, ability: Ability) -> NoReturn:
         self.report += f'You have gained {ability.name}{os.linesep}'
+        self._total_dev += ability.cost - self.progress_dict.get(ability.pin, 0)
         self.progress_dict[ability.pin] = ability.cost
+        if ability.grants_willpower and ability.pin not in self._willpower_ability_pins:
+            self._willpower_ability_pins.append(ability.pin)
         self.abilities_gained_this_turn.append(ability.pin)
         if ability.pin in self.dev_plan:
             self.dev_plan.remove(ability.pin)
@@ -1062,10 +1017,12 @@ class Player:
                 HandleSkill(self.game, self, skill)
 
     def copycat(self, target: 'Player', fake: 'bool' = False) -> NoReturn:
+        complete_ability_pins = set(ability.pin for ability in self.get_abilities(include_this_turn=True))
+        prerequisite_pins = complete_ability_pins.difference(self.abilities_gained_this_turn)
         available_abilities = [ability for ability in target.get_abilities()
                                if ability.is_copyable() and
-                               not self.has_ability(ability.name, strict=True, ignore_this_turn=False) and
-                               self.has_prerequisite(ability)]
+                               ability.pin not in complete_ability_pins and
+                               is_unlocked_by(ability.pin, prerequisite_pins)]
         available_abilities.sort()
         if not fake and available_abilities:
             self.gain_ability(available_abilities[0])
@@ -1090,6 +1047,7 @@ class Player:
             self.report += message_if_destroyed + os.linesep
             self.report += f"You have lost {self.progress_dict[sabotaged.pin]} progress towards {sabotaged.name}." \
                            + os.linesep
+            self._total_dev -= self.progress_dict[sabotaged.pin]
             self.progress_dict[sabotaged.pin] = 0
 
     def _non_combat_report_callable(self) -> ReportCallable:
@@ -1116,6 +1074,7 @@ class Player:
                     reporting_func(f"{self.name} stubbornly clung to life.", InfoScope.PUBLIC)
                     return
         self.conditions.append(Condition.DEAD)
+        self.game.turn_context.invalidate_actors()
         Action.handle_death_triggers(self.game, self)
         if self.has_condition(Condition.RESURRECT):
             Resurrect(self.game, self, self.has_condition(
@@ -1216,6 +1175,7 @@ class Player:
             timer = 1
         while self.conditions.count(Condition.PETRIFIED) < timer:
             self.conditions.append(Condition.PETRIFIED)
+        self.game.turn_context.invalidate_actors()
 
     # Returns true if still injured
     def heal(self) -> bool:
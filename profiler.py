@@ -0,0 +1,60 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Opt-in timing of turn resolution
+# Call enable_profiling() before Action.run_turn, then print table() or save_trace() for chrome://tracing
+class Profiler:
+    def __init__(self):
+        self.start = time.perf_counter()
+        # (Category, Name): [Calls, Total Seconds]
+        self.totals: Dict[Tuple[str, str], List[float]] = {}
+        # Complete events in the Trace Event Format
+        self.trace: List[Dict] = []
+
+    def record(self, category: str, name: str, start: float, duration: float):
+        key = (category, name)
+        if key not in self.totals:
+            self.totals[key] = [0, 0.0]
+        self.totals[key][0] += 1
+        self.totals[key][1] += duration
+        self.trace.append({'name': name, 'cat': category, 'ph': 'X', 'pid': 0, 'tid': 0,
+                           'ts': (start - self.start) * 1000000, 'dur': duration * 1000000})
+
+    def table(self, category: Optional[str] = None) -> str:
+        rows = sorted([(total, calls, key) for key, (calls, total) in self.totals.items()
+                       if category is None or key[0] == category], reverse=True)
+        name_width = max([len(key[1]) for _, _, key in rows] + [4])
+        category_width = max([len(key[0]) for _, _, key in rows] + [8])
+        table = f"{'Category':<{category_width}}  {'Name':<{name_width}}  {'Calls':>8}  " \
+                f"{'Total ms':>10}  {'Mean ms':>9}" + os.linesep
+        for total, calls, (row_category, name) in rows:
+            table += f"{row_category:<{category_width}}  {name:<{name_width}}  {int(calls):>8}  " \
+                     f"{total * 1000:>10.2f}  {total * 1000 / calls:>9.3f}" + os.linesep
+        return table
+
+    def save_trace(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace, 'displayTimeUnit': 'ms'}, f)
+
+
+__profiler: Optional[Profiler] = None
+
+
+def enable_profiling() -> Profiler:
+    global __profiler
+    __profiler = Profiler()
+    return __profiler
+
+
+def disable_profiling() -> Optional[Profiler]:
+    global __profiler
+    profiler = __profiler
+    __profiler = None
+    return profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return __profiler
@@ -23,12 +23,17 @@ class Report(object):
 
     def __init__(self):
         self.actions: List[Tuple['Player', str, bool, bool, Optional['Player']]] = []
+        # Name: Their entries in actions, in the same order
+        self.actions_by_player: Dict[str, List[Tuple['Player', str, bool, bool, Optional['Player']]]] = {}
         self.broadcast_events: List[Tuple[str, bool]] = []
         self.aero_broadcast: bool = False
         self.dead: Set['Player'] = set()
         self.petrified: Set['Player'] = set()
         self.face_mask: Dict[str, str] = {}
         self.training: Dict['Player', str] = {}
+        # Players in training, sorted by name when first asked for after someone new trained
+        self.trainers: List['Player'] = []
+        self.trainers_sorted = True
         self.circuits: Dict['Player', Tuple[Element, ...]] = {}
         self.willpower: Dict['Player', int] = {}
         self.shop: List[Tuple['Player', int, Dict['Item', int], List[str]]] = []
@@ -39,12 +44,15 @@ class Report(object):
 
     def reset(self):
         self.actions.clear()
+        self.actions_by_player.clear()
         self.broadcast_events.clear()
         self.aero_broadcast = False
         self.dead.clear()
         self.petrified.clear()
         self.face_mask.clear()
         self.training.clear()
+        self.trainers.clear()
+        self.trainers_sorted = True
         self.circuits.clear()
         self.willpower.clear()
         self.shop.clear()
@@ -57,14 +65,16 @@ class Report(object):
                    fake: bool = False, hidden: bool = False,
                    aero: Optional['Player'] = None) -> NoReturn:
         if player not in self.hiding:
-            self.actions.append((player, content, fake, hidden, aero))
+            action = (player, content, fake, hidden, aero)
         else:
-            self.actions.append((player, content, fake, True, aero))
+            action = (player, content, fake, True, aero)
+        self.actions.append(action)
+        self.actions_by_player.setdefault(player.name, []).append(action)
 
     def add_action_if_not_duplicate(self, player: "Player", content: str,
                    fake: bool = False, hidden: bool = False,
                    aero: Optional['Player'] = None) -> NoReturn:
-        if (player, content, fake, hidden, aero) not in self.actions:
+        if (player, content, fake, hidden, aero) not in self.actions_by_player.get(player.name, []):
             self.add_action(player, content, fake, hidden, aero)
 
     def add_petrification(self, player: "Player"):
@@ -101,8 +111,18 @@ class Report(object):
             self.aero_broadcast = True
 
     def set_training(self, player: 'Player', ability: str):
+        if player not in self.training:
+            self.trainers.append(player)
+            self.trainers_sorted = False
         self.training[player] = ability
 
+    # Everyone who trained, in the order Awareness lists them
+    def get_trainers(self) -> List['Player']:
+        if not self.trainers_sorted:
+            self.trainers.sort(key=lambda p: p.name.upper())
+            self.trainers_sorted = True
+        return self.trainers
+
     def mark_hiding(self, player: 'Player'):
         self.hiding.add(player)
 
@@ -163,8 +183,8 @@ class Report(object):
             if counter_int:
                 report += target.fake_action.public_description + os.linesep
             else:
-                for (player, content, fake, hidden, aero) in self.actions:
-                    if player.name == target.name and not hidden:
+                for (player, content, fake, hidden, aero) in self.actions_by_player.get(target.name, []):
+                    if not hidden:
                         if not aero or spy.has_condition(Condition.INTUITION):
                             report += self.face_mask_replacement(content, spy.name) + os.linesep
 
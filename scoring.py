@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from constants import Condition, Element
+
+try:
+    import numpy
+except ImportError:  # Optional, batches are scored in pure Python without it
+    numpy = None
+
+if TYPE_CHECKING:
+    from player import Player
+
+K = TypeVar('K')
+
+ScoreState = Tuple[int, ...]
+
+# Field: Reads it from a player
+STATE_FIELDS: Dict[str, Callable[['Player'], int]] = {
+    'dead': lambda player: int(player.is_dead()),  # Explicitly unaware of resurrection, for better or worse
+    'petrified': lambda player: int(player.has_condition(Condition.PETRIFIED)),
+    'cauterized': lambda player: int(player.has_condition(Condition.CAUTERIZED)),
+    'grievous': lambda player: int(player.has_condition(Condition.GRIEVOUS)),
+    'injured': lambda player: int(player.has_condition(Condition.INJURED)),
+    'academics': lambda player: player.academics,
+    'credit_value': lambda player: player.get_total_credit_value(),
+    'total_dev': lambda player: player.get_total_dev(),
+}
+
+
+# Weighs the state of each player after a simulation
+# Only the fields a policy reads are taken from the simulated players, as one row of a state table
+class ScoringPolicy:
+    def __init__(self, name: str, weights: Dict[str, int]):
+        for field in weights:
+            assert field in STATE_FIELDS, f"Scoring policy {name}: unknown field {field}"
+        self.name = name
+        self.fields = tuple(weights)
+        self.weights = tuple(weights.values())
+        self._getters = tuple(STATE_FIELDS[field] for field in self.fields)
+
+    # Policies are pickled by name, e.g. when a game is sent to a worker process
+    def __reduce__(self):
+        return get_scoring_policy, (self.name,)
+
+    def get_state(self, player: 'Player') -> ScoreState:
+        return tuple(getter(player) for getter in self._getters)
+
+    def score_state(self, state: ScoreState) -> int:
+        score = 0
+        for weight, value in zip(self.weights, state):
+            score += weight * value
+        return score
+
+    def score(self, player: 'Player') -> int:
+        return self.score_state(self.get_state(player))
+
+    def score_states(self, states: Sequence[ScoreState]) -> List[int]:
+        if numpy is None or not states:
+            return [self.score_state(state) for state in states]
+        table = numpy.array(states, dtype=numpy.int64)
+        return (table @ numpy.array(self.weights, dtype=numpy.int64)).tolist()
+
+    # Scores many simulated outcomes in a single batch, keeping the shape of each outcome
+    def score_outcomes(self, outcomes: Sequence[Dict[K, ScoreState]]) -> List[Dict[K, int]]:
+        scores = iter(self.score_states([state for outcome in outcomes for state in outcome.values()]))
+        return [{key: next(scores) for key in outcome} for outcome in outcomes]
+
+    # Compared between attunements during the fast attune search, the greatest is chosen
+    # Personal score, negative score of others, contains gold, size attuned
+    def rank_attunement(self, player: 'Player', attunement: Tuple[Element, ...],
+                        scores: Dict['Player', int]) -> Tuple:
+        secondary = 0
+        for sim_player, score in scores.items():
+            if sim_player.is_automata and sim_player.owner == player.name:
+                secondary += score
+            elif player.name != sim_player.name:
+                secondary -= score
+        return (scores[player],
+                secondary,
+                Element.GOLD in attunement,
+                -1 * len(attunement))
+
+
+# Mean of each field for every one of GROUPS interleaved groups of states, e.g. one state per player per sample
+def mean_states(states: Sequence[Tuple[int, ...]], groups: int) -> List[Tuple[float, ...]]:
+    if not states:
+        return [() for _ in range(groups)]
+    assert len(states) % groups == 0, f"{len(states)} states can't be split into {groups} groups"
+    if numpy is None:
+        samples = len(states) // groups
+        return [tuple(sum(column) / samples for column in zip(*states[group::groups])) for group in range(groups)]
+    table = numpy.array(states, dtype=numpy.float64).reshape(-1, groups, len(states[0]))
+    return [tuple(row) for row in table.mean(axis=0).tolist()]
+
+
+__policy_dict: Dict[str, ScoringPolicy] = {}
+
+DEFAULT_POLICY = "default"
+
+
+def register_scoring_policy(policy: ScoringPolicy):
+    if policy.name in __policy_dict:
+        raise Exception(f"Scoring policy {policy.name} is already registered.")
+    __policy_dict[policy.name] = policy
+
+
+def get_scoring_policy(name: Optional[str] = None) -> ScoringPolicy:
+    try:
+        return __policy_dict[name or DEFAULT_POLICY]
+    except KeyError:
+        raise Exception(f"Scoring policy {name} does not exist.")
+
+
+def get_scoring_policy_names() -> List[str]:
+    return list(__policy_dict)
+
+
+register_scoring_policy(ScoringPolicy(DEFAULT_POLICY, {'dead': -100000000, 'petrified': -100, 'cauterized': -1000,
+                                                       'grievous': -100, 'injured': -10, 'academics': 1000,
+                                                       'credit_value': 2, 'total_dev': 1}))
+# Cares only about staying alive and unhurt, for comparing against the default in benchmarks
+register_scoring_policy(ScoringPolicy("survival", {'dead': -100000000, 'petrified': -100, 'cauterized': -1000,
+                                                   'grievous': -100, 'injured': -10}))
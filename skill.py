@@ -1,5 +1,5 @@
 import glob
-from typing import TYPE_CHECKING, Dict, Optional, Any, List
+from typing import TYPE_CHECKING, Dict, Optional, Any, List, Iterable
 
 from yaml import safe_load
 
@@ -10,6 +10,11 @@ __skill_dict = {}
 if TYPE_CHECKING:
     from player import Player
 
+# Effects whose value names a Condition
+CONDITION_EFFECTS = frozenset([Effect.CONDITION, Effect.TENTATIVE_CONDITION, Effect.TURN_CONDITION,
+                               Effect.PERMANENT_CONDITION, Effect.REMOVE_CONDITION, Effect.REL_CONDITION,
+                               Effect.REMOVE_REL_CONDITION, Effect.CONSUME])
+
 
 class Skill:
     def __init__(self, pin: int, text: str, effect: Effect, value: Any, priority: int, info: InfoScope,
@@ -37,6 +42,8 @@ class Skill:
         self.target_has_condition = target_has_condition
         self.target_not_condition = target_not_condition
         self.condition_list = condition_list
+        # Resolved once here instead of every time the skill is used
+        self.condition: Optional[Condition] = Condition[value] if effect in CONDITION_EFFECTS else None
 
         self.source = None  # Helps to debug
         self.fragile: Optional[Condition] = None
@@ -71,6 +78,11 @@ def get_skill(pin: int) -> Skill:
         raise Exception(f"Skill {pin} does not exist.")
 
 
+# Whether any of the skills could have the effect, unknown skills count so that using them still fails loudly
+def may_have_effect(pins: Iterable[int], effect: Effect) -> bool:
+    return any(pin not in __skill_dict or __skill_dict[pin].effect == effect for pin in pins)
+
+
 def __parse_skill(pin: int, dictionary: Dict) -> Skill:
     sc = None
     if 'self_has_condition' in dictionary:
@@ -0,0 +1,99 @@
+from queue import PriorityQueue
+from typing import TYPE_CHECKING, Set, Dict, List, Tuple, Type, Optional, Callable
+
+if TYPE_CHECKING:
+    from ability import Ability
+    from actions import Action
+    from items import Item, Rune
+    from player import Player
+
+
+# All the mutable state shared between the actions of a single turn
+# Owned by a Game, so that several games (or simulations) can be resolved in the same process
+class TurnContext:
+    def __init__(self):
+        self.tic_index = 0
+
+        self.queue = PriorityQueue()
+        self.players: Set['Player'] = set()
+        self.not_wandering: Set['Player'] = set()
+        self.interrupted_players: Set['Player'] = set()
+        self.progress_dict: Dict['Player', int] = {}
+        self.no_class: Set['Player'] = set()  # Used poison gas or attuned
+        self.attacked: Set['Player'] = set()
+
+        # Set whenever a player may have died, been petrified or recovered, so run_turn recomputes who can act
+        self.actors_changed = True
+        # Called with (priority band, seconds spent) after run_turn resolves each band
+        self.band_hooks: List[Callable[[int, float], None]] = []
+
+        # Used for conditional trades based on actions
+        # (Player, Action type): Targets
+        self.action_record: Dict[Tuple['Player', Type['Action']], Set[Optional['Player']]] = {}
+        # Observer: Spied players
+        self.spied: Dict['Player', Set['Player']] = {}
+        self.fake_action_record: Dict[Tuple['Player', Type['Action']], Set[Optional['Player']]] = {}
+        self.fake_spied: Dict['Player', Set['Player']] = {}
+
+        # Used for teaching/learning handshake
+        # Teacher: Student
+        self.teacher_student: Dict['Player', 'Player'] = {}
+        # Student: Teacher
+        self.student_teacher: Dict['Player', 'Player'] = {}
+        # Teacher: Ability
+        self.teacher_ability: Dict['Player', 'Ability'] = {}
+
+        # Used for tattooing handshake
+        # Artist: Canvas
+        self.artist_canvas: Dict['Player', 'Player'] = {}
+        # Canvas: Artist
+        self.canvas_artist: Dict['Player', 'Player'] = {}
+        # Artist: Rune
+        self.artist_rune: Dict['Player', 'Rune'] = {}
+
+        # Used to allow Altruism to work when multiple players heal the same injured player
+        self.was_healed: Set['Player'] = set()
+
+        # Skill info messages that should only be shown once
+        self.info_once_dict: Dict['Player', Set[str]] = {}
+        self.info_once_broadcast: Set[str] = set()
+
+        # Victim: Thieves
+        self.victim_to_thieves: Dict['Player', Set['Player']] = {}
+        self.steal_handled: Set['Player'] = set()
+
+        self.consume_unique_pair: Set[Tuple['Player', 'Item']] = set()
+
+        self.trade_unique_pair: Set[Tuple['Player', 'Player']] = set()
+        # {(Sender, Recipient): (Credits, {Item: Amount})}
+        self.trade_item_conditions: Dict[Tuple['Player', 'Player'], Tuple[int, Dict['Item', int]]] = {}
+        # Used to prevent a player from promising the same items/credits to multiple players
+        self.trade_reserved: Dict['Player', Tuple[int, Dict['Item', int], List[str]]] = {}
+
+        self.illusion_handled: Set['Player'] = set()
+        # Target: {Defended: Redirected}
+        self.illusion_redirect: Dict['Player', Dict['Player', 'Player']] = {}
+
+        # Players who cannot cast contingency hydromancy
+        self.hydro_locked: Set['Player'] = set()
+
+    # Queues hold locks, so copies (e.g. for previewing a turn) carry the queued actions as a list
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['queue'] = list(self.queue.queue)
+        return state
+
+    def __setstate__(self, state):
+        queued = state.pop('queue')
+        self.__dict__.update(state)
+        self.queue = PriorityQueue()
+        for action in queued:
+            self.queue.put(action)
+
+    def invalidate_actors(self):
+        self.actors_changed = True
+
+    def next_index(self) -> int:
+        idx = self.tic_index
+        self.tic_index += 1
+        return idx
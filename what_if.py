@@ -0,0 +1,124 @@
+import contextlib
+import copy
+import json
+import pickle
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from actions import Action
+from combat import CombatHandler, get_combat_handler
+from game import Game
+from player import Player
+from report import Report, get_main_report
+
+
+# The outcome of resolving a turn on a copy of a game
+class TurnPreview:
+    def __init__(self, game: Game, report: Report, handler: CombatHandler,
+                 before: Dict[str, Dict], reports_before: Dict[str, str]):
+        self.game = game
+        self.report = report
+        self.handler = handler
+        # Name: Serialized state before the turn
+        self.before = before
+        # Name: Report text before the turn
+        self.reports_before = reports_before
+        self._player_reports: Dict[str, str] = {}
+
+    def get_player(self, name: str) -> Player:
+        return self.game.get_player(name)
+
+    def get_state(self, name: str) -> Dict:
+        return self.get_player(name).serialize()
+
+    # Field: (Before, After) for every serialized field the turn changed
+    def get_changes(self, name: str) -> Dict[str, Tuple[Any, Any]]:
+        before = self.before.get(name, {})
+        after = self.get_state(name)
+        return {field: (before.get(field), value) for field, value in after.items() if before.get(field) != value}
+
+    # What the player's report gained during the turn, as they would receive it
+    def get_report(self, name: str) -> str:
+        if name not in self._player_reports:
+            player = self.get_player(name)
+            before = self.reports_before.get(name, "")
+            if player.report.startswith(before):
+                player.report = player.report[len(before):]
+            with _use_singletons(self.report, self.handler):
+                self._player_reports[name] = player.get_report()
+        return self._player_reports[name]
+
+    def get_main_report(self) -> str:
+        with _use_singletons(self.report, self.handler):
+            return self.report.generate_report(self.game)
+
+
+# Points get_main_report and get_combat_handler at the preview's copies for the duration
+@contextlib.contextmanager
+def _use_singletons(report: Report, handler: CombatHandler):
+    saved = (Report.MAIN_REPORT, CombatHandler.REAL_HANDLER)
+    Report.MAIN_REPORT = report
+    CombatHandler.REAL_HANDLER = handler
+    try:
+        yield
+    finally:
+        Report.MAIN_REPORT, CombatHandler.REAL_HANDLER = saved
+
+
+# Resolves the turn as planned so far on a copy of the game, leaving the game, main report and combat handler untouched
+# plan is called with the copy before the turn is run, to try out different orders, e.g.
+# preview_turn(GAME, lambda g: g.get_player("A").plan_attack(g.get_player("B")))
+# The copy continues from the game's random state, so the same plans always give the same preview
+def preview_turn(game: Game, plan: Optional[Callable[[Game], None]] = None) -> TurnPreview:
+    assert not game.simulation, "Cannot preview a turn of a simulation."
+    preview_game, report, handler = copy.deepcopy((game, get_main_report(), get_combat_handler()))
+    with _use_singletons(report, handler):
+        if plan:
+            plan(preview_game)
+        before = {name: player.serialize() for name, player in preview_game.players.items()}
+        reports_before = {name: player.report for name, player in preview_game.players.items()}
+        Action.run_turn(preview_game)
+    return TurnPreview(preview_game, report, handler, before, reports_before)
+
+
+# Writes the traces and snapshot a handler with record_trace set kept of its last combat, for replay_combat
+def save_combat_trace(path: str, handler: Optional[CombatHandler] = None):
+    handler = handler or get_combat_handler()
+    assert handler.trace_snapshot, "No combat was traced."
+    with open(f"{path}.json", 'w') as f:
+        json.dump(handler.get_trace(), f, separators=(',', ':'))
+    with open(f"{path}.snapshot", 'wb') as f:
+        f.write(handler.trace_snapshot)
+
+
+def load_combat_trace(path: str) -> Tuple[bytes, List[Dict]]:
+    with open(f"{path}.snapshot", 'rb') as f:
+        snapshot = f.read()
+    with open(f"{path}.json", 'r') as f:
+        return snapshot, json.load(f)
+
+
+# Resolves a traced combat again from its snapshot in the traced order, groups traced in parallel with their seeds
+# Returns Group: Name: Field: (Traced, Replayed) for every outcome that came out differently, e.g. after a rules change
+def replay_combat(snapshot: bytes, trace: List[Dict]) -> Dict[str, Dict[str, Dict[str, Tuple[Any, Any]]]]:
+    game, attacker_to_defenders, solitary_combat = pickle.loads(snapshot)
+    handler = CombatHandler()
+    handler.record_trace = True
+    for attacker, defenders in attacker_to_defenders.items():
+        for defender in defenders:
+            handler.add_attack(attacker, defender)
+    for player in solitary_combat:
+        handler.add_solitary_combat(player)
+    with _use_singletons(Report(), handler):
+        handler.replay_seeds = {group['group']: group['seed'] for group in trace if group['seed'] is not None}
+        handler.replay_order = [group['group'] for group in trace]
+        handler.process_all_combat()
+
+    replayed = {group['group']: group['outcome'] for group in handler.get_trace()}
+    differences: Dict[str, Dict[str, Dict[str, Tuple[Any, Any]]]] = {}
+    for group in trace:
+        for name, outcome in group['outcome'].items():
+            after = replayed.get(group['group'], {}).get(name, {})
+            changed = {field: (value, after.get(field)) for field, value in outcome.items() if after.get(field) != value}
+            if changed:
+                differences.setdefault(group['group'], {})[name] = changed
+    return differences